@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Compare tool throughput with blocking vs. offloaded execution.
+
+Two SQLite instances are configured: ``slow`` runs a CPU-heavy recursive
+query, ``fast`` answers a primary-key lookup. N concurrent callers hit both
+from one event loop, first through the synchronous tool functions (the
+previous behaviour: every call blocks the loop) and then through the async
+variants that offload to per-instance worker threads.
+
+    python benchmarks/bench_async_tools.py --callers 16 --slow-calls 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+SLOW_QUERY = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 1500000) "
+    "SELECT count(*) AS n FROM c"
+)
+FAST_QUERY = "SELECT id, name FROM items WHERE id = 42"
+
+
+def _prepare(tmpdir: Path) -> None:
+    for name in ("slow", "fast"):
+        path = tmpdir / f"{name}.db"
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.executemany(
+            "INSERT INTO items (id, name) VALUES (?, ?)",
+            ((i, f"item-{i}") for i in range(1000)),
+        )
+        conn.commit()
+        conn.close()
+        prefix = name.upper()
+        os.environ[f"{prefix}_DB_PROVIDER"] = "sqlite"
+        os.environ[f"{prefix}_SQLITE_PATH"] = str(path)
+        os.environ[f"{prefix}_DB_STATEMENT_TIMEOUT_MS"] = "0"
+        os.environ[f"{prefix}_DB_MAX_CONCURRENCY"] = "4"
+    os.environ["MCP_INSTANCES"] = "slow,fast"
+    os.environ.setdefault("SQL_MCP_LOG_LEVEL", "WARNING")
+
+
+async def _measure(callers: int, slow_calls: int, use_async: bool) -> dict[str, float]:
+    from sql_mcp_server.tools import query as tools
+
+    async def _call(sql: str, instance_id: str) -> float:
+        # Latency is measured from launch so time spent queued behind a
+        # blocked event loop is included.
+        if use_async:
+            await tools.run_select_async(sql, instance_id)
+        else:
+            tools.run_select(sql, instance_id)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    slow = [asyncio.create_task(_call(SLOW_QUERY, "slow")) for _ in range(slow_calls)]
+    fast = [asyncio.create_task(_call(FAST_QUERY, "fast")) for _ in range(callers)]
+    fast_latencies = await asyncio.gather(*fast)
+    fast_done = time.perf_counter() - started
+    await asyncio.gather(*slow)
+    total = time.perf_counter() - started
+    return {
+        "fast_p50_ms": statistics.median(fast_latencies) * 1000,
+        "fast_max_ms": max(fast_latencies) * 1000,
+        "fast_throughput_rps": callers / fast_done,
+        "total_s": total,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=16)
+    parser.add_argument("--slow-calls", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _prepare(Path(tmpdir))
+        from sql_mcp_server.instances import shutdown_instance_registry
+
+        try:
+            for label, use_async in (("blocking", False), ("offloaded", True)):
+                result = asyncio.run(_measure(args.callers, args.slow_calls, use_async))
+                rendered = "  ".join(f"{k}={v:.2f}" for k, v in result.items())
+                print(f"{label:<10} {rendered}")
+        finally:
+            shutdown_instance_registry()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Compare the dict-per-row and columnar run_select response formats.
+
+A wide SQLite table is generated and fetched through ``run_select`` in both
+formats; the script reports the JSON payload size and the end-to-end
+latency (query, row shaping and JSON encoding).
+
+    python benchmarks/bench_result_format.py --columns 40 --rows 1000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+
+def _prepare(path: Path, columns: int, rows: int) -> None:
+    names = [f"column_name_{i:03d}" for i in range(columns)]
+    conn = sqlite3.connect(path)
+    column_defs = ", ".join(f"{name} TEXT" for name in names)
+    conn.execute(f"CREATE TABLE wide (id INTEGER PRIMARY KEY, {column_defs})")
+    placeholders = ", ".join("?" for _ in range(columns + 1))
+    conn.executemany(
+        f"INSERT INTO wide VALUES ({placeholders})",
+        ((r, *(f"v{r}-{c}" for c in range(columns))) for r in range(rows)),
+    )
+    conn.commit()
+    conn.close()
+    os.environ["DB_PROVIDER"] = "sqlite"
+    os.environ["SQLITE_PATH"] = str(path)
+    os.environ["DB_MAX_ROWS"] = str(rows)
+    os.environ.setdefault("SQL_MCP_LOG_LEVEL", "WARNING")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--columns", type=int, default=40)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _prepare(Path(tmpdir) / "wide.db", args.columns, args.rows)
+        from sql_mcp_server.instances import shutdown_instance_registry
+        from sql_mcp_server.tools.query import run_select
+
+        try:
+            for result_format in ("rows", "columnar"):
+                latencies = []
+                payload = b""
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    response = run_select("SELECT * FROM wide", format=result_format)
+                    payload = json.dumps(response).encode("utf-8")
+                    latencies.append(time.perf_counter() - started)
+                print(
+                    f"{result_format:<9} bytes={len(payload):>10}  "
+                    f"p50_ms={statistics.median(latencies) * 1000:8.2f}  "
+                    f"min_ms={min(latencies) * 1000:8.2f}"
+                )
+        finally:
+            shutdown_instance_registry()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Compare ways of turning driver rows into JSON.
+
+Rows shaped like a PostgreSQL or MySQL result (integers, text, ``Decimal``,
+timestamps, dates, UUIDs, binary and floats) are generated in memory and
+encoded with:
+
+- ``json.dumps(default=str)``, the generic fallback,
+- a per-value type lookup (``RowEncoder`` without column kinds, as for SQLite),
+- per-column converters (``RowEncoder`` with the kinds a provider reports),
+
+each serialized with the standard library and, when installed, orjson.
+
+    python benchmarks/bench_row_encoding.py --columns 24 --rows 5000
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import decimal
+import json
+import statistics
+import time
+import uuid
+from unittest import mock
+
+from sql_mcp_server import encoding
+from sql_mcp_server.encoding import (
+    BINARY,
+    DATE,
+    DATETIME,
+    DECIMAL,
+    FLOAT,
+    PLAIN,
+    UUID,
+    RowEncoder,
+    dumps,
+)
+
+_COLUMN_TYPES = [
+    (PLAIN, lambda r: r),
+    (PLAIN, lambda r: f"name-{r}"),
+    (DECIMAL, lambda r: decimal.Decimal(r) / 100),
+    (DATETIME, lambda r: dt.datetime(2024, 1, 1) + dt.timedelta(seconds=r)),
+    (DATE, lambda r: dt.date(2024, 1, 1) + dt.timedelta(days=r % 365)),
+    (UUID, lambda r: uuid.UUID(int=r)),
+    (BINARY, lambda r: r.to_bytes(8, "big")),
+    (FLOAT, lambda r: r / 7),
+]
+
+
+def _rows(columns: int, rows: int) -> tuple[list[str], list[str], list[tuple]]:
+    kinds = [_COLUMN_TYPES[c % len(_COLUMN_TYPES)][0] for c in range(columns)]
+    makers = [_COLUMN_TYPES[c % len(_COLUMN_TYPES)][1] for c in range(columns)]
+    names = [f"column_{c:03d}" for c in range(columns)]
+    return names, kinds, [tuple(make(r) for make in makers) for r in range(rows)]
+
+
+def _time(fn, repeat: int) -> list[float]:
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--columns", type=int, default=24)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    names, kinds, rows = _rows(args.columns, args.rows)
+    generic = RowEncoder(len(names))
+    typed = RowEncoder(len(names), kinds)
+
+    def records(converted) -> list[dict]:
+        return [dict(zip(names, row)) for row in converted]
+
+    cases = {
+        "default=str": lambda: json.dumps(records(rows), default=str).encode("utf-8"),
+        "per-value": lambda: dumps(records(generic.convert(rows))),
+        "per-column": lambda: dumps(records(typed.convert(rows))),
+    }
+    backends = ["json"] + (["orjson"] if encoding.orjson is not None else [])
+    for backend in backends:
+        for name, fn in cases.items():
+            if backend == "orjson" and name == "default=str":
+                continue
+            module = encoding.orjson if backend == "orjson" else None
+            with mock.patch.object(encoding, "orjson", module):
+                latencies = _time(fn, args.repeat)
+            median = statistics.median(latencies)
+            print(
+                f"{name:<11} {backend:<7} rows_per_s={args.rows / median:>12.0f}  "
+                f"p50_ms={median * 1000:8.2f}  min_ms={min(latencies) * 1000:8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Compare SQLite throughput on one shared connection vs. the reader pool.
+
+A multi-million-row table is generated once, then concurrent workers run
+range aggregations through ``SQLiteClient`` the way an instance's executor
+does: first with the default single shared connection, then in read mode
+(read-only URI, mmap, reader connections).
+
+    python benchmarks/bench_sqlite_readers.py --rows 5000000 --workers 8
+
+The reader pool only pays off with as many free CPU cores as workers; on a
+single core both variants are bound by the same CPU.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from sql_mcp_server.config import load_config
+from sql_mcp_server.db.sqlite import SQLiteClient
+
+QUERY = (
+    "SELECT grp, count(*) AS n, avg(value) AS mean FROM facts "
+    "WHERE id BETWEEN ? AND ? GROUP BY grp"
+)
+
+
+def _generate(path: Path, rows: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE facts (id INTEGER PRIMARY KEY, grp INTEGER, value REAL)")
+    rng = random.Random(7)
+    chunk = 100_000
+    for start in range(0, rows, chunk):
+        conn.executemany(
+            "INSERT INTO facts (id, grp, value) VALUES (?, ?, ?)",
+            ((i, i % 50, rng.random()) for i in range(start, min(start + chunk, rows))),
+        )
+    conn.commit()
+    conn.close()
+
+
+def _run(client: SQLiteClient, rows: int, span: int, queries: int, workers: int) -> list[float]:
+    rng = random.Random(11)
+    ranges = [(lo, lo + span) for lo in (rng.randrange(0, rows - span) for _ in range(queries))]
+
+    def one(bounds: tuple[int, int]) -> float:
+        started = time.perf_counter()
+        for _ in client.iter_batches(QUERY, bounds):
+            pass
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(one, ranges))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--span", type=int, default=300_000)
+    parser.add_argument("--queries", type=int, default=48)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--mmap-size", type=int, default=1 << 30)
+    parser.add_argument("--cache-size", type=int, default=0, help="PRAGMA cache_size value")
+    parser.add_argument("--temp-store", choices=("default", "file", "memory"), default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "facts.db"
+        started = time.perf_counter()
+        _generate(path, args.rows)
+        print(f"generated {args.rows} rows in {time.perf_counter() - started:.1f}s")
+
+        base = load_config(env={"DB_PROVIDER": "sqlite", "SQLITE_PATH": str(path)})
+        variants = {
+            "shared": base,
+            "readers": dataclasses.replace(
+                base,
+                sqlite_readers=args.workers,
+                sqlite_mmap_size=args.mmap_size,
+                sqlite_cache_size=args.cache_size,
+                sqlite_temp_store=args.temp_store,
+            ),
+        }
+        for label, config in variants.items():
+            client = SQLiteClient(config)
+            try:
+                started = time.perf_counter()
+                latencies = _run(client, args.rows, args.span, args.queries, args.workers)
+                elapsed = time.perf_counter() - started
+            finally:
+                client.close()
+            print(
+                f"{label:<8} queries/s={args.queries / elapsed:8.2f}  "
+                f"p50_ms={statistics.median(latencies) * 1000:9.2f}  "
+                f"max_ms={max(latencies) * 1000:9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Measure SQLValidator throughput with and without the validation cache.
+
+A corpus of realistic agent queries is validated repeatedly, as happens
+when agents re-issue the same exploratory statements.
+
+    python benchmarks/bench_validation.py --rounds 200
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import time
+
+from sql_mcp_server.config import load_config
+from sql_mcp_server.middleware.sql_validator import SQLValidator
+
+CORPUS = [
+    "SELECT * FROM users WHERE id = 42",
+    "SELECT id, email, created_at FROM users WHERE created_at > '2024-01-01' ORDER BY created_at DESC",
+    "SELECT u.id, u.email, count(o.id) AS orders FROM users u LEFT JOIN orders o ON o.user_id = u.id "
+    "GROUP BY u.id, u.email HAVING count(o.id) > 3",
+    "WITH recent AS (SELECT * FROM orders WHERE created_at > now() - interval '7 days') "
+    "SELECT status, count(*) FROM recent GROUP BY status",
+    "SELECT p.name, sum(oi.quantity * oi.unit_price) AS revenue FROM order_items oi "
+    "JOIN products p ON p.id = oi.product_id JOIN orders o ON o.id = oi.order_id "
+    "WHERE o.status = 'paid' GROUP BY p.name ORDER BY revenue DESC LIMIT 20",
+    "SELECT * FROM invoices WHERE customer_id IN (SELECT id FROM customers WHERE country = 'FR')",
+    "SELECT count(*) FROM events WHERE type = 'login' AND occurred_at >= '2024-06-01'",
+    "SELECT id, name FROM products WHERE name LIKE '%chair%' ORDER BY name",
+]
+
+
+def _measure(validator: SQLValidator, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for query in CORPUS:
+            validator.validate(query)
+    return rounds * len(CORPUS) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    base = load_config(env={"DB_PROVIDER": "sqlite", "DB_ALLOWED_TABLES": ""})
+    for label, size in (("uncached", 0), ("cached", 1024)):
+        validator = SQLValidator(dataclasses.replace(base, validation_cache_size=size))
+        rate = _measure(validator, args.rounds)
+        print(f"{label:<9} {rate:12.0f} validations/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,15 @@ import string
 import sys
 from pathlib import Path
 
+from sql_mcp_server.quotas import parse_quota
+
 ALL_SCOPES = {"r", "w", "a", "d"}
 DEFAULT_TOKENS = Path(__file__).resolve().parents[1] / "tokens.txt"
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description="Generate MCP API key entries (username:token:scopes)"
+        description="Generate MCP API key entries (username:token:scopes[:quota])"
     )
     parser.add_argument("username", help="Logical username (e.g. agent name)")
     parser.add_argument(
@@ -21,6 +23,13 @@ def parse_args() -> argparse.Namespace:
         default="rw",
         help="Scopes to grant (subset of rwad). Default: %(default)s",
     )
+    parser.add_argument(
+        "--quota",
+        help=(
+            "Optional per-minute quota, e.g. 'requests=60;rows=100000;bytes=5000000;"
+            "db_seconds=30'"
+        ),
+    )
     parser.add_argument(
         "--token",
         help="Optional token to use. When omitted a random token is generated.",
@@ -63,8 +72,16 @@ def main() -> None:
     if unknown:
         sys.exit(f"Unsupported scope(s): {''.join(sorted(unknown))}. Allowed: rwad")
 
+    if args.quota:
+        try:
+            parse_quota(args.quota)
+        except ValueError as exc:
+            sys.exit(f"Invalid quota: {exc}")
+
     token = args.token or generate_token(args.length)
     entry = f"{args.username}:{token}:{''.join(sorted(scopes))}"
+    if args.quota:
+        entry += f":{args.quota}"
     if args.stdout:
         print(entry)
     else:
@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Dict, Sequence, Set
 
 from sql_mcp_server.errors import MCPError
+from sql_mcp_server.quotas import Quota, get_quota_manager, parse_quota
 
 LOGGER = logging.getLogger("sql_mcp_server.auth")
 ALL_SCOPES = frozenset({"r", "w", "a", "d"})
@@ -18,6 +19,7 @@ class ApiPrincipal:
     username: str
     token: str
     scopes: Set[str]
+    quota: Quota | None = None
 
 
 class AuthManager:
@@ -58,10 +60,19 @@ class AuthManager:
             if not entry:
                 continue
             parts = entry.split(":")
-            if len(parts) != 3:
+            if len(parts) not in (3, 4):
                 LOGGER.warning("Invalid MCP_API_KEYS entry ignored: %s", entry)
                 continue
-            username, token, scopes_str = parts
+            username, token, scopes_str = parts[:3]
+            quota = None
+            if len(parts) == 4 and parts[3].strip():
+                try:
+                    quota = parse_quota(parts[3])
+                except ValueError as exc:
+                    # Dropping the entry fails closed instead of granting
+                    # unlimited use.
+                    LOGGER.warning("Invalid quota for user %s, entry ignored: %s", username, exc)
+                    continue
             scope_set = {c.lower() for c in scopes_str if c.strip()}
             unknown = scope_set - ALL_SCOPES
             if unknown:
@@ -69,7 +80,9 @@ class AuthManager:
                     "Ignoring unknown scopes for user %s: %s", username, "".join(sorted(unknown))
                 )
                 scope_set -= unknown
-            principals[token] = ApiPrincipal(username=username, token=token, scopes=scope_set)
+            principals[token] = ApiPrincipal(
+                username=username, token=token, scopes=scope_set, quota=quota
+            )
         return principals
 
     @property
@@ -122,6 +135,7 @@ def authorize(api_key: str | None, required_scopes: Sequence[str] | None = None)
     principal = manager.authenticate(api_key)
     if required_scopes:
         manager.require_scopes(principal, required_scopes)
+    get_quota_manager().admit(principal)
     return principal
 
 
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import base64
+from typing import Any, Sequence
+
+TRUNCATION_MARKER = "...[truncated]"
+_BINARY_TYPES = (bytes, bytearray, memoryview)
+
+
+def encoded_size(value: Any) -> int:
+    """Approximate the size of ``value`` in a JSON response, in bytes."""
+
+    if value is None:
+        return 4
+    if isinstance(value, bool):
+        return 5
+    if isinstance(value, (int, float)):
+        return len(repr(value))
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value) + 2
+    return len(str(value)) + 2
+
+
+def _oversized(value: Any, limit: int) -> bool:
+    if isinstance(value, str):
+        # A character takes at most 4 bytes in UTF-8.
+        return len(value) > limit or (
+            len(value) * 4 > limit and len(value.encode("utf-8")) > limit
+        )
+    if isinstance(value, _BINARY_TYPES):
+        # Its base64 text is 4 characters per 3 bytes.
+        return (len(value) + 2) // 3 * 4 > limit
+    return False
+
+
+class ResultBudget:
+    """Byte budget of one response, spent while its rows are fetched.
+
+    ``max_value_bytes`` caps single text and binary values: :meth:`cap_values`
+    cuts them and appends :data:`TRUNCATION_MARKER`. Once the next row would
+    take the response past ``max_bytes``, :meth:`fit` drops it and the rest
+    of its batch and sets ``exhausted`` so the caller stops fetching. ``0``
+    disables either limit.
+    """
+
+    def __init__(self, max_bytes: int, max_value_bytes: int, result_format: str = "rows") -> None:
+        self._max_bytes = max(max_bytes, 0)
+        self._max_value_bytes = max(max_value_bytes, 0)
+        self._result_format = result_format
+        self._row_overhead: int | None = None
+        self.used = 0
+        self.exhausted = False
+        self.values_truncated = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._max_bytes or self._max_value_bytes)
+
+    def cap_values(self, rows: Sequence[Sequence[Any]]) -> Sequence[Sequence[Any]]:
+        """Cut the oversized values of driver ``rows``, before they are encoded.
+
+        Text is measured in UTF-8 bytes and cut on a character boundary.
+        Binary values are replaced by the base64 of their leading bytes, cut
+        on a 4-character boundary so the prefix still decodes.
+        """
+
+        limit = self._max_value_bytes
+        if not limit:
+            return rows
+        capped_rows: list[Sequence[Any]] = []
+        for row in rows:
+            if any(_oversized(value, limit) for value in row):
+                row = tuple(self._cap(value, limit) for value in row)
+            capped_rows.append(row)
+        return capped_rows
+
+    def _cap(self, value: Any, limit: int) -> Any:
+        if not _oversized(value, limit):
+            return value
+        self.values_truncated += 1
+        if isinstance(value, str):
+            return value.encode("utf-8")[:limit].decode("utf-8", "ignore") + TRUNCATION_MARKER
+        head = bytes(value[: limit // 4 * 3])
+        return base64.b64encode(head).decode("ascii") + TRUNCATION_MARKER
+
+    def fit(
+        self, columns: Sequence[str], rows: Sequence[Sequence[Any]]
+    ) -> Sequence[Sequence[Any]]:
+        """Return the leading encoded ``rows`` that fit, counting their size."""
+
+        if not self.enabled:
+            return rows
+        if self._row_overhead is None:
+            if self._result_format == "columnar":
+                self._row_overhead = len(columns) + 1
+            else:
+                # Every row object repeats the quoted column names.
+                self._row_overhead = sum(len(column) + 4 for column in columns) + 1
+        fitted: list[Sequence[Any]] = []
+        for row in rows:
+            size = self._row_overhead + sum(encoded_size(value) for value in row)
+            if self._max_bytes and self.used + size > self._max_bytes:
+                self.exhausted = True
+                break
+            self.used += size
+            fitted.append(row)
+        return fitted
+
+    def report(self) -> dict[str, Any]:
+        # How many rows were left out is unknown: the rest of the result is
+        # never fetched. Callers report ``has_more`` instead.
+        return {"truncated": self.exhausted or self.values_truncated > 0}
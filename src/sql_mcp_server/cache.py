@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Iterable, Sequence
+
+from sql_mcp_server.metrics import get_metrics
+
+LOGGER = logging.getLogger("sql_mcp_server.cache")
+
+_ROW_OVERHEAD = 64
+
+
+def estimate_result_size(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> int:
+    """Approximate the memory held by a cached result, in bytes."""
+
+    size = sum(sys.getsizeof(c) for c in columns)
+    for row in rows:
+        size += _ROW_OVERHEAD
+        for value in row:
+            size += sys.getsizeof(value)
+    return size
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResult:
+    columns: tuple[str, ...]
+    rows: tuple[tuple[Any, ...], ...]
+    tables: frozenset[str]
+    size: int
+    expires_at: float
+    # Values cut by the result budget before the rows were cached.
+    values_truncated: int = 0
+
+
+class ResultCache:
+    """Per-instance SELECT result cache.
+
+    Entries are keyed by the validated query text, expire after ``ttl``
+    seconds and are evicted least-recently-used first once the cached rows
+    exceed ``max_bytes``. Writes invalidate every entry reading one of the
+    written tables; a write whose tables are unknown clears the cache.
+    A ``ttl`` of ``0`` disables caching.
+
+    A read that races a write must not cache what it read before the
+    write: callers take a :meth:`generation` of the tables before running
+    the query and pass it to :meth:`put`, which drops the result if an
+    invalidation touched those tables in the meantime.
+    """
+
+    def __init__(self, instance_id: str, ttl: float, max_bytes: int) -> None:
+        self._instance_id = instance_id
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, CachedResult] = OrderedDict()
+        self._bytes = 0
+        # Invalidations so far: of every entry, of any entry, per table.
+        self._cleared = 0
+        self._writes = 0
+        self._table_writes: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._metrics = get_metrics()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0 and self._max_bytes > 0
+
+    def _drop_locked(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _generation_locked(self, tables: frozenset[str]) -> Hashable:
+        if not tables:
+            # Entries of unknown tables are dropped on every write.
+            return (self._cleared, self._writes)
+        return (self._cleared, tuple(self._table_writes.get(t, 0) for t in sorted(tables)))
+
+    def generation(self, tables: Iterable[str]) -> Hashable:
+        """Snapshot of the invalidations that would drop a result of ``tables``."""
+
+        with self._lock:
+            return self._generation_locked(frozenset(t.lower() for t in tables))
+
+    def get(self, key: Hashable) -> CachedResult | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._drop_locked(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        hit = entry is not None
+        self._metrics.increment(
+            "result_cache_hits_total" if hit else "result_cache_misses_total",
+            instance_id=self._instance_id,
+        )
+        LOGGER.debug(
+            "Result cache %s", "hit" if hit else "miss", extra={"instance_id": self._instance_id}
+        )
+        return entry
+
+    def put(
+        self,
+        key: Hashable,
+        columns: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        tables: Iterable[str],
+        generation: Hashable | None = None,
+        values_truncated: int = 0,
+    ) -> None:
+        if not self.enabled:
+            return
+        frozen_rows = tuple(tuple(row) for row in rows)
+        size = estimate_result_size(columns, frozen_rows)
+        if size > self._max_bytes:
+            return
+        entry = CachedResult(
+            columns=tuple(columns),
+            rows=frozen_rows,
+            tables=frozenset(t.lower() for t in tables),
+            size=size,
+            expires_at=time.monotonic() + self._ttl,
+            values_truncated=values_truncated,
+        )
+        evicted = 0
+        with self._lock:
+            if generation is not None and generation != self._generation_locked(entry.tables):
+                # Written while the rows were read; they may be stale.
+                return
+            if key in self._entries:
+                self._drop_locked(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop_locked(oldest)
+                evicted += 1
+            cached_bytes = self._bytes
+        if evicted:
+            self._metrics.increment(
+                "result_cache_evictions_total", evicted, instance_id=self._instance_id
+            )
+        self._metrics.set_gauge(
+            "result_cache_bytes", cached_bytes, instance_id=self._instance_id
+        )
+
+    def invalidate(self, tables: Iterable[str] | None = None) -> int:
+        """Drop entries reading any of ``tables``, or every entry when ``None``."""
+
+        if not self.enabled:
+            return 0
+        targets = None if tables is None else {t.lower() for t in tables}
+        with self._lock:
+            self._writes += 1
+            if targets is None:
+                self._cleared += 1
+                keys = list(self._entries)
+            else:
+                for table in targets:
+                    self._table_writes[table] = self._table_writes.get(table, 0) + 1
+                # Results whose tables could not be determined are dropped on
+                # every write.
+                keys = [
+                    k for k, e in self._entries.items() if not e.tables or e.tables & targets
+                ]
+            for key in keys:
+                self._drop_locked(key)
+            cached_bytes = self._bytes
+        if keys:
+            self._metrics.increment(
+                "result_cache_invalidations_total", len(keys), instance_id=self._instance_id
+            )
+            LOGGER.info(
+                "Result cache invalidated",
+                extra={
+                    "instance_id": self._instance_id,
+                    "entries": len(keys),
+                    "tables": sorted(targets) if targets is not None else "*",
+                },
+            )
+        self._metrics.set_gauge(
+            "result_cache_bytes", cached_bytes, instance_id=self._instance_id
+        )
+        return len(keys)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes}
+
+    def clear(self) -> None:
+        self.invalidate(None)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+from sql_mcp_server.db.base import DBClient
+from sql_mcp_server.metrics import get_metrics
+
+LOGGER = logging.getLogger("sql_mcp_server.catalog")
+
+
+class SchemaCatalog:
+    """In-memory view of an instance's tables and columns.
+
+    The table list is loaded once and column definitions on first use; both
+    are reused until ``ttl`` seconds have passed since the table list was
+    loaded, an explicit ``refresh``, or DDL executed through the server
+    calls ``invalidate``. A ``ttl`` of ``0`` disables caching.
+
+    The lock only guards the cached state; catalog queries run outside it.
+    Concurrent misses on the same entry wait for a single load instead of
+    each querying the database, and lookups of other entries go ahead.
+    """
+
+    def __init__(self, db: DBClient, instance_id: str, ttl: float) -> None:
+        self._db = db
+        self._instance_id = instance_id
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._tables: dict[str, str] | None = None
+        # Column lists keyed by ``("columns", table)``, describe_schema
+        # output by ``("schema", include_keys)``.
+        self._entries: dict[Hashable, Any] = {}
+        # Bumped whenever the cached state is replaced, so a load that
+        # raced an invalidation does not store what it read before it.
+        self._generation = 0
+        self._loads: dict[Hashable, threading.Lock] = {}
+        self._loaded_at = 0.0
+        self._metrics = get_metrics()
+
+    def _fresh_locked(self) -> bool:
+        if self._tables is None or self._ttl <= 0:
+            return False
+        return time.monotonic() - self._loaded_at < self._ttl
+
+    def _load_lock(self, key: Hashable) -> threading.Lock:
+        with self._lock:
+            return self._loads.setdefault(key, threading.Lock())
+
+    def _load_tables(self) -> dict[str, str]:
+        with self._lock:
+            generation = self._generation
+        started = time.monotonic()
+        names = self._db.list_tables()
+        tables = {name.lower(): name for name in names}
+        loaded_at = time.monotonic()
+        with self._lock:
+            if generation == self._generation:
+                self._tables = tables
+                self._entries = {}
+                self._generation += 1
+                self._loaded_at = loaded_at
+        self._metrics.increment("catalog_loads_total", instance_id=self._instance_id)
+        LOGGER.info(
+            "Schema catalog loaded",
+            extra={
+                "instance_id": self._instance_id,
+                "table_count": len(names),
+                "duration_ms": round((loaded_at - started) * 1000, 2),
+            },
+        )
+        return tables
+
+    def _table_map(self) -> dict[str, str]:
+        with self._lock:
+            if self._fresh_locked():
+                assert self._tables is not None
+                return self._tables
+        with self._load_lock("tables"):
+            with self._lock:
+                # Loaded by the call we waited for.
+                if self._fresh_locked():
+                    assert self._tables is not None
+                    return self._tables
+            return self._load_tables()
+
+    def _entry(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        self._table_map()
+        if self._ttl <= 0:
+            return load()
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+        with self._load_lock(key):
+            with self._lock:
+                if key in self._entries:
+                    return self._entries[key]
+                generation = self._generation
+            value = load()
+            with self._lock:
+                if generation == self._generation:
+                    self._entries[key] = value
+            return value
+
+    def tables(self) -> list[str]:
+        return list(self._table_map().values())
+
+    def resolve(self, table: str) -> str | None:
+        """Return the catalog spelling of ``table`` (case-insensitive), if it exists."""
+
+        return self._table_map().get(table.lower())
+
+    def columns(self, table: str) -> list[dict[str, Any]]:
+        return self._entry(("columns", table.lower()), lambda: self._db.describe_table(table))
+
+    def schema(self, include_keys: bool = False) -> dict[str, dict[str, Any]]:
+        """Return ``DBClient.describe_schema`` output, cached like the table list."""
+
+        return self._entry(
+            ("schema", include_keys), lambda: self._db.describe_schema(include_keys)
+        )
+
+    def refresh(self) -> int:
+        with self._load_lock("tables"):
+            return len(self._load_tables())
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._tables = None
+            self._entries = {}
+            self._generation += 1
+        self._metrics.increment("catalog_invalidations_total", instance_id=self._instance_id)
+        LOGGER.info("Schema catalog invalidated", extra={"instance_id": self._instance_id})
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Mapping
 
 
@@ -25,6 +25,39 @@ class ServerConfig:
     mssql_trust_server_certificate: bool
     allow_alter: bool
     allow_drop: bool
+    pool_min_size: int = 1
+    pool_max_size: int = 5
+    pool_timeout: float = 10.0
+    pool_idle_timeout: float = 300.0
+    pool_pre_ping: bool = True
+    pool_pre_ping_idle: float = 30.0
+    connect_retries: int = 2
+    connect_backoff: float = 0.2
+    breaker_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+    max_concurrency: int = 5
+    max_active_queries: int = 5
+    max_queue: int = 16
+    queue_timeout: float = 10.0
+    scheduler_weights: dict[str, int] = field(default_factory=dict)
+    fetch_batch_size: int = 500
+    max_result_bytes: int = 0
+    max_value_bytes: int = 0
+    export_dir: str | None = None
+    export_max_bytes: int = 0
+    page_cursor_ttl: float = 300.0
+    max_open_cursors: int = 2
+    result_cache_ttl: float = 0.0
+    result_cache_max_bytes: int = 32 * 1024 * 1024
+    catalog_ttl: float = 300.0
+    validation_cache_size: int = 1024
+    prepared_cache_size: int = 64
+    sqlite_readers: int = 0
+    sqlite_mmap_size: int = 0
+    sqlite_cache_size: int = 0
+    sqlite_temp_store: str | None = None
+    sqlite_wal: bool = False
+    warmup: bool = False
 
     @property
     def statement_timeout_seconds(self) -> int | None:
@@ -67,6 +100,12 @@ def load_config(
             return default
         return int(raw)
 
+    def _get_float(name: str, default: float) -> float:
+        raw = _get(name)
+        if raw is None or raw == "":
+            return default
+        return float(raw)
+
     def _get_bool(name: str, default: bool) -> bool:
         raw = _get(name)
         if raw is None or raw == "":
@@ -87,6 +126,19 @@ def load_config(
     query_timeout = _get_int("DB_QUERY_TIMEOUT", 10)
     statement_timeout_ms = _get_int("DB_STATEMENT_TIMEOUT_MS", query_timeout * 1000)
 
+    pool_max_size = max(_get_int("DB_POOL_MAX", 5), 1)
+    max_active_queries = max(_get_int("DB_MAX_ACTIVE_QUERIES", pool_max_size), 0)
+    max_queue = max(_get_int("DB_MAX_QUEUE", 16), 0)
+    scheduler_weights: dict[str, int] = {}
+    for item in (_get("DB_SCHEDULER_WEIGHTS", "") or "").split(","):
+        name, sep, weight = item.partition("=")
+        if sep and name.strip():
+            scheduler_weights[name.strip()] = max(int(weight), 1)
+    # Queued callers hold a worker thread while they wait for a slot.
+    default_concurrency = (
+        max_active_queries + max_queue if max_active_queries else pool_max_size
+    )
+
     return ServerConfig(
         instance_id=resolved_instance_id,
         provider=provider,
@@ -108,6 +160,39 @@ def load_config(
         ),
         allow_alter=_get_bool("DB_ALLOW_ALTER", False),
         allow_drop=_get_bool("DB_ALLOW_DROP", False),
+        pool_min_size=max(_get_int("DB_POOL_MIN", 1), 0),
+        pool_max_size=pool_max_size,
+        pool_timeout=_get_float("DB_POOL_TIMEOUT", float(query_timeout)),
+        pool_idle_timeout=_get_float("DB_POOL_IDLE_TIMEOUT", 300.0),
+        pool_pre_ping=_get_bool("DB_POOL_PRE_PING", True),
+        pool_pre_ping_idle=max(_get_float("DB_POOL_PRE_PING_IDLE", 30.0), 0.0),
+        connect_retries=max(_get_int("DB_CONNECT_RETRIES", 2), 0),
+        connect_backoff=max(_get_float("DB_CONNECT_BACKOFF", 0.2), 0.0),
+        breaker_threshold=max(_get_int("DB_BREAKER_THRESHOLD", 5), 0),
+        breaker_reset_timeout=max(_get_float("DB_BREAKER_RESET_TIMEOUT", 30.0), 0.0),
+        max_concurrency=max(_get_int("DB_MAX_CONCURRENCY", default_concurrency), 1),
+        max_active_queries=max_active_queries,
+        max_queue=max_queue,
+        queue_timeout=_get_float("DB_QUEUE_TIMEOUT", float(query_timeout)),
+        scheduler_weights=scheduler_weights,
+        fetch_batch_size=max(_get_int("DB_FETCH_BATCH_SIZE", 500), 1),
+        max_result_bytes=max(_get_int("DB_MAX_RESULT_BYTES", 0), 0),
+        max_value_bytes=max(_get_int("DB_MAX_VALUE_BYTES", 0), 0),
+        export_dir=_get("DB_EXPORT_DIR") or None,
+        export_max_bytes=max(_get_int("DB_EXPORT_MAX_BYTES", 0), 0),
+        page_cursor_ttl=_get_float("DB_PAGE_CURSOR_TTL", 300.0),
+        max_open_cursors=max(_get_int("DB_MAX_OPEN_CURSORS", 2), 1),
+        result_cache_ttl=_get_float("DB_RESULT_CACHE_TTL", 0.0),
+        result_cache_max_bytes=_get_int("DB_RESULT_CACHE_MAX_BYTES", 32 * 1024 * 1024),
+        catalog_ttl=_get_float("DB_CATALOG_TTL", 300.0),
+        validation_cache_size=_get_int("DB_VALIDATION_CACHE_SIZE", 1024),
+        prepared_cache_size=_get_int("DB_PREPARED_CACHE_SIZE", 64),
+        sqlite_readers=max(_get_int("SQLITE_READERS", 0), 0),
+        sqlite_mmap_size=max(_get_int("SQLITE_MMAP_SIZE", 0), 0),
+        sqlite_cache_size=_get_int("SQLITE_CACHE_SIZE", 0),
+        sqlite_temp_store=(_get("SQLITE_TEMP_STORE") or "").lower() or None,
+        sqlite_wal=_get_bool("SQLITE_WAL", False),
+        warmup=_get_bool("DB_WARMUP", False),
     )
 
 
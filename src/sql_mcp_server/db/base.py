@@ -1,16 +1,156 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Sequence
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Mapping, Sequence
+
+from sql_mcp_server.db.cancel import cancellable
+from sql_mcp_server.encoding import column_kinds
+
+DEFAULT_FETCH_BATCH_SIZE = 500
+
+
+@dataclass(frozen=True, slots=True)
+class RowBatch:
+    """A slice of a streamed result: column names plus positional rows.
+
+    ``kinds`` gives the ``encoding`` kind of each column when the driver
+    reports column types (``None`` when it does not).
+    """
+
+    columns: tuple[str, ...]
+    rows: Sequence[Sequence[Any]]
+    kinds: tuple[str | None, ...] | None = None
+
+    def as_dicts(self) -> list[dict[str, Any]]:
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in self.rows]
+
+
+def iter_cursor_batches(
+    cursor: Any,
+    batch_size: int,
+    interrupt: Callable[[], None] | None = None,
+    type_kinds: Mapping[Any, str] | None = None,
+) -> Iterator[RowBatch]:
+    """Yield ``fetchmany`` batches from an executed DB-API cursor.
+
+    The first batch is always produced, even when empty, so consumers learn
+    the column names of an empty result. With ``interrupt``, each fetch can
+    be cancelled by the tool call consuming it (see ``db.cancel``).
+    ``type_kinds`` maps the driver's ``cursor.description`` type codes to
+    ``encoding`` kinds.
+    """
+
+    columns: tuple[str, ...] | None = None
+    kinds = None
+    while True:
+        if interrupt is None:
+            rows = cursor.fetchmany(batch_size)
+        else:
+            with cancellable(interrupt):
+                rows = cursor.fetchmany(batch_size)
+        if columns is None:
+            if cursor.description is None:
+                return
+            columns = tuple(c[0] for c in cursor.description)
+            if type_kinds is not None:
+                kinds = column_kinds(cursor.description, type_kinds)
+        elif not rows:
+            return
+        yield RowBatch(columns=columns, rows=rows, kinds=kinds)
+        if not rows:
+            return
+
+
+def group_schema(
+    column_rows: Iterable[Mapping[str, Any]],
+    key_rows: Iterable[Mapping[str, Any]] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Group flat catalog rows into the compact ``describe_schema`` shape.
+
+    ``column_rows`` carry ``table_name``, ``column_name`` and ``data_type``;
+    ``key_rows`` carry ``table_name``, ``index_name``, ``is_unique``,
+    ``is_primary`` and ``column_name``, ordered by key position.
+    """
+
+    schema: dict[str, dict[str, Any]] = {}
+    for row in column_rows:
+        table = schema.setdefault(row["table_name"], {"columns": []})
+        table["columns"].append([row["column_name"], row["data_type"]])
+    if key_rows is None:
+        return schema
+
+    for table in schema.values():
+        table["primary_key"] = []
+        table["indexes"] = []
+    indexes: dict[tuple[str, str], dict[str, Any]] = {}
+    for row in key_rows:
+        table = schema.get(row["table_name"])
+        if table is None:
+            continue
+        if row["is_primary"]:
+            table["primary_key"].append(row["column_name"])
+            continue
+        index = indexes.get((row["table_name"], row["index_name"]))
+        if index is None:
+            index = {
+                "name": row["index_name"],
+                "unique": bool(row["is_unique"]),
+                "columns": [],
+            }
+            indexes[(row["table_name"], row["index_name"])] = index
+            table["indexes"].append(index)
+        index["columns"].append(row["column_name"])
+    return schema
 
 
 class DBClient(ABC):
+    """Provider-neutral database access.
+
+    Implementations run every statement inside ``db.cancel.cancellable``
+    with the driver's own way of stopping it from another thread, so a tool
+    call that is abandoned or out of time cancels its statement on the
+    server.
+    """
+
     @abstractmethod
     def execute(
         self, query: str, params: Sequence[Any] | None = None
     ) -> list[dict[str, Any]]:
         raise NotImplementedError
 
+    @abstractmethod
+    def iter_batches(
+        self,
+        query: str,
+        params: Sequence[Any] | None = None,
+        *,
+        batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+        row_limit: int | None = None,
+    ) -> Iterator[RowBatch]:
+        """Stream the rows of a read query in batches of at most ``batch_size``.
+
+        Implementations use server-side cursors where the driver supports
+        them, so only one batch is held in memory at a time. The cursor (and
+        its connection) stays busy until the generator is exhausted or
+        closed. ``row_limit`` is the most rows the query can return when the
+        caller knows it (e.g. from its pushed-down ``LIMIT``); such bounded
+        results may be read client-side instead.
+        """
+        raise NotImplementedError
+
+    def copy_csv(
+        self, query: str, params: Sequence[Any] | None, out: BinaryIO
+    ) -> tuple[list[list[str]], int] | None:
+        """Write the result of a read query to ``out`` as CSV, header first.
+
+        Providers with a bulk export path (PostgreSQL ``COPY``) return
+        ``(schema, row_count)``, ``schema`` listing ``[column, type]``; the
+        default ``None`` means the caller streams :meth:`iter_batches`.
+        """
+        return None
+
     @abstractmethod
     def list_tables(self) -> list[str]:
         raise NotImplementedError
@@ -19,6 +159,27 @@ class DBClient(ABC):
     def describe_table(self, table: str) -> list[dict[str, Any]]:
         raise NotImplementedError
 
+    @abstractmethod
+    def describe_schema(self, include_keys: bool = False) -> dict[str, dict[str, Any]]:
+        """Describe every table with one catalog query (plus one for keys).
+
+        Returns ``{table: {"columns": [[name, type], ...]}}``; with
+        ``include_keys`` each table also lists its ``primary_key`` columns and
+        its other ``indexes``.
+        """
+        raise NotImplementedError
+
+    def ping(self) -> None:
+        """Check that the database answers, without running user SQL."""
+        self.execute("SELECT 1")
+
+    def pool_stats(self) -> dict[str, int] | None:
+        return None
+
+    def statement_stats(self) -> dict[str, float] | None:
+        """Prepared statement cache counters, or ``None`` without a cache."""
+        return None
+
     @abstractmethod
     def close(self) -> None:
         raise NotImplementedError
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable
+
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.metrics import get_metrics
+
+LOGGER = logging.getLogger("sql_mcp_server.breaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops connection attempts to an instance that keeps failing.
+
+    After ``failure_threshold`` consecutive failed connects the breaker
+    opens and ``before_call`` fails fast for ``reset_timeout`` seconds. The
+    first call after that is let through as a trial (half-open): success
+    closes the breaker, failure opens it again. Other callers keep failing
+    fast while the trial is in flight.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._name = name
+        self._failure_threshold = max(failure_threshold, 1)
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._metrics = get_metrics()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            remaining = self._opened_at + self._reset_timeout - self._clock()
+            if self._state == OPEN and remaining <= 0:
+                self._transition_locked(HALF_OPEN)
+            if self._state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+        raise MCPError(
+            f"Database instance {self._name} is unavailable",
+            hint=(
+                "Connecting failed repeatedly; the next attempt is made in "
+                f"{max(remaining, 0.0):.1f}s"
+            ),
+            error_type="CircuitOpen",
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self._state != CLOSED:
+                self._transition_locked(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self._failure_threshold
+            ):
+                self._opened_at = self._clock()
+                self._transition_locked(OPEN)
+
+    def _transition_locked(self, state: str) -> None:
+        previous, self._state = self._state, state
+        log = LOGGER.warning if state == OPEN else LOGGER.info
+        log(
+            "Circuit breaker %s -> %s",
+            previous,
+            state,
+            extra={"instance_id": self._name, "consecutive_failures": self._failures},
+        )
+        self._metrics.increment(
+            "circuit_breaker_transitions_total", instance_id=self._name, state=state
+        )
+        self._metrics.set_gauge(
+            "circuit_breaker_open", 1 if state == OPEN else 0, instance_id=self._name
+        )
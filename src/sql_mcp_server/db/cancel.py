@@ -0,0 +1,221 @@
+"""Cancellation of the statement a tool call is running.
+
+Every tool call runs inside a :class:`CancelScope`. While a client executes a
+statement it registers how to interrupt it with :func:`cancellable`; when the
+MCP client abandons the request or its deadline passes, ``scope.cancel()``
+interrupts the statement on the database side instead of letting it run to
+completion on a connection nobody is waiting for.
+
+A scope may also carry a deadline (see :func:`deadline`). Pool checkout and
+the providers size their waits and per-statement timeouts from
+:func:`time_left`, a timer cancels whatever is still running when it passes,
+and :func:`phase` records how much of the budget each step used.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, TypeVar
+
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.metrics import get_metrics
+
+LOGGER = logging.getLogger("sql_mcp_server.cancel")
+
+T = TypeVar("T")
+
+_current: contextvars.ContextVar["CancelScope | None"] = contextvars.ContextVar(
+    "sql_mcp_cancel_scope", default=None
+)
+
+
+class CancelScope:
+    """Cancellation state of one tool call."""
+
+    def __init__(self, instance_id: str = "default") -> None:
+        self._instance_id = instance_id
+        self._lock = threading.Lock()
+        self._interrupt: Callable[[], None] | None = None
+        self.reason: str | None = None
+        self.deadline: float | None = None
+        self.budget: float | None = None
+        # Milliseconds spent per phase, excluding nested phases.
+        self.phases: dict[str, float] = {}
+        self._nested: list[float] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    def run(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Call ``fn`` with this scope as the current one."""
+        token = _current.set(self)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """Interrupt the running statement, if any, and refuse new ones.
+
+        Returns whether a statement was interrupted.
+        """
+        with self._lock:
+            if self.reason is not None:
+                return False
+            self.reason = reason
+            interrupt = self._interrupt
+            if interrupt is None:
+                return False
+            # Held while interrupting so the statement cannot finish and hand
+            # its connection to another call in the meantime.
+            try:
+                interrupt()
+            except Exception:
+                LOGGER.warning(
+                    "Could not cancel running statement",
+                    extra={"instance_id": self._instance_id},
+                    exc_info=True,
+                )
+                return False
+        LOGGER.info(
+            "Cancelled running statement",
+            extra={"instance_id": self._instance_id, "reason": reason},
+        )
+        get_metrics().increment(
+            "queries_cancelled_total", instance_id=self._instance_id, reason=reason
+        )
+        return True
+
+    def check(self) -> None:
+        if self.reason is not None:
+            raise cancelled_error(self.reason)
+
+    def timing(self) -> dict[str, float]:
+        """Budget use of a call with a deadline, in milliseconds."""
+        timing = {f"{name}_ms": round(ms, 3) for name, ms in self.phases.items()}
+        if self.budget is not None:
+            timing["budget_ms"] = round(self.budget * 1000, 3)
+        if self.deadline is not None:
+            timing["remaining_ms"] = round(max(self.deadline - time.monotonic(), 0.0) * 1000, 3)
+        return timing
+
+    @contextmanager
+    def _attach(self, interrupt: Callable[[], None]) -> Iterator[None]:
+        with self._lock:
+            self.check()
+            self._interrupt = interrupt
+        try:
+            yield
+        except Exception as exc:
+            reason = self.reason
+            if reason is None and self.deadline is not None and time.monotonic() >= self.deadline:
+                # Stopped by a driver-side timeout sized from the deadline
+                # before the timer fired.
+                reason = "deadline"
+            if reason is None:
+                raise
+            raise cancelled_error(reason) from exc
+        finally:
+            with self._lock:
+                self._interrupt = None
+
+
+def current_scope() -> CancelScope | None:
+    return _current.get()
+
+
+def time_left() -> float | None:
+    """Seconds until the current call's deadline, or ``None`` without one."""
+    scope = _current.get()
+    if scope is None or scope.deadline is None:
+        return None
+    return scope.deadline - time.monotonic()
+
+
+def cancelled_error(reason: str) -> MCPError:
+    if reason == "deadline":
+        return MCPError(
+            "Query exceeded its deadline",
+            hint=(
+                "Raise timeout_ms (up to the instance's DB_STATEMENT_TIMEOUT_MS) "
+                "or narrow the query"
+            ),
+            error_type="DeadlineExceeded",
+        )
+    return MCPError(
+        f"Query was cancelled ({reason})",
+        hint="The statement was stopped on the database; retry if still needed",
+        error_type="QueryCancelled",
+    )
+
+
+@contextmanager
+def cancellable(interrupt: Callable[[], None]) -> Iterator[None]:
+    """Let the current tool call interrupt the statement run inside the block.
+
+    ``interrupt`` is called from another thread and must be safe to call
+    while the statement is running (e.g. ``sqlite3.Connection.interrupt``).
+    Outside a scope this does nothing. A driver error raised because of the
+    cancellation surfaces as a ``QueryCancelled`` MCPError.
+    """
+    scope = _current.get()
+    if scope is None:
+        yield
+        return
+    with scope._attach(interrupt):
+        yield
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[CancelScope | None]:
+    """Give the current call ``seconds`` to finish.
+
+    Opens a scope if the call does not run in one yet (e.g. a tool function
+    called directly). When the deadline passes, the running statement is
+    cancelled and later statements are refused with ``DeadlineExceeded``.
+    """
+    scope = _current.get()
+    if seconds is None:
+        yield scope
+        return
+    token = None
+    if scope is None:
+        scope = CancelScope()
+        token = _current.set(scope)
+    scope.budget = seconds
+    scope.deadline = time.monotonic() + seconds
+    timer = threading.Timer(seconds, scope.cancel, ("deadline",))
+    timer.daemon = True
+    timer.start()
+    try:
+        yield scope
+    finally:
+        timer.cancel()
+        if token is not None:
+            _current.reset(token)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Record the time spent in the block under ``name`` for the current call.
+
+    Time spent in phases nested inside the block is attributed to them only.
+    """
+    scope = _current.get()
+    if scope is None or scope.deadline is None:
+        yield
+        return
+    started = time.perf_counter()
+    scope._nested.append(0.0)
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        nested = scope._nested.pop()
+        scope.phases[name] = scope.phases.get(name, 0.0) + (elapsed - nested) * 1000
+        if scope._nested:
+            scope._nested[-1] += elapsed
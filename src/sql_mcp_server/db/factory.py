@@ -1,11 +1,107 @@
 from __future__ import annotations
 
+import importlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Union
+
 from sql_mcp_server.config import ServerConfig
 from sql_mcp_server.db.base import DBClient
-from sql_mcp_server.db.mssql import MSSQLClient
-from sql_mcp_server.db.mysql import MySQLClient
-from sql_mcp_server.db.postgres import PostgresClient
-from sql_mcp_server.db.sqlite import SQLiteClient
+
+LOGGER = logging.getLogger("sql_mcp_server.db.factory")
+
+# Third-party packages register providers under this entry point group, e.g.
+# ``duckdb = "mcp_duckdb.client:DuckDBClient"``. The target is called with the
+# instance's ServerConfig and must return a DBClient.
+ENTRY_POINT_GROUP = "sql_mcp_server.providers"
+
+ClientFactory = Callable[[ServerConfig], DBClient]
+
+
+@dataclass
+class ProviderSpec:
+    """A database provider whose driver is only imported on first use.
+
+    ``target`` is either a factory or a ``"module:attribute"`` reference that
+    is imported the first time an instance of this provider is created.
+    """
+
+    name: str
+    target: Union[str, ClientFactory]
+    requires_credentials: bool = False
+    _factory: ClientFactory | None = field(default=None, repr=False)
+
+    def load(self) -> ClientFactory:
+        if self._factory is None:
+            target = self.target
+            if isinstance(target, str):
+                module_name, _, attribute = target.partition(":")
+                self._factory = getattr(importlib.import_module(module_name), attribute)
+            else:
+                self._factory = target
+        return self._factory
+
+
+_providers: dict[str, ProviderSpec] = {}
+_entry_points_loaded = False
+_lock = threading.Lock()
+
+
+def register_provider(
+    name: str,
+    target: Union[str, ClientFactory],
+    *,
+    requires_credentials: bool = False,
+) -> None:
+    """Make ``name`` available as a ``DB_PROVIDER`` value."""
+
+    with _lock:
+        _providers[name.lower()] = ProviderSpec(
+            name=name.lower(), target=target, requires_credentials=requires_credentials
+        )
+
+
+register_provider("sqlite", "sql_mcp_server.db.sqlite:SQLiteClient")
+register_provider(
+    "postgres", "sql_mcp_server.db.postgres:PostgresClient", requires_credentials=True
+)
+register_provider("mysql", "sql_mcp_server.db.mysql:MySQLClient", requires_credentials=True)
+register_provider("mssql", "sql_mcp_server.db.mssql:MSSQLClient", requires_credentials=True)
+
+
+def _load_entry_points() -> None:
+    global _entry_points_loaded
+    with _lock:
+        if _entry_points_loaded:
+            return
+        _entry_points_loaded = True
+        try:
+            # importlib.metadata is slow to import; only pay for it when a
+            # provider is not built in.
+            from importlib.metadata import entry_points
+
+            discovered = entry_points(group=ENTRY_POINT_GROUP)
+        except Exception:
+            LOGGER.warning("Could not read provider entry points", exc_info=True)
+            return
+        for entry_point in discovered:
+            name = entry_point.name.lower()
+            if name in _providers:
+                LOGGER.warning(
+                    "Ignoring provider entry point %s: %s is already registered",
+                    entry_point.value,
+                    name,
+                )
+                continue
+            # Only the ``module:attribute`` reference is recorded; the plugin
+            # is imported when an instance actually uses it.
+            _providers[name] = ProviderSpec(name=name, target=entry_point.value)
+
+
+def available_providers() -> list[str]:
+    _load_entry_points()
+    return sorted(_providers)
 
 
 def _validate_generic_credentials(config: ServerConfig) -> None:
@@ -16,19 +112,19 @@ def _validate_generic_credentials(config: ServerConfig) -> None:
 
 
 def create_db_client(config: ServerConfig) -> DBClient:
-    if config.provider == "sqlite":
-        return SQLiteClient(config)
-
-    if config.provider == "postgres":
-        _validate_generic_credentials(config)
-        return PostgresClient(config)
+    spec = _providers.get(config.provider)
+    if spec is None:
+        _load_entry_points()
+        spec = _providers.get(config.provider)
+    if spec is None:
+        raise RuntimeError(f"Unsupported DB_PROVIDER: {config.provider}")
 
-    if config.provider == "mysql":
+    if spec.requires_credentials:
         _validate_generic_credentials(config)
-        return MySQLClient(config)
-
-    if config.provider == "mssql":
-        _validate_generic_credentials(config)
-        return MSSQLClient(config)
-
-    raise RuntimeError(f"Unsupported DB_PROVIDER: {config.provider}")
+    try:
+        factory = spec.load()
+    except ImportError as exc:
+        raise RuntimeError(
+            f"The driver for DB_PROVIDER={config.provider} could not be imported: {exc}"
+        ) from exc
+    return factory(config)
@@ -1,12 +1,45 @@
 from __future__ import annotations
 
+import datetime as dt
+import decimal
 import os
-from typing import Any, Sequence
+import re
+import uuid
+from typing import Any, Iterator, Sequence
 
 import pyodbc
 
 from sql_mcp_server.config import ServerConfig
-from sql_mcp_server.db.base import DBClient
+from sql_mcp_server.db.base import (
+    DEFAULT_FETCH_BATCH_SIZE,
+    DBClient,
+    RowBatch,
+    group_schema,
+    iter_cursor_batches,
+)
+from sql_mcp_server.db.cancel import cancellable
+from sql_mcp_server.db.pool import ConnectionPool, PooledConnection
+from sql_mcp_server.db.statements import StatementCache, StatementStats
+from sql_mcp_server.encoding import BINARY, DATE, DATETIME, DECIMAL, FLOAT, PLAIN, TIME, UUID
+
+# pyodbc reports the Python type of each column in ``cursor.description``.
+_TYPE_KINDS = {
+    bool: PLAIN,
+    int: PLAIN,
+    str: PLAIN,
+    float: FLOAT,
+    decimal.Decimal: DECIMAL,
+    dt.datetime: DATETIME,
+    dt.date: DATE,
+    dt.time: TIME,
+    uuid.UUID: UUID,
+    bytes: BINARY,
+    bytearray: BINARY,
+}
+
+
+# Statements retried once when they fail on a stale pooled connection.
+_READ_RE = re.compile(r"\s*SELECT\b", re.IGNORECASE)
 
 
 class MSSQLClient(DBClient):
@@ -15,16 +48,39 @@ class MSSQLClient(DBClient):
         driver = self._resolve_driver()
         trust_server_certificate = config.mssql_trust_server_certificate
         trust_server_certificate_str = "yes" if trust_server_certificate else "no"
-        conn_str = (
+        self._conn_str = (
             f"DRIVER={{{driver}}};"
             f"SERVER={config.host},{config.port or 1433};"
             f"DATABASE={config.database};"
             f"UID={config.user};PWD={config.password};"
             f"Encrypt=yes;TrustServerCertificate={trust_server_certificate_str};"
         )
-        self._conn = pyodbc.connect(conn_str)
-        if config.query_timeout > 0:
-            self._conn.timeout = config.query_timeout
+        self._statement_stats = StatementStats(config.instance_id)
+        self._pool = ConnectionPool.from_config(
+            config,
+            self._connect,
+            ping=self._ping,
+            reset=self._reset,
+            stale_errors=(pyodbc.OperationalError, pyodbc.InterfaceError),
+        )
+
+    def _connect(self):
+        conn = pyodbc.connect(self._conn_str)
+        if self._config.query_timeout > 0:
+            conn.timeout = self._config.query_timeout
+        return conn
+
+    @staticmethod
+    def _ping(conn) -> None:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT 1").fetchall()
+        finally:
+            cur.close()
+
+    @staticmethod
+    def _reset(conn) -> None:
+        conn.rollback()
 
     def _resolve_driver(self) -> str:
         configured_driver = self._config.mssql_odbc_driver or os.getenv("DB_MSSQL_ODBC_DRIVER")
@@ -43,17 +99,102 @@ class MSSQLClient(DBClient):
 
         return "ODBC Driver 18 for SQL Server"
 
+    def _cursor(
+        self, pooled: PooledConnection, query: str, params: Sequence[Any] | None
+    ) -> tuple[Any, bool]:
+        """Return a cursor for ``query`` and whether the caller must close it.
+
+        pyodbc keeps the statement a cursor last prepared and skips
+        SQLPrepare when the same SQL runs on it again, so parameterized
+        queries get a cursor of their own, cached per connection.
+        """
+        if not params or self._config.prepared_cache_size <= 0:
+            return pooled.raw.cursor(), True
+        if pooled.statements is None:
+            pooled.statements = StatementCache(
+                self._config.prepared_cache_size,
+                self._statement_stats,
+                release=lambda cur: cur.close(),
+            )
+        cur = pooled.statements.get(query)
+        if cur is None:
+            cur = pooled.raw.cursor()
+            pooled.statements.put(query, cur)
+        return cur, False
+
+    def _run(self, pooled: PooledConnection, query: str, params: Sequence[Any] | None):
+        cur, owned = self._cursor(pooled, query, params)
+        try:
+            with cancellable(cur.cancel):
+                cur.execute(query, params or ())
+        except BaseException:
+            if owned:
+                cur.close()
+            else:
+                pooled.statements.discard(query)
+            raise
+        return cur, owned
+
     def execute(
         self, query: str, params: Sequence[Any] | None = None
     ) -> list[dict[str, Any]]:
-        cur = self._conn.cursor()
-        cur.execute(query, params or ())
-        if cur.description is None:
-            self._conn.commit()
-            return []
-        columns = [c[0] for c in cur.description]
-        rows = cur.fetchall()
-        return [dict(zip(columns, row)) for row in rows]
+        retry = _READ_RE.match(query) is not None
+        verify = False
+        while True:
+            with self._pool.connection(verify=verify) as pooled:
+                conn = pooled.raw
+                try:
+                    cur, owned = self._run(pooled, query, params)
+                except Exception as exc:
+                    if verify or not retry or not self._pool.retry_stale(pooled, exc):
+                        raise
+                    verify = True
+                    continue
+                try:
+                    if cur.description is None:
+                        conn.commit()
+                        return []
+                    columns = [c[0] for c in cur.description]
+                    with cancellable(cur.cancel):
+                        rows = cur.fetchall()
+                    return [dict(zip(columns, row)) for row in rows]
+                finally:
+                    if owned:
+                        cur.close()
+
+    def iter_batches(
+        self,
+        query: str,
+        params: Sequence[Any] | None = None,
+        *,
+        batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+        row_limit: int | None = None,
+    ) -> Iterator[RowBatch]:
+        verify = False
+        while True:
+            with self._pool.connection(verify=verify) as pooled:
+                try:
+                    cur, owned = self._run(pooled, query, params)
+                except Exception as exc:
+                    # Nothing was read yet, so the query can run again.
+                    if verify or not self._pool.retry_stale(pooled, exc):
+                        raise
+                    verify = True
+                    continue
+                exhausted = False
+                try:
+                    yield from iter_cursor_batches(cur, batch_size, cur.cancel, _TYPE_KINDS)
+                    exhausted = True
+                finally:
+                    if owned:
+                        cur.close()
+                    elif not exhausted:
+                        # A cached cursor stopped early still has pending
+                        # results and would keep the connection busy for the
+                        # next statement; dropping it from the cache closes
+                        # it.
+                        pooled.statements.discard(query)
+                return
 
     def list_tables(self) -> list[str]:
         rows = self.execute(
@@ -73,5 +214,50 @@ class MSSQLClient(DBClient):
             (table,),
         )
 
+    def describe_schema(self, include_keys: bool = False) -> dict[str, dict[str, Any]]:
+        columns = self.execute(
+            "\n".join(
+                [
+                    "SELECT t.name AS table_name, c.name AS column_name, ty.name AS data_type",
+                    "FROM sys.tables AS t",
+                    "JOIN sys.columns AS c ON c.object_id = t.object_id",
+                    "JOIN sys.types AS ty ON ty.user_type_id = c.user_type_id",
+                    "ORDER BY t.name, c.column_id",
+                ]
+            )
+        )
+        if not include_keys:
+            return group_schema(columns)
+        keys = self.execute(
+            "\n".join(
+                [
+                    "SELECT t.name AS table_name, i.name AS index_name,",
+                    "       i.is_unique AS is_unique, i.is_primary_key AS is_primary,",
+                    "       c.name AS column_name",
+                    "FROM sys.indexes AS i",
+                    "JOIN sys.tables AS t ON t.object_id = i.object_id",
+                    "JOIN sys.index_columns AS ic",
+                    "  ON ic.object_id = i.object_id AND ic.index_id = i.index_id",
+                    "JOIN sys.columns AS c",
+                    "  ON c.object_id = ic.object_id AND c.column_id = ic.column_id",
+                    "WHERE i.index_id > 0 AND ic.is_included_column = 0",
+                    "ORDER BY t.name, i.is_primary_key DESC, i.name, ic.key_ordinal",
+                ]
+            )
+        )
+        return group_schema(columns, keys)
+
+    def ping(self) -> None:
+        with self._pool.connection() as pooled:
+            self._ping(pooled.raw)
+
+    def pool_stats(self) -> dict[str, int]:
+        return self._pool.stats()
+
+    def statement_stats(self) -> dict[str, float] | None:
+        if self._config.prepared_cache_size <= 0:
+            return None
+        return self._statement_stats.snapshot()
+
     def close(self) -> None:
-        self._conn.close()
+        self._pool.close()
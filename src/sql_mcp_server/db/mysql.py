@@ -1,47 +1,246 @@
 from __future__ import annotations
 
-from typing import Any, Sequence
+import re
+from typing import Any, Iterator, Sequence
 
 import pymysql
+from pymysql.constants import FIELD_TYPE
 
 from sql_mcp_server.config import ServerConfig
-from sql_mcp_server.db.base import DBClient
+from sql_mcp_server.db.base import (
+    DEFAULT_FETCH_BATCH_SIZE,
+    DBClient,
+    RowBatch,
+    group_schema,
+    iter_cursor_batches,
+)
+from sql_mcp_server.db.cancel import cancellable, current_scope, time_left
+from sql_mcp_server.db.pool import ConnectionPool
+from sql_mcp_server.encoding import (
+    BINARY,
+    DATE,
+    DATETIME,
+    DECIMAL,
+    FLOAT,
+    PLAIN,
+    TIMEDELTA,
+)
+
+# Field types of ``cursor.description`` and how their values are encoded.
+# CHAR/BLOB-like types return ``str`` or ``bytes`` depending on the column's
+# charset, so they are converted value by value.
+_TYPE_KINDS = {
+    FIELD_TYPE.TINY: PLAIN,
+    FIELD_TYPE.SHORT: PLAIN,
+    FIELD_TYPE.LONG: PLAIN,
+    FIELD_TYPE.LONGLONG: PLAIN,
+    FIELD_TYPE.INT24: PLAIN,
+    FIELD_TYPE.YEAR: PLAIN,
+    FIELD_TYPE.JSON: PLAIN,
+    FIELD_TYPE.FLOAT: FLOAT,
+    FIELD_TYPE.DOUBLE: FLOAT,
+    FIELD_TYPE.DECIMAL: DECIMAL,
+    FIELD_TYPE.NEWDECIMAL: DECIMAL,
+    FIELD_TYPE.DATE: DATE,
+    FIELD_TYPE.DATETIME: DATETIME,
+    FIELD_TYPE.TIMESTAMP: DATETIME,
+    FIELD_TYPE.TIME: TIMEDELTA,
+    FIELD_TYPE.BIT: BINARY,
+}
+
+# Statements retried once when they fail on a stale pooled connection.
+_READ_RE = re.compile(r"\s*(SELECT|SHOW|DESCRIBE)\b", re.IGNORECASE)
+
+# Statements that can carry a MAX_EXECUTION_TIME optimizer hint after their
+# leading SELECT keyword.
+_SELECT_RE = re.compile(r"\s*SELECT\b", re.IGNORECASE)
 
 
 class MySQLClient(DBClient):
     def __init__(self, config: ServerConfig) -> None:
         self._config = config
-        self._conn = pymysql.connect(
-            host=config.host,
-            port=config.port or 3306,
-            user=config.user,
-            password=config.password,
-            database=config.database,
-            connect_timeout=config.query_timeout,
+        self._pool = ConnectionPool.from_config(
+            config,
+            self._connect,
+            ping=self._ping,
+            reset=self._reset,
+            stale_errors=(pymysql.err.OperationalError, pymysql.err.InterfaceError),
+        )
+        # A session blocked on its result cannot be stopped from itself, so
+        # KILL QUERY is sent over a session of its own, kept for reuse.
+        self._control = ConnectionPool(
+            self._open,
+            min_size=0,
+            max_size=1,
+            checkout_timeout=config.pool_timeout,
+            ping=self._ping,
+            name=f"{config.instance_id}-control",
+        )
+
+    def _open(self):
+        return pymysql.connect(
+            host=self._config.host,
+            port=self._config.port or 3306,
+            user=self._config.user,
+            password=self._config.password,
+            database=self._config.database,
+            connect_timeout=self._config.query_timeout,
             cursorclass=pymysql.cursors.DictCursor,
         )
-        self._configure_statement_timeout()
 
-    def _configure_statement_timeout(self) -> None:
+    def _connect(self):
+        conn = self._open()
+        try:
+            self._configure_statement_timeout(conn)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def _configure_statement_timeout(self, conn) -> None:
         if self._config.statement_timeout_ms <= 0:
             return
 
-        with self._conn.cursor() as cur:
+        with conn.cursor() as cur:
             cur.execute(
                 "SET SESSION MAX_EXECUTION_TIME = %s",
                 (self._config.statement_timeout_ms,),
             )
-        self._conn.commit()
+        conn.commit()
+
+    @staticmethod
+    def _ping(conn) -> None:
+        conn.ping(reconnect=False)
+
+    @staticmethod
+    def _reset(conn) -> None:
+        conn.rollback()
+
+    @staticmethod
+    def _apply_deadline(conn, query: str) -> tuple[str, bool]:
+        """Cap ``query`` at the call's remaining budget.
+
+        A plain SELECT carries the limit as a ``MAX_EXECUTION_TIME``
+        optimizer hint, which costs no round trip. Other statements (e.g.
+        ``WITH ... SELECT``) set the session variable instead; the flag
+        returned tells whether it must be restored afterwards.
+        """
+        left = time_left()
+        if left is None:
+            return query, False
+        limit_ms = max(int(left * 1000), 1)
+        select = _SELECT_RE.match(query)
+        if select is not None:
+            hint = f" /*+ MAX_EXECUTION_TIME({limit_ms}) */"
+            return query[: select.end()] + hint + query[select.end() :], False
+        with conn.cursor() as cur:
+            cur.execute("SET SESSION MAX_EXECUTION_TIME = %s", (limit_ms,))
+        return query, True
+
+    def _restore_timeout(self, pooled) -> None:
+        try:
+            with pooled.raw.cursor() as cur:
+                cur.execute(
+                    "SET SESSION MAX_EXECUTION_TIME = %s",
+                    (max(self._config.statement_timeout_ms, 0),),
+                )
+        except Exception:
+            # Never hand out a connection with another call's limit.
+            pooled.broken = True
+
+    def _interrupt(self, conn):
+        thread_id = conn.thread_id()
+
+        def kill_query() -> None:
+            # The connection survives; only its running statement stops.
+            with self._control.connection() as control:
+                with control.raw.cursor() as cur:
+                    cur.execute("KILL QUERY %s", (thread_id,))
+
+        return kill_query
 
     def execute(
         self, query: str, params: Sequence[Any] | None = None
     ) -> list[dict[str, Any]]:
-        with self._conn.cursor() as cur:
-            cur.execute(query, params or None)
-            if cur.description is None:
-                self._conn.commit()
-                return []
-            return list(cur.fetchall())
+        retry = _READ_RE.match(query) is not None
+        verify = False
+        while True:
+            with self._pool.connection(verify=verify) as pooled:
+                conn = pooled.raw
+                limited = False
+                try:
+                    statement, limited = self._apply_deadline(conn, query)
+                    with conn.cursor() as cur, cancellable(self._interrupt(conn)):
+                        cur.execute(statement, params or None)
+                        if cur.description is None:
+                            conn.commit()
+                            return []
+                        return list(cur.fetchall())
+                except Exception as exc:
+                    if verify or not retry or not self._pool.retry_stale(pooled, exc):
+                        raise
+                    verify = True
+                    continue
+                finally:
+                    if limited and not pooled.broken:
+                        self._restore_timeout(pooled)
+
+    def iter_batches(
+        self,
+        query: str,
+        params: Sequence[Any] | None = None,
+        *,
+        batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+        row_limit: int | None = None,
+    ) -> Iterator[RowBatch]:
+        verify = False
+        while True:
+            with self._pool.connection(verify=verify) as pooled:
+                conn = pooled.raw
+                # A bounded result is small enough to buffer client-side,
+                # which leaves nothing pending when the caller stops early.
+                # Otherwise SSCursor streams rows from the server instead of
+                # buffering the whole result.
+                unbuffered = row_limit is None
+                cur = conn.cursor(
+                    pymysql.cursors.SSCursor if unbuffered else pymysql.cursors.Cursor
+                )
+                interrupt = self._interrupt(conn)
+                limited = streaming = False
+                try:
+                    try:
+                        statement, limited = self._apply_deadline(conn, query)
+                        with cancellable(interrupt):
+                            cur.execute(statement, params or None)
+                    except Exception as exc:
+                        # Nothing was read yet, so the query can run again.
+                        if verify or not self._pool.retry_stale(pooled, exc):
+                            raise
+                        verify = True
+                        continue
+                    streaming = unbuffered
+                    yield from iter_cursor_batches(cur, batch_size, interrupt, _TYPE_KINDS)
+                    streaming = False
+                    return
+                finally:
+                    scope = current_scope()
+                    try:
+                        if streaming and scope is not None and scope.cancelled:
+                            # Cancelled or past its deadline: stop the
+                            # statement rather than read the rest of its rows.
+                            # Its result stays pending, so the connection is
+                            # not reused.
+                            pooled.broken = True
+                            interrupt()
+                        else:
+                            # Closing a stream early reads its remaining rows;
+                            # a cancellation meanwhile kills the statement.
+                            with cancellable(interrupt):
+                                cur.close()
+                    except Exception:
+                        pooled.broken = True
+                    if limited and not pooled.broken:
+                        self._restore_timeout(pooled)
 
     def list_tables(self) -> list[str]:
         rows = self.execute("SHOW TABLES")
@@ -51,5 +250,41 @@ class MySQLClient(DBClient):
         escaped = table.replace("`", "``")
         return self.execute(f"DESCRIBE `{escaped}`")
 
+    def describe_schema(self, include_keys: bool = False) -> dict[str, dict[str, Any]]:
+        columns = self.execute(
+            "\n".join(
+                [
+                    "SELECT TABLE_NAME AS table_name, COLUMN_NAME AS column_name,",
+                    "       COLUMN_TYPE AS data_type",
+                    "FROM information_schema.COLUMNS",
+                    "WHERE TABLE_SCHEMA = DATABASE()",
+                    "ORDER BY TABLE_NAME, ORDINAL_POSITION",
+                ]
+            )
+        )
+        if not include_keys:
+            return group_schema(columns)
+        keys = self.execute(
+            "\n".join(
+                [
+                    "SELECT TABLE_NAME AS table_name, INDEX_NAME AS index_name,",
+                    "       NON_UNIQUE = 0 AS is_unique, INDEX_NAME = 'PRIMARY' AS is_primary,",
+                    "       COLUMN_NAME AS column_name",
+                    "FROM information_schema.STATISTICS",
+                    "WHERE TABLE_SCHEMA = DATABASE()",
+                    "ORDER BY TABLE_NAME, is_primary DESC, INDEX_NAME, SEQ_IN_INDEX",
+                ]
+            )
+        )
+        return group_schema(columns, keys)
+
+    def ping(self) -> None:
+        with self._pool.connection() as pooled:
+            self._ping(pooled.raw)
+
+    def pool_stats(self) -> dict[str, int]:
+        return self._pool.stats()
+
     def close(self) -> None:
-        self._conn.close()
+        self._pool.close()
+        self._control.close()
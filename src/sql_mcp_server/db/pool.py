@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from sql_mcp_server.config import ServerConfig
+from sql_mcp_server.db.breaker import CLOSED, CircuitBreaker
+from sql_mcp_server.db.cancel import cancelled_error, phase, time_left
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.metrics import get_metrics
+
+LOGGER = logging.getLogger("sql_mcp_server.pool")
+
+# Upper bound of a single reconnect backoff, in seconds.
+MAX_CONNECT_BACKOFF = 5.0
+
+
+@dataclass(slots=True, eq=False)
+class PooledConnection:
+    raw: Any
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    broken: bool = False
+    # False when handed out without a ping (see ``ping_idle``).
+    verified: bool = True
+    # Per-connection client state, such as its prepared statement cache.
+    statements: Any = None
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of DB-API connections.
+
+    Connections are created lazily up to ``max_size`` (``min_size`` of them
+    are opened eagerly), handed out LIFO so hot connections stay warm, and
+    closed when they sit idle longer than ``idle_timeout`` while the pool is
+    above ``min_size``. Session setup belongs in ``connect`` so it runs once
+    per physical connection.
+
+    Dead connections are dropped (by ``ping`` on checkout of a connection
+    idle for more than ``ping_idle`` seconds, or when ``reset`` fails on
+    release) and replaced on demand. Callers retry idempotent work that
+    failed with one of the ``stale_errors`` on a connection that skipped
+    its ping (see :meth:`retry_stale`). A failed connect is retried up
+    to ``connect_retries`` times with jittered exponential backoff, within
+    the checkout deadline; with a ``breaker``, an instance whose connects
+    keep failing is failed fast instead.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        *,
+        min_size: int = 1,
+        max_size: int = 5,
+        checkout_timeout: float = 10.0,
+        idle_timeout: float = 300.0,
+        ping: Callable[[Any], None] | None = None,
+        ping_idle: float = 0.0,
+        reset: Callable[[Any], None] | None = None,
+        name: str = "default",
+        breaker: CircuitBreaker | None = None,
+        connect_retries: int = 0,
+        connect_backoff: float = 0.2,
+        stale_errors: tuple[type[BaseException], ...] = (),
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._connect = connect
+        self._min_size = max(0, min(min_size, max_size))
+        self._max_size = max_size
+        self._checkout_timeout = checkout_timeout
+        self._idle_timeout = idle_timeout
+        self._ping = ping
+        self._ping_idle = max(ping_idle, 0.0)
+        self._reset = reset
+        self._name = name
+        self._breaker = breaker
+        self._connect_retries = max(connect_retries, 0)
+        self._connect_backoff = connect_backoff
+        self._stale_errors = stale_errors
+        self._idle: deque[PooledConnection] = deque()
+        self._size = 0
+        self._waiting = 0
+        self._created = 0
+        self._discarded = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        deadline = time.monotonic() + checkout_timeout
+        for _ in range(self._min_size):
+            try:
+                conn = self._open(deadline)
+            except Exception:
+                # The database may come up later; connections are then
+                # opened on demand.
+                LOGGER.warning(
+                    "Could not open initial pooled connection",
+                    extra={"pool": self._name},
+                    exc_info=True,
+                )
+                break
+            self._idle.append(conn)
+            self._size += 1
+
+    @classmethod
+    def from_config(
+        cls,
+        config: ServerConfig,
+        connect: Callable[[], Any],
+        *,
+        ping: Callable[[Any], None] | None = None,
+        reset: Callable[[Any], None] | None = None,
+        stale_errors: tuple[type[BaseException], ...] = (),
+    ) -> "ConnectionPool":
+        return cls(
+            connect,
+            min_size=config.pool_min_size,
+            max_size=config.pool_max_size,
+            checkout_timeout=config.pool_timeout,
+            idle_timeout=config.pool_idle_timeout,
+            ping=ping if config.pool_pre_ping else None,
+            ping_idle=config.pool_pre_ping_idle,
+            reset=reset,
+            name=config.instance_id,
+            breaker=(
+                CircuitBreaker(
+                    config.instance_id,
+                    failure_threshold=config.breaker_threshold,
+                    reset_timeout=config.breaker_reset_timeout,
+                )
+                if config.breaker_threshold > 0
+                else None
+            ),
+            connect_retries=config.connect_retries,
+            connect_backoff=config.connect_backoff,
+            stale_errors=stale_errors,
+        )
+
+    def _open(self, deadline: float | None = None) -> PooledConnection:
+        attempt = 0
+        while True:
+            if self._breaker is not None:
+                self._breaker.before_call()
+            try:
+                raw = self._connect()
+            except Exception:
+                if self._breaker is not None:
+                    self._breaker.record_failure()
+                delay = self._retry_delay(attempt, deadline)
+                if delay is None:
+                    raise
+                attempt += 1
+                get_metrics().increment("connection_retries_total", instance_id=self._name)
+                LOGGER.info(
+                    "Connect failed, retrying in %.2fs",
+                    delay,
+                    extra={"pool": self._name, "attempt": attempt},
+                )
+                time.sleep(delay)
+                continue
+            if self._breaker is not None:
+                self._breaker.record_success()
+            conn = PooledConnection(raw=raw)
+            with self._cond:
+                self._created += 1
+            return conn
+
+    def _retry_delay(self, attempt: int, deadline: float | None) -> float | None:
+        if attempt >= self._connect_retries:
+            return None
+        if self._breaker is not None and self._breaker.state != CLOSED:
+            return None
+        # Full jitter keeps callers that lost their connections together from
+        # reconnecting in lockstep.
+        delay = random.uniform(0, min(MAX_CONNECT_BACKOFF, self._connect_backoff * 2**attempt))
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    def _close_raw(self, conn: PooledConnection) -> None:
+        try:
+            conn.raw.close()
+        except Exception:
+            LOGGER.debug("Error while closing pooled connection", exc_info=True)
+
+    def _discard(self, conn: PooledConnection) -> None:
+        self._close_raw(conn)
+        with self._cond:
+            self._size -= 1
+            self._discarded += 1
+            self._cond.notify()
+
+    def _evict_idle_locked(self) -> list[PooledConnection]:
+        if self._idle_timeout <= 0:
+            return []
+        expired: list[PooledConnection] = []
+        cutoff = time.monotonic() - self._idle_timeout
+        # The left end of the deque holds the connections idle the longest.
+        while self._idle and self._size > self._min_size and self._idle[0].last_used < cutoff:
+            expired.append(self._idle.popleft())
+            self._size -= 1
+            self._discarded += 1
+        return expired
+
+    def _is_alive(self, conn: PooledConnection, verify: bool) -> bool:
+        # A connection released moments ago is almost certainly alive; one
+        # that died anyway fails its query (see ``retry_stale``).
+        conn.verified = self._ping is not None and (
+            verify or time.monotonic() - conn.last_used >= self._ping_idle
+        )
+        if not conn.verified:
+            return True
+        try:
+            self._ping(conn.raw)
+        except Exception:
+            LOGGER.info("Discarding dead pooled connection", extra={"pool": self._name})
+            return False
+        return True
+
+    def acquire(self, timeout: float | None = None, *, verify: bool = False) -> PooledConnection:
+        """Check out a connection; ``verify`` pings it however recently it was used."""
+        with phase("checkout"):
+            return self._acquire(timeout, verify)
+
+    def _acquire(self, timeout: float | None, verify: bool) -> PooledConnection:
+        wait = self._checkout_timeout if timeout is None else timeout
+        # A call with a deadline never waits past it.
+        left = time_left()
+        bounded_by_call = left is not None and left < wait
+        if bounded_by_call:
+            wait = left
+        deadline = time.monotonic() + max(wait, 0.0)
+        while True:
+            create = False
+            conn: PooledConnection | None = None
+            with self._cond:
+                if self._closed:
+                    raise MCPError(
+                        "Connection pool is closed",
+                        error_type="PoolClosed",
+                    )
+                expired = self._evict_idle_locked()
+                if self._idle:
+                    conn = self._idle.pop()
+                elif self._size < self._max_size:
+                    self._size += 1
+                    create = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        if bounded_by_call:
+                            raise cancelled_error("deadline")
+                        raise MCPError(
+                            "Timed out waiting for a database connection",
+                            hint="The instance is saturated; retry later or raise DB_POOL_MAX",
+                            error_type="PoolTimeout",
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+            for stale in expired:
+                self._close_raw(stale)
+            if create:
+                try:
+                    return self._open(deadline)
+                except BaseException:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            if conn is None:
+                continue
+            if not self._is_alive(conn, verify):
+                self._discard(conn)
+                continue
+            return conn
+
+    def release(self, conn: PooledConnection, *, broken: bool = False) -> None:
+        broken = broken or conn.broken
+        if not broken and self._reset is not None:
+            try:
+                self._reset(conn.raw)
+            except Exception:
+                broken = True
+        with self._cond:
+            if not broken and not self._closed:
+                conn.last_used = time.monotonic()
+                self._idle.append(conn)
+                self._cond.notify()
+                return
+        self._discard(conn)
+
+    def retry_stale(self, conn: PooledConnection, exc: BaseException) -> bool:
+        """Whether idempotent work that failed on ``conn`` should run again.
+
+        A connection handed out without a ping may have died since its last
+        use, e.g. across a database restart. When it fails with one of the
+        ``stale_errors`` it is dropped, and the caller runs its work once
+        more on ``connection(verify=True)``.
+        """
+        if conn.verified or not isinstance(exc, self._stale_errors):
+            return False
+        conn.broken = True
+        LOGGER.info(
+            "Retrying on another connection after a stale one failed",
+            extra={"pool": self._name},
+        )
+        get_metrics().increment("stale_connection_retries_total", instance_id=self._name)
+        return True
+
+    @contextmanager
+    def connection(
+        self, timeout: float | None = None, *, verify: bool = False
+    ) -> Iterator[PooledConnection]:
+        conn = self.acquire(timeout, verify=verify)
+        try:
+            yield conn
+        finally:
+            # The reset hook (usually a rollback) decides whether the
+            # connection survived a failure inside the block.
+            self.release(conn)
+
+    def stats(self) -> dict[str, int]:
+        breaker_open = self._breaker is not None and self._breaker.state != CLOSED
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "waiting": self._waiting,
+                "min_size": self._min_size,
+                "max_size": self._max_size,
+                "created": self._created,
+                "discarded": self._discarded,
+                "breaker_open": int(breaker_open),
+            }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            self._close_raw(conn)
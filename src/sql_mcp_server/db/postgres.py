@@ -1,44 +1,281 @@
 from __future__ import annotations
 
-from typing import Any, Sequence
+import itertools
+import re
+from typing import Any, BinaryIO, Iterator, Sequence
 
 import psycopg2
 import psycopg2.extras
 
 from sql_mcp_server.config import ServerConfig
-from sql_mcp_server.db.base import DBClient
+from sql_mcp_server.db.base import (
+    DEFAULT_FETCH_BATCH_SIZE,
+    DBClient,
+    RowBatch,
+    group_schema,
+    iter_cursor_batches,
+)
+from sql_mcp_server.db.cancel import cancellable, time_left
+from sql_mcp_server.db.pool import ConnectionPool, PooledConnection
+from sql_mcp_server.db.statements import StatementCache, StatementStats
+from sql_mcp_server.encoding import (
+    BINARY,
+    DATE,
+    DATETIME,
+    DECIMAL,
+    FLOAT,
+    PLAIN,
+    TIME,
+    TIMEDELTA,
+    UUID,
+)
+from sql_mcp_server.middleware.sql_lexer import numbered_placeholders
+
+# Type OIDs of ``cursor.description`` and how their values are encoded.
+# Other types (arrays, ranges, extensions) are converted value by value.
+_TYPE_KINDS = {
+    16: PLAIN,  # bool
+    20: PLAIN,  # int8
+    21: PLAIN,  # int2
+    23: PLAIN,  # int4
+    25: PLAIN,  # text
+    114: PLAIN,  # json
+    1042: PLAIN,  # bpchar
+    1043: PLAIN,  # varchar
+    3802: PLAIN,  # jsonb
+    700: FLOAT,
+    701: FLOAT,
+    1700: DECIMAL,
+    1082: DATE,
+    1083: TIME,
+    1266: TIME,  # timetz
+    1114: DATETIME,
+    1184: DATETIME,  # timestamptz
+    1186: TIMEDELTA,  # interval
+    2950: UUID,
+    17: BINARY,  # bytea
+}
+
+# SQLSTATEs of an EXECUTE whose prepared statement must be dropped: the
+# cached plan no longer matches a changed table (feature_not_supported) or
+# the statement is gone from the session (invalid_sql_statement_name).
+_UNKNOWN_STATEMENT = "26000"
+_STALE_STATEMENT_CODES = {"0A000", _UNKNOWN_STATEMENT}
+
+# Statements retried once when they fail on a stale pooled connection.
+_READ_RE = re.compile(r"\s*SELECT\b", re.IGNORECASE)
+
+# Statement kinds PREPARE accepts.
+_PREPARABLE_RE = re.compile(r"\s*(SELECT|INSERT|UPDATE|DELETE|VALUES|WITH)\b", re.IGNORECASE)
 
 
 class PostgresClient(DBClient):
     def __init__(self, config: ServerConfig) -> None:
         self._config = config
-        self._conn = psycopg2.connect(
-            host=config.host,
-            port=config.port or 5432,
-            dbname=config.database,
-            user=config.user,
-            password=config.password,
-            connect_timeout=config.query_timeout,
+        self._cursor_ids = itertools.count(1)
+        self._statement_ids = itertools.count(1)
+        self._statement_stats = StatementStats(config.instance_id)
+        self._pool = ConnectionPool.from_config(
+            config,
+            self._connect,
+            ping=self._ping,
+            reset=self._reset,
+            stale_errors=(psycopg2.OperationalError, psycopg2.InterfaceError),
         )
-        self._configure_statement_timeout()
 
-    def _configure_statement_timeout(self) -> None:
+    def _connect(self):
+        conn = psycopg2.connect(
+            host=self._config.host,
+            port=self._config.port or 5432,
+            dbname=self._config.database,
+            user=self._config.user,
+            password=self._config.password,
+            connect_timeout=self._config.query_timeout,
+        )
+        try:
+            self._configure_statement_timeout(conn)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def _configure_statement_timeout(self, conn) -> None:
         if self._config.statement_timeout_ms <= 0:
             return
 
-        with self._conn.cursor() as cur:
+        with conn.cursor() as cur:
             cur.execute("SET statement_timeout = %s", (self._config.statement_timeout_ms,))
-        self._conn.commit()
+        conn.commit()
+
+    @staticmethod
+    def _ping(conn) -> None:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+
+    @staticmethod
+    def _reset(conn) -> None:
+        conn.rollback()
+
+    @staticmethod
+    def _apply_deadline(conn) -> None:
+        """Cap the next statement at the call's remaining budget."""
+        left = time_left()
+        if left is None:
+            return
+        with conn.cursor() as cur:
+            # SET LOCAL ends with the transaction: the commit after a write or
+            # the pool's rollback on release.
+            cur.execute("SET LOCAL statement_timeout = %s", (max(int(left * 1000), 1),))
+
+    def _statements(self, pooled: PooledConnection) -> StatementCache | None:
+        if self._config.prepared_cache_size <= 0:
+            return None
+        if pooled.statements is None:
+            conn = pooled.raw
+            pooled.statements = StatementCache(
+                self._config.prepared_cache_size,
+                self._statement_stats,
+                release=lambda prepared: self._deallocate(conn, prepared[0]),
+            )
+        return pooled.statements
+
+    @staticmethod
+    def _deallocate(conn, name: str) -> None:
+        with conn.cursor() as cur:
+            cur.execute(f"DEALLOCATE {name}")
+
+    def _execute_prepared(
+        self, pooled: PooledConnection, cur, query: str, params: Sequence[Any] | None
+    ) -> None:
+        """Run ``query`` through a per-connection ``PREPARE``d statement.
+
+        Only parameterized statements are prepared: they are the ones that
+        run again with other values. Statements without parameters, those
+        PREPARE cannot handle and those whose placeholders cannot be
+        rewritten safely run as plain statements.
+        """
+        statements = self._statements(pooled)
+        if statements is None or not params or not _PREPARABLE_RE.match(query):
+            cur.execute(query, params or None)
+            return
+        prepared = statements.get(query)
+        if prepared is None:
+            rewritten = numbered_placeholders(query)
+            if rewritten is None or rewritten[1] != len(params):
+                cur.execute(query, params)
+                return
+            text, count = rewritten
+            prepared = (f"mcp_stmt_{next(self._statement_ids)}", count)
+            # PREPARE itself is sent verbatim; psycopg2 only interpolates
+            # when parameters are passed.
+            cur.execute(f"PREPARE {prepared[0]} AS {text}")
+            statements.put(query, prepared)
+        name, count = prepared
+        try:
+            cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * count)})", params)
+        except psycopg2.Error as exc:
+            if exc.pgcode not in _STALE_STATEMENT_CODES:
+                # The statement itself is still usable; the pool's rollback
+                # cleans up the transaction.
+                raise
+            # DEALLOCATE would fail inside the aborted transaction, so roll
+            # back first; the next call prepares the statement again.
+            pooled.raw.rollback()
+            statements.discard(query, release=exc.pgcode != _UNKNOWN_STATEMENT)
+            raise
 
     def execute(
         self, query: str, params: Sequence[Any] | None = None
     ) -> list[dict[str, Any]]:
-        with self._conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            cur.execute(query, params or None)
-            if cur.description is None:
-                self._conn.commit()
-                return []
-            return list(cur.fetchall())
+        retry = _READ_RE.match(query) is not None
+        verify = False
+        while True:
+            with self._pool.connection(verify=verify) as pooled:
+                conn = pooled.raw
+                try:
+                    # ``connection.cancel`` asks the server to cancel the
+                    # running statement, like pg_cancel_backend, over a
+                    # separate channel.
+                    with conn.cursor(
+                        cursor_factory=psycopg2.extras.RealDictCursor
+                    ) as cur, cancellable(conn.cancel):
+                        self._apply_deadline(conn)
+                        self._execute_prepared(pooled, cur, query, params)
+                        if cur.description is None:
+                            conn.commit()
+                            return []
+                        return list(cur.fetchall())
+                except Exception as exc:
+                    if verify or not retry or not self._pool.retry_stale(pooled, exc):
+                        raise
+                    verify = True
+                    continue
+
+    def iter_batches(
+        self,
+        query: str,
+        params: Sequence[Any] | None = None,
+        *,
+        batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+        row_limit: int | None = None,
+    ) -> Iterator[RowBatch]:
+        verify = False
+        while True:
+            with self._pool.connection(verify=verify) as pooled:
+                conn = pooled.raw
+                if row_limit is not None:
+                    # A bounded result is read client-side, so it can run as
+                    # an EXECUTE of a prepared statement; batches are then
+                    # cut from the client buffer.
+                    cur = conn.cursor()
+                else:
+                    # Named cursors are server-side: rows are transferred in
+                    # ``itersize`` chunks instead of all at once. DECLARE
+                    # cannot wrap EXECUTE, so unbounded reads do not use
+                    # prepared statements.
+                    cur = conn.cursor(name=f"mcp_stream_{next(self._cursor_ids)}")
+                    cur.itersize = batch_size
+                try:
+                    try:
+                        with cancellable(conn.cancel):
+                            self._apply_deadline(conn)
+                            if row_limit is not None:
+                                self._execute_prepared(pooled, cur, query, params)
+                            else:
+                                cur.execute(query, params or None)
+                    except Exception as exc:
+                        # Nothing was read yet, so the query can run again.
+                        if verify or not self._pool.retry_stale(pooled, exc):
+                            raise
+                        verify = True
+                        continue
+                    interrupt = None if row_limit is not None else conn.cancel
+                    yield from iter_cursor_batches(cur, batch_size, interrupt, _TYPE_KINDS)
+                    return
+                finally:
+                    cur.close()
+
+    def copy_csv(
+        self, query: str, params: Sequence[Any] | None, out: BinaryIO
+    ) -> tuple[list[list[str]], int]:
+        with self._pool.connection() as pooled:
+            conn = pooled.raw
+            with conn.cursor() as cur, cancellable(conn.cancel):
+                self._apply_deadline(conn)
+                # COPY takes no parameters; psycopg2 quotes them into the text.
+                text = cur.mogrify(query.strip().rstrip(";"), params or None).decode()
+                # Planning the query without running it reports its columns.
+                cur.execute(f"SELECT * FROM ({text}) AS mcp_export LIMIT 0")
+                columns = [(c[0], c[1]) for c in cur.description]
+                cur.execute(
+                    "SELECT oid, format_type(oid, NULL) FROM pg_type WHERE oid = ANY(%s)",
+                    (list({oid for _, oid in columns}),),
+                )
+                type_names = dict(cur.fetchall())
+                cur.copy_expert(f"COPY ({text}) TO STDOUT WITH (FORMAT csv, HEADER true)", out)
+                schema = [[name, type_names.get(oid, "unknown")] for name, oid in columns]
+                return schema, cur.rowcount
 
     def list_tables(self) -> list[str]:
         rows = self.execute(
@@ -59,5 +296,49 @@ class PostgresClient(DBClient):
             (table,),
         )
 
+    def describe_schema(self, include_keys: bool = False) -> dict[str, dict[str, Any]]:
+        columns = self.execute(
+            "\n".join(
+                [
+                    "SELECT table_name, column_name, data_type",
+                    "FROM information_schema.columns",
+                    "WHERE table_schema = 'public'",
+                    "ORDER BY table_name, ordinal_position",
+                ]
+            )
+        )
+        if not include_keys:
+            return group_schema(columns)
+        keys = self.execute(
+            "\n".join(
+                [
+                    "SELECT t.relname AS table_name, i.relname AS index_name,",
+                    "       ix.indisunique AS is_unique, ix.indisprimary AS is_primary,",
+                    "       a.attname AS column_name",
+                    "FROM pg_index AS ix",
+                    "JOIN pg_class AS t ON t.oid = ix.indrelid",
+                    "JOIN pg_class AS i ON i.oid = ix.indexrelid",
+                    "JOIN pg_namespace AS n ON n.oid = t.relnamespace",
+                    "CROSS JOIN LATERAL unnest(ix.indkey) WITH ORDINALITY AS k(attnum, position)",
+                    "JOIN pg_attribute AS a ON a.attrelid = t.oid AND a.attnum = k.attnum",
+                    "WHERE n.nspname = 'public'",
+                    "ORDER BY t.relname, ix.indisprimary DESC, i.relname, k.position",
+                ]
+            )
+        )
+        return group_schema(columns, keys)
+
+    def ping(self) -> None:
+        with self._pool.connection() as pooled:
+            self._ping(pooled.raw)
+
+    def pool_stats(self) -> dict[str, int]:
+        return self._pool.stats()
+
+    def statement_stats(self) -> dict[str, float] | None:
+        if self._config.prepared_cache_size <= 0:
+            return None
+        return self._statement_stats.snapshot()
+
     def close(self) -> None:
-        self._conn.close()
+        self._pool.close()
@@ -1,52 +1,221 @@
 from __future__ import annotations
 
+import logging
+import re
 import sqlite3
+import threading
 import time
-from typing import Any, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Sequence
 
 from sql_mcp_server.config import ServerConfig
-from sql_mcp_server.db.base import DBClient
+from sql_mcp_server.db.base import (
+    DEFAULT_FETCH_BATCH_SIZE,
+    DBClient,
+    RowBatch,
+    group_schema,
+)
+from sql_mcp_server.db.cancel import cancellable, time_left
+from sql_mcp_server.db.pool import ConnectionPool
+
+LOGGER = logging.getLogger("sql_mcp_server.sqlite")
+
+_TEMP_STORES = {"default", "file", "memory"}
+# Statements reader connections may serve; everything else uses the
+# read-write connection.
+_READ_RE = re.compile(r"\s*SELECT\b", re.IGNORECASE)
+
+
+class _Connection(sqlite3.Connection):
+    """Connection carrying the deadline polled by its progress handler."""
+
+    deadline: float | None = None
+
+    def progress_handler(self) -> int:
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return 1
+        return 0
 
 
 class SQLiteClient(DBClient):
     def __init__(self, config: ServerConfig) -> None:
         self._config = config
-        self._conn = sqlite3.connect(config.sqlite_path, timeout=config.query_timeout)
-        self._conn.row_factory = sqlite3.Row
         self._statement_timeout_seconds = config.statement_timeout_seconds
-        self._current_query_deadline: float | None = None
+        self._file_backed = not _is_memory_path(config.sqlite_path)
+        read_mode = self._file_backed and config.sqlite_readers > 0
+        # The connection is shared by the instance's worker threads; access
+        # is serialized through ``self._lock``. In read mode on a read-only
+        # instance it is opened read-only as well.
+        self._conn = self._open(read_only=read_mode and config.read_only)
+        self._lock = threading.Lock()
+        self.journal_mode = self._configure_journal()
+        self._readers: ConnectionPool | None = None
+        if read_mode:
+            if self.journal_mode != "wal" and not config.read_only:
+                LOGGER.warning(
+                    "SQLite reader connections without WAL block writers while they read; "
+                    "set SQLITE_WAL=true",
+                    extra={"instance_id": config.instance_id},
+                )
+            # Each reader is used by one worker thread at a time, so SELECTs
+            # run in parallel instead of queueing on ``self._lock``.
+            self._readers = ConnectionPool(
+                lambda: self._open(read_only=True),
+                min_size=1,
+                max_size=config.sqlite_readers,
+                checkout_timeout=config.pool_timeout,
+                idle_timeout=config.pool_idle_timeout,
+                reset=lambda conn: conn.rollback(),
+                name=f"{config.instance_id}-readers",
+            )
+
+    def _open(self, *, read_only: bool) -> _Connection:
+        config = self._config
+        target: str = config.sqlite_path
+        if read_only:
+            target = Path(config.sqlite_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(
+            target,
+            timeout=config.query_timeout,
+            check_same_thread=False,
+            # sqlite3's own per-connection statement LRU; it exposes no hit
+            # counts, so no statement_stats are reported for SQLite.
+            cached_statements=max(config.prepared_cache_size, 0),
+            uri=read_only,
+            factory=_Connection,
+        )
+        try:
+            conn.row_factory = sqlite3.Row
+            if self._statement_timeout_seconds:
+                # Abort long-running queries by polling SQLite's progress handler.
+                conn.set_progress_handler(conn.progress_handler, 1000)
+            if config.sqlite_mmap_size:
+                conn.execute(f"PRAGMA mmap_size = {int(config.sqlite_mmap_size)}")
+            if config.sqlite_cache_size:
+                conn.execute(f"PRAGMA cache_size = {int(config.sqlite_cache_size)}")
+            if config.sqlite_temp_store in _TEMP_STORES:
+                conn.execute(f"PRAGMA temp_store = {config.sqlite_temp_store.upper()}")
+            if read_only:
+                conn.execute("PRAGMA query_only = 1")
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def _configure_journal(self) -> str:
+        if self._config.sqlite_wal and self._file_backed and not self._config.read_only:
+            # WAL lets readers and the writer proceed concurrently; the mode
+            # is persistent, so this only changes the file once.
+            row = self._conn.execute("PRAGMA journal_mode = WAL").fetchone()
+        else:
+            row = self._conn.execute("PRAGMA journal_mode").fetchone()
+        return str(row[0]).lower()
+
+    @contextmanager
+    def _statement_deadline(self, conn: _Connection) -> Iterator[None]:
+        now = time.monotonic()
         if self._statement_timeout_seconds:
-            # Abort long-running queries by polling SQLite's progress handler.
-            self._conn.set_progress_handler(self._progress_handler, 1000)
+            conn.deadline = now + self._statement_timeout_seconds
+            # A shorter per-call budget tightens the deadline polled by the
+            # progress handler. Without a statement timeout there is no
+            # handler and the call's own timer interrupts the statement.
+            left = time_left()
+            if left is not None:
+                conn.deadline = min(conn.deadline, now + left)
+        try:
+            with cancellable(conn.interrupt):
+                yield
+        finally:
+            conn.deadline = None
 
-    def _progress_handler(self) -> int:
-        if self._current_query_deadline is None:
-            return 0
-        if time.monotonic() >= self._current_query_deadline:
-            return 1
-        return 0
+    @staticmethod
+    def _run(conn: _Connection, query: str, params: Sequence[Any] | None) -> sqlite3.Cursor:
+        cur = conn.cursor()
+        if params:
+            cur.execute(query, params)
+        else:
+            cur.execute(query)
+        return cur
+
+    def _uses_readers(self, query: str) -> bool:
+        return self._readers is not None and _READ_RE.match(query) is not None
 
     def execute(
         self, query: str, params: Sequence[Any] | None = None
     ) -> list[dict[str, Any]]:
-        cur = self._conn.cursor()
-        try:
-            if self._statement_timeout_seconds:
-                self._current_query_deadline = (
-                    time.monotonic() + self._statement_timeout_seconds
-                )
-            if params:
-                cur.execute(query, params)
-            else:
-                cur.execute(query)
+        if self._uses_readers(query):
+            with self._readers.connection() as pooled:
+                conn = pooled.raw
+                with self._statement_deadline(conn):
+                    cur = self._run(conn, query, params)
+                    try:
+                        return [dict(r) for r in cur.fetchall()]
+                    finally:
+                        cur.close()
+
+        with self._lock, self._statement_deadline(self._conn):
+            cur = self._run(self._conn, query, params)
             if cur.description is None:
                 self._conn.commit()
                 return []
             rows = cur.fetchall()
             return [dict(r) for r in rows]
+
+    def iter_batches(
+        self,
+        query: str,
+        params: Sequence[Any] | None = None,
+        *,
+        batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+        row_limit: int | None = None,
+    ) -> Iterator[RowBatch]:
+        if self._uses_readers(query):
+            yield from self._iter_reader_batches(query, params, batch_size)
+            return
+
+        with self._lock, self._statement_deadline(self._conn):
+            cur = self._run(self._conn, query, params)
+            if cur.description is None:
+                self._conn.commit()
+                return
+        columns = tuple(c[0] for c in cur.description)
+        try:
+            first = True
+            while True:
+                # The lock is only held per batch so other calls can use the
+                # shared connection while a stream is being consumed.
+                with self._lock, self._statement_deadline(self._conn):
+                    rows = cur.fetchmany(batch_size)
+                if rows or first:
+                    yield RowBatch(columns=columns, rows=rows)
+                if not rows:
+                    return
+                first = False
         finally:
-            if self._statement_timeout_seconds:
-                self._current_query_deadline = None
+            with self._lock:
+                cur.close()
+
+    def _iter_reader_batches(
+        self, query: str, params: Sequence[Any] | None, batch_size: int
+    ) -> Iterator[RowBatch]:
+        with self._readers.connection() as pooled:
+            conn = pooled.raw
+            with self._statement_deadline(conn):
+                cur = self._run(conn, query, params)
+            try:
+                columns = tuple(c[0] for c in cur.description)
+                first = True
+                while True:
+                    with self._statement_deadline(conn):
+                        rows = cur.fetchmany(batch_size)
+                    if rows or first:
+                        yield RowBatch(columns=columns, rows=rows)
+                    if not rows:
+                        return
+                    first = False
+            finally:
+                cur.close()
 
     def list_tables(self) -> list[str]:
         rows = self.execute("SELECT name FROM sqlite_master WHERE type='table'")
@@ -56,5 +225,58 @@ class SQLiteClient(DBClient):
         safe = table.replace('"', '""')
         return self.execute(f'PRAGMA table_info("{safe}")')
 
+    def describe_schema(self, include_keys: bool = False) -> dict[str, dict[str, Any]]:
+        columns = self.execute(
+            "\n".join(
+                [
+                    "SELECT m.name AS table_name, p.name AS column_name, p.type AS data_type",
+                    "FROM sqlite_master AS m",
+                    "JOIN pragma_table_info(m.name) AS p",
+                    "WHERE m.type = 'table'",
+                    "ORDER BY m.name, p.cid",
+                ]
+            )
+        )
+        if not include_keys:
+            return group_schema(columns)
+        keys = self.execute(
+            "\n".join(
+                [
+                    "SELECT m.name AS table_name, 'PRIMARY' AS index_name, 1 AS is_unique,",
+                    "       1 AS is_primary, p.name AS column_name, p.pk AS position",
+                    "FROM sqlite_master AS m",
+                    "JOIN pragma_table_info(m.name) AS p",
+                    "WHERE m.type = 'table' AND p.pk > 0",
+                    "UNION ALL",
+                    "SELECT m.name, il.name, il.\"unique\", 0, ii.name, ii.seqno",
+                    "FROM sqlite_master AS m",
+                    "JOIN pragma_index_list(m.name) AS il",
+                    "JOIN pragma_index_info(il.name) AS ii",
+                    "WHERE m.type = 'table' AND il.origin <> 'pk'",
+                    "ORDER BY table_name, is_primary DESC, index_name, position",
+                ]
+            )
+        )
+        return group_schema(columns, keys)
+
+    def ping(self) -> None:
+        with self._lock:
+            self._conn.execute("SELECT 1").fetchone()
+        if self._readers is not None:
+            with self._readers.connection() as pooled:
+                pooled.raw.execute("SELECT 1").fetchone()
+
+    def pool_stats(self) -> dict[str, int] | None:
+        if self._readers is None:
+            return None
+        return self._readers.stats()
+
     def close(self) -> None:
-        self._conn.close()
+        if self._readers is not None:
+            self._readers.close()
+        with self._lock:
+            self._conn.close()
+
+
+def _is_memory_path(path: str) -> bool:
+    return path in ("", ":memory:") or path.startswith("file::memory:") or "mode=memory" in path
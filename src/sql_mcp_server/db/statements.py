@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+from sql_mcp_server.metrics import get_metrics
+
+LOGGER = logging.getLogger("sql_mcp_server.statements")
+
+H = TypeVar("H")
+
+
+class StatementStats:
+    """Prepared statement cache counters shared by every connection of an instance."""
+
+    def __init__(self, instance_id: str) -> None:
+        self._instance_id = instance_id
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._metrics = get_metrics()
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+            ratio = self._hits / (self._hits + self._misses)
+        self._metrics.increment(
+            "prepared_statement_hits_total" if hit else "prepared_statement_misses_total",
+            instance_id=self._instance_id,
+        )
+        self._metrics.set_gauge(
+            "prepared_statement_hit_ratio", round(ratio, 4), instance_id=self._instance_id
+        )
+
+    def record_eviction(self) -> None:
+        with self._lock:
+            self._evictions += 1
+        self._metrics.increment(
+            "prepared_statement_evictions_total", instance_id=self._instance_id
+        )
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+
+class StatementCache(Generic[H]):
+    """LRU of prepared statement handles for one connection.
+
+    Keys are the SQL text, plus anything else that changes how the driver
+    prepares it.
+
+    A connection is only used by one thread at a time, so the cache itself is
+    not locked. ``release`` is called with the handle of every evicted
+    statement (e.g. to ``DEALLOCATE`` it or close its cursor); failures there
+    are logged and ignored.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        stats: StatementStats,
+        release: Callable[[H], None] | None = None,
+    ) -> None:
+        self._capacity = capacity
+        self._stats = stats
+        self._release = release
+        self._entries: OrderedDict[Hashable, H] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> H | None:
+        handle = self._entries.get(key)
+        if handle is not None:
+            self._entries.move_to_end(key)
+        self._stats.record(handle is not None)
+        return handle
+
+    def put(self, key: Hashable, handle: H) -> None:
+        self._entries[key] = handle
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._capacity:
+            _, evicted = self._entries.popitem(last=False)
+            self._stats.record_eviction()
+            self._release_handle(evicted)
+
+    def discard(self, key: Hashable, *, release: bool = True) -> None:
+        """Drop ``key``; ``release=False`` when its handle is already gone."""
+        handle = self._entries.pop(key, None)
+        if handle is not None and release:
+            self._release_handle(handle)
+
+    def _release_handle(self, handle: Any) -> None:
+        if self._release is None:
+            return
+        try:
+            self._release(handle)
+        except Exception:
+            LOGGER.debug("Error while releasing prepared statement", exc_info=True)
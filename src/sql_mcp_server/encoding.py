@@ -0,0 +1,165 @@
+"""JSON-ready result values.
+
+Drivers hand back ``Decimal``, ``datetime``, ``UUID``, ``bytes`` and friends,
+which generic serializers handle inconsistently or not at all. Rows are
+converted once, as they are fetched, so every provider produces the same
+JSON-native values:
+
+- ``Decimal`` and ``UUID`` become strings (no precision is lost),
+- ``datetime``, ``date`` and ``time`` become ISO 8601 strings,
+- ``timedelta`` (e.g. MySQL ``TIME``) becomes ``"H:MM:SS"``,
+- ``bytes``, ``bytearray`` and ``memoryview`` become base64 strings,
+- non-finite floats become ``"nan"``, ``"inf"`` or ``"-inf"``.
+
+Providers map ``cursor.description`` type codes to the kinds below, so the
+converter of each column is chosen once per result and columns that need no
+conversion are not touched. Columns of unknown type (e.g. SQLite, which has
+none) fall back to a per-value type lookup.
+"""
+from __future__ import annotations
+
+import base64
+import datetime as dt
+import decimal
+import json
+import math
+import uuid
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+try:  # pragma: no cover - exercised when the optional extra is installed
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+PLAIN = "plain"
+DECIMAL = "decimal"
+DATETIME = "datetime"
+DATE = "date"
+TIME = "time"
+TIMEDELTA = "timedelta"
+UUID = "uuid"
+BINARY = "binary"
+FLOAT = "float"
+
+_NATIVE = (str, int, bool, type(None))
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat()
+
+
+def _binary(value: Any) -> str:
+    if isinstance(value, str):
+        # Already encoded, e.g. cut by the result budget.
+        return value
+    return base64.b64encode(value).decode("ascii")
+
+
+def _float(value: float) -> float | str:
+    return value if math.isfinite(value) else str(value)
+
+
+_KIND_CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    DECIMAL: str,
+    DATETIME: _isoformat,
+    DATE: _isoformat,
+    TIME: _isoformat,
+    TIMEDELTA: str,
+    UUID: str,
+    BINARY: _binary,
+    FLOAT: _float,
+}
+
+_TYPE_CONVERTERS: dict[type, Callable[[Any], Any]] = {
+    decimal.Decimal: str,
+    dt.datetime: _isoformat,
+    dt.date: _isoformat,
+    dt.time: _isoformat,
+    dt.timedelta: str,
+    uuid.UUID: str,
+    bytes: _binary,
+    bytearray: _binary,
+    memoryview: _binary,
+    float: _float,
+}
+
+
+def convert_value(value: Any) -> Any:
+    """Convert a value of any type; used for columns of unknown type."""
+
+    if type(value) in _NATIVE:
+        return value
+    converter = _TYPE_CONVERTERS.get(type(value))
+    if converter is not None:
+        return converter(value)
+    if isinstance(value, (list, tuple)):
+        # Array columns (PostgreSQL) may hold any of the above.
+        return [convert_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): convert_value(item) for key, item in value.items()}
+    if isinstance(value, (str, int)):
+        return value
+    for base, converter in _TYPE_CONVERTERS.items():
+        # Subclasses, e.g. pendulum datetimes.
+        if isinstance(value, base):
+            return converter(value)
+    return str(value)
+
+
+def column_kinds(
+    description: Sequence[Sequence[Any]] | None, type_kinds: Mapping[Any, str]
+) -> tuple[str | None, ...] | None:
+    """Kinds of the columns of ``cursor.description``; ``None`` = unknown type."""
+
+    if description is None:
+        return None
+    return tuple(type_kinds.get(column[1]) for column in description)
+
+
+class RowEncoder:
+    """Converts the rows of one result to JSON-native values."""
+
+    __slots__ = ("_converters",)
+
+    def __init__(self, width: int, kinds: Sequence[str | None] | None = None) -> None:
+        if kinds is None:
+            kinds = (None,) * width
+        self._converters = [
+            (index, _KIND_CONVERTERS.get(kind, convert_value))
+            for index, kind in enumerate(kinds)
+            if kind != PLAIN
+        ]
+
+    @property
+    def passthrough(self) -> bool:
+        return not self._converters
+
+    def convert(self, rows: Sequence[Sequence[Any]]) -> Sequence[Sequence[Any]]:
+        converters = self._converters
+        if not converters:
+            return rows
+        converted = []
+        for row in rows:
+            values = list(row)
+            for index, convert in converters:
+                value = values[index]
+                if value is not None:
+                    values[index] = convert(value)
+            converted.append(tuple(values))
+        return converted
+
+
+def encode_records(records: Iterable[Mapping[str, Any]]) -> list[dict[str, Any]]:
+    """Convert dict rows, e.g. the result of ``DBClient.execute``."""
+
+    return [{key: convert_value(value) for key, value in record.items()} for record in records]
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize to compact JSON, with orjson when it is installed."""
+
+    if orjson is not None:
+        return orjson.dumps(value, default=convert_value)
+    return json.dumps(
+        value, default=convert_value, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
@@ -5,14 +5,29 @@ from typing import Any, Optional
 
 
 @dataclass(frozen=True)
-class MCPError(Exception):
+class _ErrorFields(Exception):
     message: str
     hint: Optional[str] = None
     error_type: str = "MCPError"
+    # Seconds after which retrying may succeed, for throttling errors.
+    retry_after: Optional[float] = None
+
+
+class MCPError(_ErrorFields):
+    """Error reported to the MCP client as ``to_dict()``.
+
+    The fields are frozen. Declaring them on a base class leaves the
+    exception state the interpreter and ``contextlib`` assign on raise
+    (``__traceback__``, ``__context__``) writable: frozen dataclasses only
+    refuse other attributes on instances of the dataclass itself.
+    """
 
     def to_dict(self) -> dict[str, Any]:
-        return {
+        payload: dict[str, Any] = {
             "error_type": self.error_type,
             "message": self.message,
             "hint": self.hint,
         }
+        if self.retry_after is not None:
+            payload["retry_after"] = self.retry_after
+        return payload
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from sql_mcp_server.db.cancel import CancelScope
+
+T = TypeVar("T")
+
+
+class InstanceExecutor:
+    """Worker threads dedicated to one database instance.
+
+    Blocking driver calls are offloaded here so they never run on the
+    FastMCP event loop. Each instance owns its own workers, which caps its
+    concurrency at ``max_workers`` and keeps a slow instance from consuming
+    the threads another instance needs.
+
+    Every call runs in a ``CancelScope``: when the awaiting task is
+    cancelled (the MCP client gave up, or a timeout fired) the statement the
+    call is running is cancelled on the database too, and a call still
+    queued never starts.
+    """
+
+    def __init__(self, instance_id: str, max_workers: int) -> None:
+        self.instance_id = instance_id
+        self.max_workers = max(max_workers, 1)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"sql-mcp-{instance_id}",
+        )
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        return self._pool.submit(fn, *args, **kwargs)
+
+    def submit_cancellable(
+        self, fn: Callable[..., T], /, *args: Any, **kwargs: Any
+    ) -> tuple[Future[T], CancelScope]:
+        scope = CancelScope(self.instance_id)
+        return self._pool.submit(scope.run, fn, *args, **kwargs), scope
+
+    async def run(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        scope = CancelScope(self.instance_id)
+        try:
+            return await loop.run_in_executor(
+                self._pool, functools.partial(scope.run, fn, *args, **kwargs)
+            )
+        except asyncio.CancelledError:
+            scope.cancel("abandoned")
+            raise
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,311 @@
+"""Writing query results to files under an instance's export directory.
+
+Results are written batch by batch, so an export holds one fetch batch in
+memory however many rows it has. CSV needs nothing beyond the standard
+library; Arrow IPC and Parquet need the optional ``pyarrow`` package.
+
+Files are written to a hidden ``.partial`` file next to the target, created
+with ``0600`` permissions, and renamed into place once complete; a failed
+export leaves nothing behind.
+"""
+from __future__ import annotations
+
+import csv
+import datetime as dt
+import decimal
+import io
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Sequence
+
+from sql_mcp_server.db.base import RowBatch
+from sql_mcp_server.encoding import RowEncoder, convert_value, dumps
+from sql_mcp_server.errors import MCPError
+
+EXPORT_FORMATS = ("csv", "arrow", "parquet")
+_EXTENSIONS = {"csv": ".csv", "arrow": ".arrow", "parquet": ".parquet"}
+_FILE_NAME_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+# Column types reported for CSV exports, by the type of the first value.
+_VALUE_TYPES: dict[type, str] = {
+    bool: "boolean",
+    int: "integer",
+    float: "float",
+    str: "text",
+    decimal.Decimal: "decimal",
+    dt.datetime: "timestamp",
+    dt.date: "date",
+    dt.time: "time",
+    dt.timedelta: "interval",
+    uuid.UUID: "uuid",
+    bytes: "binary",
+    bytearray: "binary",
+    memoryview: "binary",
+    dict: "json",
+    list: "array",
+}
+
+
+def check_export_format(export_format: str) -> None:
+    if export_format not in EXPORT_FORMATS:
+        raise MCPError(
+            f"Unsupported export format: {export_format}",
+            hint=f"Use one of: {', '.join(EXPORT_FORMATS)}",
+            error_type="InvalidFormat",
+        )
+
+
+def export_path(
+    export_dir: str | None, file_name: str | None, export_format: str, instance_id: str
+) -> Path:
+    """Resolve the file an export writes, always directly inside ``export_dir``."""
+
+    if not export_dir:
+        raise MCPError(
+            "Exports are disabled for this instance",
+            hint="Set DB_EXPORT_DIR to the directory export files may be written to",
+            error_type="ExportDisabled",
+        )
+    extension = _EXTENSIONS[export_format]
+    if file_name is None:
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        file_name = f"{instance_id}-{stamp}-{uuid.uuid4().hex[:8]}{extension}"
+    elif not _FILE_NAME_RE.fullmatch(file_name) or ".." in file_name:
+        raise MCPError(
+            f"Invalid export file name: {file_name}",
+            hint="Use a plain file name (letters, digits, '.', '_' and '-'), without directories",
+            error_type="InvalidExportPath",
+        )
+    elif not file_name.lower().endswith(extension):
+        file_name += extension
+    directory = Path(export_dir).expanduser()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / file_name
+    if path.exists():
+        raise MCPError(
+            f"Export file already exists: {file_name}",
+            hint="Choose another file_name; exports never overwrite files",
+            error_type="ExportExists",
+        )
+    return path
+
+
+class ExportFile(io.RawIOBase):
+    """Binary sink of one export, counting what is written.
+
+    Writes past ``max_bytes`` (``0`` = unlimited) fail with
+    ``ExportTooLarge``. :meth:`publish` renames the finished file to its
+    target; :meth:`discard` removes it.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 0) -> None:
+        super().__init__()
+        self.path = path
+        self.size = 0
+        self._max_bytes = max(max_bytes, 0)
+        self._partial = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.partial")
+        fd = os.open(self._partial, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        self._file = os.fdopen(fd, "wb")
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        size = len(memoryview(data).cast("B"))
+        if self._max_bytes and self.size + size > self._max_bytes:
+            raise MCPError(
+                f"Export exceeds DB_EXPORT_MAX_BYTES ({self._max_bytes} bytes)",
+                hint="Select fewer rows or columns, or raise DB_EXPORT_MAX_BYTES",
+                error_type="ExportTooLarge",
+            )
+        self._file.write(data)
+        self.size += size
+        return size
+
+    def tell(self) -> int:
+        return self.size
+
+    def flush(self) -> None:
+        if not self._file.closed:
+            self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        super().close()
+
+    def publish(self) -> None:
+        self.close()
+        if self.path.exists():
+            self.discard()
+            raise MCPError(
+                f"Export file already exists: {self.path.name}",
+                hint="Choose another file_name; exports never overwrite files",
+                error_type="ExportExists",
+            )
+        os.replace(self._partial, self.path)
+
+    def discard(self) -> None:
+        self.close()
+        try:
+            os.unlink(self._partial)
+        except FileNotFoundError:
+            pass
+
+
+def _text(value: Any) -> str:
+    converted = convert_value(value)
+    if isinstance(converted, str):
+        return converted
+    return dumps(converted).decode("utf-8")
+
+
+def _first_values(batch: RowBatch) -> list[Any]:
+    first: list[Any] = [None] * len(batch.columns)
+    missing = set(range(len(first)))
+    for row in batch.rows:
+        for index in list(missing):
+            if row[index] is not None:
+                first[index] = row[index]
+                missing.discard(index)
+        if not missing:
+            break
+    return first
+
+
+class CsvWriter:
+    """CSV with a header row; values are encoded as in JSON responses."""
+
+    # Providers may write the whole file themselves (``DBClient.copy_csv``).
+    bulk_csv = True
+
+    def __init__(self) -> None:
+        self._encoder: RowEncoder | None = None
+        self.schema: list[list[str]] = []
+        self.row_count = 0
+
+    def write(self, sink: ExportFile, batch: RowBatch) -> None:
+        buffer = io.StringIO(newline="")
+        writer = csv.writer(buffer)
+        if self._encoder is None:
+            self._encoder = RowEncoder(len(batch.columns), batch.kinds)
+            self.schema = [
+                [name, _VALUE_TYPES.get(type(value), "text") if value is not None else "unknown"]
+                for name, value in zip(batch.columns, _first_values(batch))
+            ]
+            writer.writerow(batch.columns)
+        for row in self._encoder.convert(batch.rows):
+            # JSON and array columns are written as JSON text.
+            writer.writerow(
+                [_text(value) if isinstance(value, (dict, list)) else value for value in row]
+            )
+        sink.write(buffer.getvalue().encode("utf-8"))
+        self.row_count += len(batch.rows)
+
+    def close(self) -> None:
+        pass
+
+
+def _load_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError:
+        raise MCPError(
+            "Arrow and Parquet exports need the pyarrow package",
+            hint="Install it (pip install -e .[export]) or export as csv",
+            error_type="ExportUnavailable",
+        ) from None
+    return pyarrow
+
+
+class ArrowWriter:
+    """Arrow IPC file or Parquet file, one record batch per fetched batch.
+
+    Column types come from the first non-null value of each column in the
+    first batch. Decimals, UUIDs and values of other types, and columns
+    that are empty in the first batch, are written as strings.
+    """
+
+    bulk_csv = False
+
+    def __init__(self, export_format: str) -> None:
+        self._pa = _load_pyarrow()
+        if export_format == "parquet":
+            import pyarrow.parquet  # noqa: F401 - loads the submodule
+        self._format = export_format
+        self._writer: Any = None
+        self._schema: Any = None
+        self._converters: list[Any] = []
+        self.schema: list[list[str]] = []
+        self.row_count = 0
+
+    def _column_type(self, value: Any) -> tuple[Any, Any]:
+        pa = self._pa
+        kind = type(value)
+        if kind is bool:
+            return pa.bool_(), None
+        if kind is int:
+            return pa.int64(), None
+        if kind is float:
+            return pa.float64(), None
+        if kind is str:
+            return pa.string(), None
+        if kind is dt.datetime:
+            return pa.timestamp("us", tz="UTC" if value.tzinfo else None), None
+        if kind is dt.date:
+            return pa.date32(), None
+        if kind is dt.time:
+            return pa.time64("us"), None
+        if kind is dt.timedelta:
+            return pa.duration("us"), None
+        if kind in (bytes, bytearray, memoryview):
+            return pa.binary(), bytes
+        return pa.string(), _text
+
+    def _start(self, sink: ExportFile, batch: RowBatch) -> None:
+        pa = self._pa
+        fields = []
+        for name, value in zip(batch.columns, _first_values(batch)):
+            arrow_type, converter = self._column_type(value)
+            fields.append(pa.field(name, arrow_type))
+            self._converters.append(converter)
+        self._schema = pa.schema(fields)
+        self.schema = [[field.name, str(field.type)] for field in self._schema]
+        if self._format == "parquet":
+            self._writer = pa.parquet.ParquetWriter(sink, self._schema)
+        else:
+            self._writer = pa.ipc.new_file(sink, self._schema)
+
+    def write(self, sink: ExportFile, batch: RowBatch) -> None:
+        if self._writer is None:
+            self._start(sink, batch)
+        pa = self._pa
+        arrays = []
+        for index, field in enumerate(self._schema):
+            convert = self._converters[index]
+            values: Sequence[Any] = [row[index] for row in batch.rows]
+            if convert is not None:
+                values = [None if value is None else convert(value) for value in values]
+            try:
+                arrays.append(pa.array(values, type=field.type))
+            except (ValueError, TypeError, OverflowError) as exc:
+                raise MCPError(
+                    f"Column {field.name} does not fit its export type {field.type}: {exc}",
+                    hint="CAST the column to one type in the query",
+                    error_type="ExportFailed",
+                ) from None
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self._schema))
+        self.row_count += len(batch.rows)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_writer(export_format: str) -> CsvWriter | ArrowWriter:
+    if export_format == "csv":
+        return CsvWriter()
+    return ArrowWriter(export_format)
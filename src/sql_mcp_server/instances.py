@@ -1,12 +1,26 @@
 from __future__ import annotations
 
+import logging
+import threading
+import time
 from dataclasses import dataclass
+from typing import Any, Callable, Iterable, TypeVar
 
+from sql_mcp_server.cache import ResultCache
+from sql_mcp_server.catalog import SchemaCatalog
 from sql_mcp_server.config import ServerConfig, load_instance_configs
 from sql_mcp_server.db.base import DBClient
 from sql_mcp_server.db.factory import create_db_client
 from sql_mcp_server.errors import MCPError
+from sql_mcp_server.executor import InstanceExecutor
+from sql_mcp_server.metrics import get_metrics
 from sql_mcp_server.middleware.sql_validator import SQLValidator
+from sql_mcp_server.pagination import Paginator
+from sql_mcp_server.scheduler import FairScheduler
+
+LOGGER = logging.getLogger("sql_mcp_server.instances")
+
+T = TypeVar("T")
 
 
 @dataclass(slots=True)
@@ -14,8 +28,14 @@ class InstanceContext:
     config: ServerConfig
     db: DBClient
     validator: SQLValidator
+    paginator: Paginator
+    result_cache: ResultCache
+    catalog: SchemaCatalog
+    scheduler: FairScheduler | None = None
 
     def close(self) -> None:
+        self.result_cache.clear()
+        self.paginator.close()
         self.db.close()
 
 
@@ -23,6 +43,10 @@ class InstanceRegistry:
     def __init__(self) -> None:
         self._configs = load_instance_configs()
         self._instances: dict[str, InstanceContext] = {}
+        self._executors: dict[str, InstanceExecutor] = {}
+        self._lock = threading.Lock()
+        self._init_locks: dict[str, threading.Lock] = {}
+        self._connect_seconds: dict[str, float] = {}
 
     def instance_ids(self) -> list[str]:
         return sorted(self._configs.keys())
@@ -30,7 +54,7 @@ class InstanceRegistry:
     def describe_configs(self) -> list[ServerConfig]:
         return [self._configs[instance_id] for instance_id in self.instance_ids()]
 
-    def get(self, instance_id: str | None = None) -> InstanceContext:
+    def _config_for(self, instance_id: str | None) -> tuple[str, ServerConfig]:
         key = (instance_id or "default").lower()
         config = self._configs.get(key)
         if config is None:
@@ -42,16 +66,130 @@ class InstanceRegistry:
                 ),
                 error_type="UnknownInstance",
             )
+        return key, config
+
+    def config(self, instance_id: str | None = None) -> ServerConfig:
+        return self._config_for(instance_id)[1]
 
-        if key not in self._instances:
-            self._instances[key] = InstanceContext(
-                config=config,
-                db=create_db_client(config),
-                validator=SQLValidator(config),
+    def get(self, instance_id: str | None = None) -> InstanceContext:
+        key, config = self._config_for(instance_id)
+        instance = self._instances.get(key)
+        if instance is not None:
+            return instance
+
+        # Tool calls arrive from worker threads; make sure concurrent first
+        # calls do not open two clients for the same instance, without making
+        # one slow instance delay the creation of the others.
+        with self._lock:
+            init_lock = self._init_locks.setdefault(key, threading.Lock())
+        with init_lock:
+            if key not in self._instances:
+                started = time.perf_counter()
+                db = create_db_client(config)
+                self._record_connect(key, time.perf_counter() - started)
+                catalog = SchemaCatalog(db, key, config.catalog_ttl)
+                self._instances[key] = InstanceContext(
+                    config=config,
+                    db=db,
+                    validator=SQLValidator(config),
+                    paginator=Paginator(db, config, catalog),
+                    result_cache=ResultCache(
+                        key, config.result_cache_ttl, config.result_cache_max_bytes
+                    ),
+                    catalog=catalog,
+                    scheduler=_create_scheduler(key, config),
+                )
+            return self._instances[key]
+
+    def _record_connect(self, key: str, seconds: float) -> None:
+        self._connect_seconds[key] = seconds
+        get_metrics().set_gauge("instance_connect_seconds", round(seconds, 4), instance_id=key)
+        LOGGER.info(
+            "Connected database instance",
+            extra={"instance_id": key, "connect_ms": round(seconds * 1000, 2)},
+        )
+
+    def is_connected(self, instance_id: str | None = None) -> bool:
+        key, _ = self._config_for(instance_id)
+        return key in self._instances
+
+    def connect_seconds(self, instance_id: str | None = None) -> float | None:
+        """How long creating the instance's client took, if it was created."""
+        key, _ = self._config_for(instance_id)
+        return self._connect_seconds.get(key)
+
+    def warm_up(self, instance_ids: Iterable[str] | None = None) -> dict[str, Exception]:
+        """Connect instances concurrently and ping them once.
+
+        Defaults to the instances configured with ``DB_WARMUP=true``. Each
+        instance is warmed on its own worker threads, so the slowest one
+        bounds the total. Failures are logged and returned by instance; the
+        instance is retried lazily on its next call.
+        """
+
+        if instance_ids is None:
+            targets = [key for key in self.instance_ids() if self._configs[key].warmup]
+        else:
+            targets = [self._config_for(instance_id)[0] for instance_id in instance_ids]
+        futures = {
+            key: self.executor(key).submit(lambda key=key: self.get(key).db.ping())
+            for key in targets
+        }
+        failures: dict[str, Exception] = {}
+        for key, future in futures.items():
+            try:
+                future.result()
+            except Exception as exc:
+                failures[key] = exc
+                LOGGER.warning(
+                    "Warm-up failed",
+                    extra={"instance_id": key, "error_message": str(exc)},
+                )
+        return failures
+
+    def executor(self, instance_id: str | None = None) -> InstanceExecutor:
+        key, config = self._config_for(instance_id)
+        with self._lock:
+            executor = self._executors.get(key)
+            if executor is None:
+                executor = InstanceExecutor(key, config.max_concurrency)
+                self._executors[key] = executor
+            return executor
+
+    async def run(
+        self, instance_id: str | None, fn: Callable[..., T], /, *args: Any, **kwargs: Any
+    ) -> T:
+        """Run a blocking tool body on the worker threads of ``instance_id``.
+
+        An unknown instance is rejected with ``UnknownInstance`` before
+        anything is dispatched; ``fn`` never runs on the caller's loop.
+        """
+
+        return await self.executor(instance_id).run(fn, *args, **kwargs)
+
+    async def run_tool(
+        self, instance_id: str | None, fn: Callable[..., dict], /, *args: Any, **kwargs: Any
+    ) -> dict:
+        """Like :meth:`run`, reporting a rejection as the tool error dict."""
+
+        try:
+            executor = self.executor(instance_id)
+        except MCPError as exc:
+            LOGGER.warning(
+                "Tool call rejected",
+                extra={
+                    "instance_id": instance_id or "default",
+                    "error_type": exc.error_type,
+                    "error_message": exc.message,
+                },
             )
-        return self._instances[key]
+            return exc.to_dict()
+        return await executor.run(fn, *args, **kwargs)
 
     def shutdown(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown()
+        self._executors.clear()
         for instance in self._instances.values():
             try:
                 instance.close()
@@ -60,6 +198,18 @@ class InstanceRegistry:
         self._instances.clear()
 
 
+def _create_scheduler(key: str, config: ServerConfig) -> FairScheduler | None:
+    if config.max_active_queries <= 0:
+        return None
+    return FairScheduler(
+        key,
+        config.max_active_queries,
+        max_queue=config.max_queue,
+        queue_timeout=config.queue_timeout,
+        weights=config.scheduler_weights,
+    )
+
+
 _registry: InstanceRegistry | None = None
 
 
@@ -2,25 +2,50 @@ import logging
 
 from fastmcp import FastMCP
 
-from sql_mcp_server.instances import shutdown_instance_registry
+from sql_mcp_server.instances import get_instance_registry, shutdown_instance_registry
 from sql_mcp_server.logging_utils import setup_logging
-from sql_mcp_server.tools.query import run_query, run_select
-from sql_mcp_server.tools.schema import describe_table, list_tables
+from sql_mcp_server.tools.health import server_health_async
+from sql_mcp_server.tools.metrics import server_metrics
+from sql_mcp_server.tools.query import (
+    export_query_async,
+    run_batch_async,
+    run_fanout_async,
+    run_query_async,
+    run_select_async,
+)
+from sql_mcp_server.tools.schema import (
+    describe_schema_async,
+    describe_table_async,
+    list_tables_async,
+    refresh_schema_async,
+)
 
 setup_logging()
 logger = logging.getLogger("sql_mcp_server")
 
 mcp = FastMCP("sql-mcp-server")
 
-mcp.tool()(list_tables)
-mcp.tool()(describe_table)
-mcp.tool()(run_select)
-mcp.tool()(run_query)
+# The async variants offload driver calls to per-instance worker threads so
+# a slow database never blocks the event loop serving the other instances.
+mcp.tool(name="list_tables")(list_tables_async)
+mcp.tool(name="describe_table")(describe_table_async)
+mcp.tool(name="describe_schema")(describe_schema_async)
+mcp.tool(name="refresh_schema")(refresh_schema_async)
+mcp.tool(name="run_select")(run_select_async)
+mcp.tool(name="run_query")(run_query_async)
+mcp.tool(name="run_batch")(run_batch_async)
+mcp.tool(name="run_fanout")(run_fanout_async)
+mcp.tool(name="export_query")(export_query_async)
+mcp.tool()(server_metrics)
+mcp.tool(name="server_health")(server_health_async)
 
 
 def run() -> None:
     logger.info("sql-mcp-server starting on stdio transport")
     try:
+        # Instances with DB_WARMUP=true connect now, concurrently, instead of
+        # on their first tool call.
+        get_instance_registry().warm_up()
         mcp.run(transport="stdio")
         logger.info("sql-mcp-server stopped")
     except BaseException:
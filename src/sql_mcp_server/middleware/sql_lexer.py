@@ -0,0 +1,376 @@
+"""Single-pass SQL tokenizer used by the validator's fast path.
+
+``scan`` understands strings, quoted identifiers and comments well enough to
+tell code apart from literals; ``classify`` recognises the plain
+SELECT/INSERT/UPDATE/DELETE shapes agents send most of the time and returns
+``None`` for anything it cannot classify with certainty, in which case the
+validator falls back to sqlparse.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlparse import keywords as _sqlparse_keywords
+
+WORD = "word"
+QUOTED = "quoted"
+STRING = "string"
+NUMBER = "number"
+PUNCT = "punct"
+PARAM = "param"
+
+Token = tuple[str, str]
+
+_TOKEN_PATTERN = r"""
+    (?P<ws>\s+)
+  | (?P<comment>--[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:[^'\\]|'')*')
+  | (?P<quoted>"(?:[^"\\]|"")*"|`(?:[^`]|``)*`)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+  | (?P<param>%[s%])
+  | (?P<punct>::|<>|<=|>=|!=|\|\||[(),;.*=<>+\-/%:?&|^~!])
+"""
+_TOKEN_RE = re.compile(_TOKEN_PATTERN, re.VERBOSE | re.DOTALL)
+# MySQL runs the text of ``/*! ... */`` comments, and ``/*+ ... */`` holds
+# optimizer hints; neither may be dropped like an ordinary comment.
+_EXECUTABLE_COMMENT_PREFIXES = ("/*!", "/*+")
+# Bracketed identifiers are only modelled where T-SQL text is rewritten.
+_SHAPE_TOKEN_RE = re.compile(
+    r"(?P<bracketed>\[[^\]]*\]) |" + _TOKEN_PATTERN, re.VERBOSE | re.DOTALL
+)
+
+# Words sqlparse lexes as keywords. Its grouping treats them differently from
+# names, so the fast path defers to sqlparse whenever one shows up where a
+# table name or alias is expected.
+_SQLPARSE_KEYWORDS = frozenset().union(
+    _sqlparse_keywords.KEYWORDS_COMMON,
+    _sqlparse_keywords.KEYWORDS_ORACLE,
+    _sqlparse_keywords.KEYWORDS_MYSQL,
+    _sqlparse_keywords.KEYWORDS_PLPGSQL,
+    _sqlparse_keywords.KEYWORDS_HQL,
+    _sqlparse_keywords.KEYWORDS_MSACCESS,
+    _sqlparse_keywords.KEYWORDS_SNOWFLAKE,
+    _sqlparse_keywords.KEYWORDS_BIGQUERY,
+    _sqlparse_keywords.KEYWORDS,
+)
+
+# Keywords that may legitimately follow a table reference and end it.
+_CLAUSE_WORDS = frozenset(
+    {
+        "WHERE", "JOIN", "LEFT", "RIGHT", "INNER", "OUTER", "FULL", "CROSS", "NATURAL",
+        "ON", "USING", "GROUP", "ORDER", "HAVING", "LIMIT", "OFFSET", "UNION", "EXCEPT",
+        "INTERSECT", "SET", "VALUES", "SELECT", "FETCH", "WINDOW", "RETURNING",
+    }
+)
+
+_FAST_STATEMENT_TYPES = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE"})
+
+_ROW_LIMIT_WORDS = frozenset({"LIMIT", "TOP", "FETCH", "OFFSET"})
+_COMPOUND_WORDS = frozenset({"UNION", "EXCEPT", "INTERSECT"})
+# Clauses a row limit cannot simply be placed in front of or after
+# (``FOR UPDATE``, ``FOR JSON``, ``SELECT ... INTO``).
+_TAIL_WORDS = frozenset({"FOR", "INTO"})
+
+
+@dataclass(frozen=True)
+class Classification:
+    statement_type: str
+    tables: frozenset[str]
+
+
+@dataclass(frozen=True)
+class SelectShape:
+    """Top-level structure of a SELECT, i.e. outside any parentheses."""
+
+    # Offset just past the main ``SELECT`` keyword (and ``DISTINCT``/``ALL``).
+    select_end: int
+    limited: bool
+    compound: bool
+    tail_clause: bool
+
+
+def scan(query: str) -> Optional[list[Token]]:
+    """Tokenize ``query``; comments and whitespace are dropped.
+
+    Words are upper-cased and quoted identifiers lose their quotes. Returns
+    ``None`` for input the tokenizer does not model (unterminated literals,
+    backslash escapes, dollar quoting, bracketed identifiers, ``#`` comments)
+    and for executable or hint comments (``/*! ... */``, ``/*+ ... */``), so
+    the validator falls back to checks that see their text.
+    """
+    tokens: list[Token] = []
+    pos = 0
+    end = len(query)
+    match = _TOKEN_RE.match
+    while pos < end:
+        m = match(query, pos)
+        if m is None:
+            return None
+        kind = m.lastgroup
+        text = m.group()
+        pos = m.end()
+        if kind == "comment" and text.startswith(_EXECUTABLE_COMMENT_PREFIXES):
+            return None
+        if kind == "ws" or kind == "comment":
+            continue
+        if kind == WORD:
+            tokens.append((WORD, text.upper()))
+        elif kind == QUOTED:
+            quote = text[0]
+            tokens.append((QUOTED, text[1:-1].replace(quote * 2, quote)))
+        else:
+            tokens.append((kind, text))
+    return tokens
+
+
+def numbered_placeholders(query: str) -> Optional[tuple[str, int]]:
+    """Rewrite ``%s`` placeholders as ``$1, $2, ...`` for ``PREPARE``.
+
+    ``%%`` becomes a literal ``%``. Returns the rewritten text and the number
+    of placeholders, or ``None`` when the query cannot be rewritten safely
+    (including any ``%`` inside a literal, which the driver would also
+    interpret).
+    """
+    parts: list[str] = []
+    count = 0
+    pos = 0
+    end = len(query)
+    match = _TOKEN_RE.match
+    while pos < end:
+        m = match(query, pos)
+        if m is None:
+            return None
+        kind = m.lastgroup
+        text = m.group()
+        pos = m.end()
+        if kind == PARAM:
+            if text == "%%":
+                parts.append("%")
+            else:
+                count += 1
+                parts.append(f"${count}")
+            continue
+        if kind in (STRING, QUOTED, "comment") and "%" in text:
+            return None
+        if kind == PUNCT and text == "%":
+            return None
+        parts.append(text)
+    return "".join(parts), count
+
+
+def select_shape(query: str) -> Optional[SelectShape]:
+    """Locate the main SELECT of ``query`` and the clauses around it.
+
+    Sub-selects and CTE bodies sit inside parentheses and are ignored, so a
+    ``LIMIT`` there does not count. Returns ``None`` when the text is not a
+    single statement with a top-level SELECT the tokenizer fully understands.
+    """
+    depth = 0
+    select_end: int | None = None
+    limited = compound = tail_clause = False
+    previous = ""
+    pos = 0
+    end = len(query)
+    match = _SHAPE_TOKEN_RE.match
+    while pos < end:
+        m = match(query, pos)
+        if m is None:
+            return None
+        kind = m.lastgroup
+        pos = m.end()
+        text = m.group()
+        if kind == "comment" and text.startswith(_EXECUTABLE_COMMENT_PREFIXES):
+            return None
+        if kind == "ws" or kind == "comment":
+            continue
+        if kind == PUNCT:
+            if text == "(":
+                depth += 1
+            elif text == ")":
+                depth -= 1
+                if depth < 0:
+                    return None
+            elif text == ";" and query[pos:].strip():
+                return None
+        elif kind == WORD and depth == 0:
+            word = text.upper()
+            if word == "SELECT" and select_end is None:
+                select_end = pos
+            elif word in ("DISTINCT", "ALL") and previous == "SELECT" and select_end is not None:
+                select_end = pos
+            elif word in _ROW_LIMIT_WORDS:
+                limited = True
+            elif word in _COMPOUND_WORDS:
+                compound = True
+            elif word in _TAIL_WORDS:
+                tail_clause = True
+            previous = word
+            continue
+        previous = ""
+    if select_end is None or depth != 0:
+        return None
+    return SelectShape(
+        select_end=select_end, limited=limited, compound=compound, tail_clause=tail_clause
+    )
+
+
+def reads_single_table(query: str) -> bool:
+    """Whether the main SELECT of ``query`` reads one table and nothing else.
+
+    Joins, comma lists, derived tables and set operations can repeat rows,
+    so a key that is unique in the table is then unique in the result too.
+    Sub-selects in other clauses (``WHERE id IN (SELECT ...)``) are ignored.
+    """
+    tokens = scan(query)
+    if tokens is None:
+        return False
+    depth = 0
+    sources = 0
+    in_from = False
+    for kind, value in tokens:
+        if kind == PUNCT:
+            if value == "(":
+                if in_from and depth == 0:
+                    # A derived table or a table function.
+                    return False
+                depth += 1
+            elif value == ")":
+                depth -= 1
+            elif value == "," and in_from and depth == 0:
+                return False
+            continue
+        if kind != WORD or depth:
+            continue
+        if value == "FROM":
+            sources += 1
+            in_from = True
+        elif value in ("WITH", "LATERAL", "APPLY") or value in _COMPOUND_WORDS:
+            return False
+        elif value.endswith("JOIN"):
+            return False
+        elif value in _CLAUSE_WORDS:
+            in_from = False
+    return sources == 1
+
+
+def words(tokens: list[Token]) -> set[str]:
+    """Bare words of the statement, i.e. keywords and unquoted identifiers."""
+    return {value for kind, value in tokens if kind == WORD}
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def classify(tokens: list[Token]) -> Optional[Classification]:
+    """Statement type and referenced tables, or ``None`` to defer to sqlparse."""
+    if tokens and tokens[-1] == (PUNCT, ";"):
+        tokens = tokens[:-1]
+    if not tokens or tokens[0][0] != WORD or tokens[0][1] not in _FAST_STATEMENT_TYPES:
+        return None
+    try:
+        tables = _collect_tables(tokens)
+    except _Unsupported:
+        return None
+    return Classification(statement_type=tokens[0][1], tables=frozenset(tables))
+
+
+def _collect_tables(tokens: list[Token]) -> set[str]:
+    tables: set[str] = set()
+    # One entry per open parenthesis: whether it opens a sub-select. FROM
+    # inside other parentheses (``EXTRACT(YEAR FROM ts)``) is not a table.
+    parens: list[bool] = []
+    count = len(tokens)
+    i = 0
+    while i < count:
+        kind, value = tokens[i]
+        if kind == PUNCT:
+            if value == ";":
+                raise _Unsupported
+            if value == "(":
+                nxt = tokens[i + 1] if i + 1 < count else None
+                parens.append(nxt == (WORD, "SELECT"))
+            elif value == ")":
+                if not parens:
+                    raise _Unsupported
+                parens.pop()
+            i += 1
+            continue
+        if kind != WORD:
+            i += 1
+            continue
+
+        if value in ("FROM", "JOIN", "INTO"):
+            if parens and not parens[-1]:
+                raise _Unsupported
+            i = _read_table_refs(tokens, i + 1, tables, allow_list=value != "INTO")
+            continue
+        if value in ("UPDATE", "DELETE"):
+            if i != 0:
+                # ``FOR UPDATE``, ``ON DUPLICATE KEY UPDATE`` and friends.
+                raise _Unsupported
+            if value == "UPDATE":
+                i = _read_table_refs(tokens, 1, tables, allow_list=True)
+                continue
+            if i + 1 >= count or tokens[i + 1] != (WORD, "FROM"):
+                raise _Unsupported
+        elif value in ("WITH", "LATERAL") or value.endswith("JOIN"):
+            raise _Unsupported
+        i += 1
+    if parens:
+        raise _Unsupported
+    return tables
+
+
+def _read_table_refs(tokens: list[Token], i: int, tables: set[str], *, allow_list: bool) -> int:
+    count = len(tokens)
+    while True:
+        name, i = _read_name(tokens, i)
+        tables.add(name.lower())
+        if i < count and tokens[i] == (PUNCT, "("):
+            if not allow_list:
+                # ``INSERT INTO t (a, b)``: the column list follows the table.
+                return i
+            raise _Unsupported
+        if i < count:
+            kind, value = tokens[i]
+            if kind == WORD and value == "AS":
+                if i + 1 >= count or tokens[i + 1][0] not in (WORD, QUOTED):
+                    raise _Unsupported
+                if tokens[i + 1][0] == WORD and tokens[i + 1][1] in _SQLPARSE_KEYWORDS:
+                    raise _Unsupported
+                i += 2
+            elif kind == QUOTED:
+                i += 1
+            elif kind == WORD:
+                if value not in _SQLPARSE_KEYWORDS:
+                    i += 1
+                elif value not in _CLAUSE_WORDS:
+                    raise _Unsupported
+        if allow_list and i < count and tokens[i] == (PUNCT, ","):
+            i += 1
+            continue
+        return i
+
+
+def _read_name(tokens: list[Token], i: int) -> tuple[str, int]:
+    """Read a possibly qualified name and return its last part."""
+    count = len(tokens)
+    if i >= count:
+        raise _Unsupported
+    kind, value = tokens[i]
+    if kind not in (WORD, QUOTED):
+        raise _Unsupported
+    qualified = i + 1 < count and tokens[i + 1] == (PUNCT, ".")
+    if kind == WORD and not qualified and value in _SQLPARSE_KEYWORDS:
+        raise _Unsupported
+    i += 1
+    while i < count and tokens[i] == (PUNCT, "."):
+        if i + 1 >= count or tokens[i + 1][0] not in (WORD, QUOTED):
+            raise _Unsupported
+        value = tokens[i + 1][1]
+        i += 2
+    return value, i
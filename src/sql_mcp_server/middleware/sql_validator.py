@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Union
 
 import sqlparse
 from sqlparse import tokens as T
-from sqlparse.sql import Identifier, IdentifierList, TokenList
+from sqlparse.sql import Function, Identifier, IdentifierList, TokenList
 
 from sql_mcp_server.config import DEFAULT_CONFIG, ServerConfig
 from sql_mcp_server.errors import MCPError
+from sql_mcp_server.middleware import sql_lexer
+from sql_mcp_server.metrics import get_metrics
 
 FORBIDDEN_KEYWORDS = {
     "DROP",
@@ -20,10 +24,16 @@ FORBIDDEN_KEYWORDS = {
     "REVOKE",
     "DENY",
     "CALL",
+    "EXECUTE",
     "XP_",
     "SP_",
 }
 
+# Entries of FORBIDDEN_KEYWORDS that block any word starting with them.
+FORBIDDEN_PREFIXES = {"XP_", "SP_"}
+
+DDL_STATEMENT_TYPES = {"CREATE", "ALTER", "DROP"}
+
 
 @dataclass(frozen=True)
 class SQLValidationResult:
@@ -31,31 +41,100 @@ class SQLValidationResult:
     warnings: list[str]
     is_select: bool
     required_scopes: set[str]
+    tables: frozenset[str] = frozenset()
+    statement_type: str = "UNKNOWN"
+    # Rows the rewritten query can return at most, when a limit was pushed
+    # into it.
+    row_limit: Optional[int] = None
+
+    @property
+    def is_ddl(self) -> bool:
+        return self.statement_type in DDL_STATEMENT_TYPES
+
+
+@dataclass(frozen=True)
+class _Rejection:
+    """A cached validation error; every caller raises an MCPError of its own."""
+
+    message: str
+    hint: Optional[str]
+    error_type: str
+
+
+_CacheEntry = Union[SQLValidationResult, _Rejection]
 
 
 class SQLValidator:
     def __init__(self, config: ServerConfig | None = None) -> None:
         self._config = config or DEFAULT_CONFIG
-
-    def validate(self, query: str) -> SQLValidationResult:
+        # Verdicts only depend on the config and the query text, so each
+        # validator (one per instance config) memoizes them in an LRU.
+        self._cache_size = self._config.validation_cache_size
+        self._cache: OrderedDict[tuple[str, bool], _CacheEntry] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._metrics = get_metrics()
+
+    def validate(self, query: str, *, apply_limit: bool = True) -> SQLValidationResult:
         normalized = query.strip()
         if not normalized:
             raise MCPError("Query is empty", error_type="InvalidQuery")
 
-        statements = sqlparse.parse(normalized)
-        if len(statements) != 1:
-            raise MCPError(
-                "Only one SQL statement is allowed",
-                hint="Send a single SELECT statement",
-                error_type="MultipleStatementsNotAllowed",
-            )
-
-        stmt = statements[0]
-        is_select_like = self._is_select_like(stmt, normalized)
-        required_scopes = self._required_scopes(normalized, is_select_like)
-
-        self._check_forbidden_keywords(normalized)
-        self._check_tables(stmt)
+        if self._cache_size <= 0:
+            return self._validate(normalized, apply_limit)
+
+        key = (normalized, apply_limit)
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+        hit = entry is not None
+        self._metrics.increment(
+            "validation_cache_hits_total" if hit else "validation_cache_misses_total",
+            instance_id=self._config.instance_id,
+        )
+        if entry is None:
+            try:
+                result = self._validate(normalized, apply_limit)
+            except MCPError as exc:
+                self._remember(key, _Rejection(exc.message, exc.hint, exc.error_type))
+                raise
+            self._remember(key, result)
+            return result
+        if isinstance(entry, _Rejection):
+            # Exceptions carry per-raise state (traceback, context), so
+            # concurrent callers must not share one.
+            raise MCPError(entry.message, hint=entry.hint, error_type=entry.error_type)
+        return entry
+
+    def _remember(self, key: tuple[str, bool], entry: _CacheEntry) -> None:
+        with self._cache_lock:
+            self._cache[key] = entry
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def cache_info(self) -> dict[str, int]:
+        with self._cache_lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._cache),
+                "max_size": self._cache_size,
+            }
+
+    def _validate(self, normalized: str, apply_limit: bool) -> SQLValidationResult:
+        tokens = sql_lexer.scan(normalized)
+        classification = self._classify(normalized, tokens)
+        is_select_like = classification.statement_type == "SELECT"
+        required_scopes = self._required_scopes(normalized, tokens, is_select_like)
+
+        self._check_forbidden_keywords(normalized, tokens)
+        tables = classification.tables
+        self._check_tables(tables)
 
         if not is_select_like:
             if self._config.read_only:
@@ -69,14 +148,52 @@ class SQLValidator:
                 warnings=[],
                 is_select=False,
                 required_scopes=required_scopes,
+                tables=tables,
+                statement_type=classification.statement_type,
             )
 
-        rewritten, warnings = self._apply_limit(normalized)
+        rewritten = normalized.rstrip().rstrip(";")
+        row_limit = None
+        if apply_limit:
+            rewritten, row_limit = self._push_down_limit(rewritten)
         return SQLValidationResult(
             query=rewritten,
-            warnings=warnings,
+            warnings=[],
             is_select=True,
             required_scopes=required_scopes,
+            tables=tables,
+            statement_type="SELECT",
+            row_limit=row_limit,
+        )
+
+    def _classify(
+        self, normalized: str, tokens: Optional[list[sql_lexer.Token]]
+    ) -> sql_lexer.Classification:
+        # Plain statements are classified straight from the token stream;
+        # sqlparse's grouping pass only runs for shapes the lexer defers on.
+        if tokens is not None:
+            classification = sql_lexer.classify(tokens)
+            if classification is not None:
+                return classification
+        return self._classify_with_sqlparse(normalized)
+
+    def _classify_with_sqlparse(self, normalized: str) -> sql_lexer.Classification:
+        statements = sqlparse.parse(normalized)
+        if len(statements) != 1:
+            raise MCPError(
+                "Only one SQL statement is allowed",
+                hint="Send a single SELECT statement",
+                error_type="MultipleStatementsNotAllowed",
+            )
+
+        stmt = statements[0]
+        if self._is_select_like(stmt, normalized):
+            statement_type = "SELECT"
+        else:
+            statement_type = (stmt.get_type() or "UNKNOWN").upper()
+        return sql_lexer.Classification(
+            statement_type=statement_type,
+            tables=frozenset(self._extract_table_identifiers(stmt)),
         )
 
     def _is_select_like(self, stmt, raw: str) -> bool:
@@ -90,26 +207,40 @@ class SQLValidator:
 
         return False
 
-    def _check_forbidden_keywords(self, query: str) -> None:
-        upper = query.upper()
+    def _check_forbidden_keywords(
+        self, query: str, tokens: Optional[list[sql_lexer.Token]]
+    ) -> None:
         forbidden = set(FORBIDDEN_KEYWORDS)
         if self._config.allow_alter:
             forbidden.discard("ALTER")
         if self._config.allow_drop:
             forbidden.discard("DROP")
-        for kw in forbidden:
-            if kw in upper:
-                raise MCPError(
-                    f"Forbidden SQL keyword detected: {kw}",
-                    hint="Remove dangerous SQL constructs",
-                    error_type="ForbiddenKeyword",
-                )
+        if tokens is None:
+            # The lexer could not tokenize the query; fall back to a plain
+            # substring search so nothing slips through unchecked.
+            upper = query.upper()
+            found = [kw for kw in forbidden if kw in upper]
+        else:
+            # Only bare words count, so keywords inside string literals and
+            # quoted identifiers no longer trip the check.
+            words = sql_lexer.words(tokens)
+            found = [
+                kw
+                for kw in forbidden
+                if kw in words
+                or (kw in FORBIDDEN_PREFIXES and any(word.startswith(kw) for word in words))
+            ]
+        if found:
+            raise MCPError(
+                f"Forbidden SQL keyword detected: {min(found)}",
+                hint="Remove dangerous SQL constructs",
+                error_type="ForbiddenKeyword",
+            )
 
-    def _check_tables(self, statement: TokenList) -> None:
+    def _check_tables(self, identifiers: frozenset[str]) -> None:
         if not self._config.allowed_tables:
             return
 
-        identifiers = self._extract_table_identifiers(statement)
         if not identifiers:
             return
 
@@ -138,6 +269,12 @@ class SQLValidator:
                 _, next_token = statement.token_next(idx, skip_ws=True, skip_cm=True)
                 if next_token is None:
                     continue
+                if normalized == "INTO" and isinstance(next_token, Function):
+                    # ``INSERT INTO t (a, b)`` is grouped like a call to ``t``.
+                    real_name = next_token.get_real_name()
+                    if real_name:
+                        identifiers.add(real_name.lower())
+                    continue
                 identifiers.update(self._identifiers_from_token(next_token))
         return identifiers
 
@@ -160,32 +297,50 @@ class SQLValidator:
             names.update(self._extract_table_identifiers(token))
             return names
 
+        if token.ttype in T.Keyword:
+            # e.g. ``DELETE FROM t``: the table follows the FROM keyword.
+            return names
+
         value = token.value.strip("`\" ")
         if value:
             names.add(value.lower())
         return names
 
-    def _required_scopes(self, query: str, is_select_like: bool) -> set[str]:
+    def _required_scopes(
+        self, query: str, tokens: Optional[list[sql_lexer.Token]], is_select_like: bool
+    ) -> set[str]:
         scopes: set[str] = {"r"} if is_select_like else {"w"}
-        upper = query.upper()
-        if self._config.allow_drop and "DROP" in upper:
+        if tokens is not None:
+            mentioned = sql_lexer.words(tokens)
+        else:
+            upper = query.upper()
+            mentioned = {kw for kw in ("DROP", "ALTER") if kw in upper}
+        if self._config.allow_drop and "DROP" in mentioned:
             scopes.add("d")
-        if self._config.allow_alter and "ALTER" in upper:
+        if self._config.allow_alter and "ALTER" in mentioned:
             scopes.add("a")
         return scopes
 
-    def _apply_limit(self, query: str) -> tuple[str, list[str]]:
-        normalized = query.rstrip().rstrip(";")
-        q_lower = normalized.lower()
-        if " limit " in q_lower or " top " in q_lower:
-            return normalized, []
+    def _push_down_limit(self, query: str) -> tuple[str, Optional[int]]:
+        """Let the database stop after one row more than ``max_rows``.
 
+        The tools cap results while fetching either way; pushing the limit
+        down only saves the database from producing rows nobody reads, so
+        any statement whose structure is not fully understood, or that
+        limits itself already, is left untouched. The extra row tells the
+        caller whether the result was cut.
+        """
         if self._config.max_rows <= 0:
-            return normalized, []
-
+            return query, None
+        shape = sql_lexer.select_shape(query)
+        if shape is None or shape.limited or shape.tail_clause:
+            return query, None
+        limit = self._config.max_rows + 1
         if self._config.provider == "mssql":
-            rewritten = normalized.replace("SELECT", f"SELECT TOP {self._config.max_rows}", 1)
-            return rewritten, [f"TOP {self._config.max_rows} automatically applied"]
-
-        limit = self._config.max_rows
-        return f"{normalized} LIMIT {limit}", [f"LIMIT {limit} automatically applied"]
+            if shape.compound:
+                # TOP would only limit the first SELECT of the UNION.
+                return query, None
+            head, tail = query[: shape.select_end], query[shape.select_end :]
+            return f"{head} TOP {limit}{tail}", limit
+        # On its own line so a trailing ``--`` comment cannot swallow it.
+        return f"{query}\nLIMIT {limit}", limit
@@ -0,0 +1,434 @@
+from __future__ import annotations
+
+import base64
+import datetime as dt
+import decimal
+import hashlib
+import hmac
+import json
+import logging
+import re
+import secrets
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Collection, Iterator, Sequence
+
+from sql_mcp_server.catalog import SchemaCatalog
+from sql_mcp_server.config import ServerConfig
+from sql_mcp_server.db.base import DBClient, RowBatch
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.middleware import sql_lexer
+
+LOGGER = logging.getLogger("sql_mcp_server.pagination")
+
+# Tokens are signed with a per-process secret: they cannot be forged or
+# edited by clients and simply expire when the server restarts.
+_TOKEN_SECRET = secrets.token_bytes(32)
+
+_ORDER_BY_RE = re.compile(
+    r"\border\s+by\s+(?:[a-z_][a-z0-9_]*\.)?([a-z_][a-z0-9_]*)(?:\s+(asc|desc))?\s*$",
+    re.IGNORECASE,
+)
+# MSSQL rejects ORDER BY inside derived tables, so it always pages through
+# a held cursor.
+_KEYSET_PROVIDERS = {"sqlite", "postgres", "mysql"}
+_FORMAT_PARAMSTYLE = {"postgres", "mysql"}
+_KEY_SCALARS = (str, int, float)
+_KEY_STRINGIFIED = (dt.datetime, dt.date, dt.time, decimal.Decimal, uuid.UUID)
+
+
+def _invalid_token(message: str = "Invalid page token") -> MCPError:
+    return MCPError(
+        message,
+        hint="Repeat the original call without page_token to start over",
+        error_type="InvalidPageToken",
+    )
+
+
+def encode_page_token(payload: dict[str, Any]) -> str:
+    body = base64.urlsafe_b64encode(
+        json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    ).rstrip(b"=")
+    signature = base64.urlsafe_b64encode(
+        hmac.new(_TOKEN_SECRET, body, hashlib.sha256).digest()[:16]
+    ).rstrip(b"=")
+    return f"{body.decode('ascii')}.{signature.decode('ascii')}"
+
+
+def decode_page_token(token: str) -> dict[str, Any]:
+    try:
+        body, signature = token.split(".", 1)
+        expected = hmac.new(_TOKEN_SECRET, body.encode("ascii"), hashlib.sha256).digest()[:16]
+        provided = base64.urlsafe_b64decode(signature + "=" * (-len(signature) % 4))
+        if not hmac.compare_digest(expected, provided):
+            raise _invalid_token()
+        payload = json.loads(base64.urlsafe_b64decode(body + "=" * (-len(body) % 4)))
+    except MCPError:
+        raise
+    except Exception as exc:
+        raise _invalid_token() from exc
+    if not isinstance(payload, dict):
+        raise _invalid_token()
+    return payload
+
+
+def query_fingerprint(query: str, params: Sequence[Any] = ()) -> str:
+    digest = hashlib.sha256(query.encode("utf-8", "ignore"))
+    if params:
+        digest.update(json.dumps(list(params), default=str).encode("utf-8"))
+    return digest.hexdigest()[:24]
+
+
+def detect_order_key(query: str) -> tuple[str, bool] | None:
+    """Return ``(column, descending)`` for a trailing top-level single-column ORDER BY."""
+
+    match = _ORDER_BY_RE.search(query)
+    if match is None:
+        return None
+    prefix = query[: match.start()]
+    if prefix.count("(") != prefix.count(")"):
+        return None
+    return match.group(1), (match.group(2) or "").lower() == "desc"
+
+
+@dataclass(frozen=True, slots=True)
+class Page:
+    columns: tuple[str, ...]
+    rows: list[Sequence[Any]]
+    next_token: str | None
+
+
+@dataclass(eq=False)
+class _HeldCursor:
+    principal: str
+    fingerprint: str
+    columns: tuple[str, ...]
+    batches: Iterator[RowBatch]
+    pending: list[Sequence[Any]] = field(default_factory=list)
+    expires_at: float = 0.0
+
+    def take(self, count: int) -> list[Sequence[Any]]:
+        # Read one row past the page so we know whether another page exists.
+        while len(self.pending) <= count:
+            batch = next(self.batches, None)
+            if batch is None:
+                break
+            self.pending.extend(batch.rows)
+        page, self.pending = self.pending[:count], self.pending[count:]
+        return page
+
+    def close(self) -> None:
+        try:
+            self.batches.close()  # type: ignore[attr-defined]
+        except Exception:
+            LOGGER.debug("Error while closing held cursor", exc_info=True)
+
+
+class Paginator:
+    """Serve SELECT results one page at a time for a single instance.
+
+    Queries over one table ending in an ``ORDER BY`` of its single-column
+    primary key are paged with keyset predicates (``WHERE key > last``), so
+    each page costs one page of work and no server state. The key must be
+    unique: rows sharing a value have no stable order between queries.
+    Everything else keeps its server-side cursor open between calls, up to
+    ``max_open_cursors`` cursors that expire after ``ttl`` seconds of
+    inactivity.
+    """
+
+    def __init__(
+        self, db: DBClient, config: ServerConfig, catalog: SchemaCatalog | None = None
+    ) -> None:
+        self._db = db
+        self._config = config
+        self._catalog = catalog
+        self._ttl = config.page_cursor_ttl
+        self._max_open = max(config.max_open_cursors, 1)
+        self._cursors: OrderedDict[str, _HeldCursor] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fetch(
+        self,
+        query: str,
+        page_size: int,
+        page_token: str | None,
+        principal: str,
+        params: Sequence[Any] = (),
+        tables: Collection[str] = (),
+    ) -> Page:
+        """Return the first page, or the one ``page_token`` points to.
+
+        ``tables`` are the tables ``query`` reads; keyset paging needs them
+        to look up the primary key.
+        """
+        fingerprint = query_fingerprint(query, params)
+        if page_token is None:
+            return self._first_page(query, params, fingerprint, page_size, principal, tables)
+
+        payload = decode_page_token(page_token)
+        if (
+            payload.get("i") != self._config.instance_id
+            or payload.get("f") != fingerprint
+            or payload.get("p") != principal
+        ):
+            raise _invalid_token("Page token does not match this query")
+        mode = payload.get("m")
+        if mode == "c":
+            return self._cursor_page(str(payload.get("c")), page_size)
+        if mode in {"k", "o"}:
+            return self._keyset_page(query, params, payload, page_size)
+        raise _invalid_token()
+
+    def _token(self, fingerprint: str, principal: str, **fields: Any) -> str:
+        return encode_page_token(
+            {"i": self._config.instance_id, "f": fingerprint, "p": principal, **fields}
+        )
+
+    # -- first page ---------------------------------------------------------
+
+    def _first_page(
+        self,
+        query: str,
+        params: Sequence[Any],
+        fingerprint: str,
+        page_size: int,
+        principal: str,
+        tables: Collection[str],
+    ) -> Page:
+        batches = self._db.iter_batches(
+            query, params, batch_size=min(self._config.fetch_batch_size, page_size + 1)
+        )
+        first = next(batches, None)
+        if first is None:
+            return Page(columns=(), rows=[], next_token=None)
+        held = _HeldCursor(
+            principal=principal,
+            fingerprint=fingerprint,
+            columns=first.columns,
+            batches=batches,
+            pending=list(first.rows),
+        )
+        rows = held.take(page_size)
+        if not held.pending:
+            held.close()
+            return Page(columns=held.columns, rows=rows, next_token=None)
+
+        key = self._keyset_key(query, held.columns, tables)
+        if key is not None:
+            # Later pages are re-queried with a keyset predicate, so the
+            # stream does not need to stay open.
+            held.close()
+            column, descending = key
+            token = self._keyset_token(
+                fingerprint,
+                principal,
+                column,
+                descending,
+                rows,
+                held.columns.index(column),
+                offset=0,
+            )
+            return Page(columns=held.columns, rows=rows, next_token=token)
+
+        cursor_id = self._hold(held)
+        return Page(
+            columns=held.columns,
+            rows=rows,
+            next_token=self._token(fingerprint, principal, m="c", c=cursor_id),
+        )
+
+    def _keyset_key(
+        self, query: str, columns: tuple[str, ...], tables: Collection[str]
+    ) -> tuple[str, bool] | None:
+        if self._config.provider not in _KEYSET_PROVIDERS:
+            return None
+        order = detect_order_key(query)
+        if order is None:
+            return None
+        lowered = [c.lower() for c in columns]
+        # Wrapping the query in a derived table needs unique column names.
+        if len(set(lowered)) != len(lowered) or order[0].lower() not in lowered:
+            return None
+        if not self._is_primary_key(query, tables, order[0]):
+            return None
+        return columns[lowered.index(order[0].lower())], order[1]
+
+    def _is_primary_key(self, query: str, tables: Collection[str], column: str) -> bool:
+        if self._catalog is None or len(tables) != 1 or not sql_lexer.reads_single_table(query):
+            return False
+        [table] = tables
+        schema = {
+            name.lower(): info for name, info in self._catalog.schema(include_keys=True).items()
+        }
+        primary_key = schema.get(table.lower(), {}).get("primary_key") or []
+        return [c.lower() for c in primary_key] == [column.lower()]
+
+    # -- keyset / offset pages ----------------------------------------------
+
+    def _keyset_token(
+        self,
+        fingerprint: str,
+        principal: str,
+        column: str,
+        descending: bool,
+        rows: list[Sequence[Any]],
+        index: int,
+        *,
+        offset: int,
+    ) -> str:
+        fields: dict[str, Any] = {"k": column, "d": descending, "o": offset + len(rows)}
+        value = self._key_value(rows[-1][index])
+        if value is None:
+            # Non-portable boundary values cannot be bound as a keyset
+            # predicate; continue with LIMIT/OFFSET on the same order.
+            return self._token(fingerprint, principal, m="o", **fields)
+        return self._token(fingerprint, principal, m="k", v=value, **fields)
+
+    @staticmethod
+    def _key_value(value: Any) -> Any:
+        if isinstance(value, bool) or value is None:
+            return None
+        if isinstance(value, _KEY_SCALARS):
+            return value
+        if isinstance(value, _KEY_STRINGIFIED):
+            return str(value)
+        return None
+
+    def _quote(self, column: str) -> str:
+        if self._config.provider == "mysql":
+            return "`" + column.replace("`", "``") + "`"
+        return '"' + column.replace('"', '""') + '"'
+
+    def _keyset_page(
+        self,
+        query: str,
+        query_params: Sequence[Any],
+        payload: dict[str, Any],
+        page_size: int,
+    ) -> Page:
+        column = payload.get("k")
+        if not isinstance(column, str) or self._config.provider not in _KEYSET_PROVIDERS:
+            raise _invalid_token()
+        descending = bool(payload.get("d"))
+        offset = int(payload.get("o") or 0)
+        quoted = self._quote(column)
+        direction = "DESC" if descending else "ASC"
+        inner = query
+        placeholder = "?"
+        if self._config.provider in _FORMAT_PARAMSTYLE:
+            # Bound parameters switch these drivers to %-formatting; a query
+            # that already has parameters is written for it.
+            if not query_params:
+                inner = query.replace("%", "%%")
+            placeholder = "%s"
+
+        params: list[Any] = list(query_params)
+        if payload.get("m") == "k":
+            comparison = "<" if descending else ">"
+            sql = (
+                f"SELECT * FROM ({inner}) AS _mcp_page WHERE {quoted} {comparison} {placeholder} "
+                f"ORDER BY {quoted} {direction} LIMIT {page_size + 1}"
+            )
+            params.append(payload.get("v"))
+        else:
+            sql = (
+                f"SELECT * FROM ({inner}) AS _mcp_page ORDER BY {quoted} {direction} "
+                f"LIMIT {page_size + 1} OFFSET {offset}"
+            )
+
+        row_limit = page_size + 1
+        columns: tuple[str, ...] = ()
+        fetched: list[Sequence[Any]] = []
+        for batch in self._db.iter_batches(
+            sql,
+            params,
+            batch_size=min(self._config.fetch_batch_size, row_limit),
+            row_limit=row_limit,
+        ):
+            columns = batch.columns
+            fetched.extend(batch.rows)
+        rows = fetched[:page_size]
+        if len(fetched) <= page_size:
+            return Page(columns=columns, rows=rows, next_token=None)
+
+        lowered = [c.lower() for c in columns]
+        if column.lower() not in lowered:
+            raise _invalid_token("Ordering column is no longer part of the result")
+        token = self._keyset_token(
+            payload["f"],
+            payload["p"],
+            column,
+            descending,
+            rows,
+            lowered.index(column.lower()),
+            offset=offset,
+        )
+        return Page(columns=columns, rows=rows, next_token=token)
+
+    # -- held cursors ---------------------------------------------------------
+
+    def _reap_locked(self) -> list[_HeldCursor]:
+        now = time.monotonic()
+        expired = [cid for cid, held in self._cursors.items() if held.expires_at <= now]
+        return [self._cursors.pop(cid) for cid in expired]
+
+    def _hold(self, held: _HeldCursor) -> str:
+        cursor_id = secrets.token_urlsafe(12)
+        held.expires_at = time.monotonic() + self._ttl
+        with self._lock:
+            stale = self._reap_locked()
+            while len(self._cursors) >= self._max_open:
+                _, oldest = self._cursors.popitem(last=False)
+                stale.append(oldest)
+                LOGGER.info(
+                    "Evicting held page cursor",
+                    extra={"instance_id": self._config.instance_id},
+                )
+            self._cursors[cursor_id] = held
+        for cursor in stale:
+            cursor.close()
+        return cursor_id
+
+    def _cursor_page(self, cursor_id: str, page_size: int) -> Page:
+        with self._lock:
+            stale = self._reap_locked()
+            held = self._cursors.pop(cursor_id, None)
+        for cursor in stale:
+            cursor.close()
+        if held is None:
+            raise MCPError(
+                "Page token expired",
+                hint="Repeat the original call without page_token to start over",
+                error_type="PageTokenExpired",
+            )
+        try:
+            rows = held.take(page_size)
+        except BaseException:
+            held.close()
+            raise
+        if not held.pending:
+            held.close()
+            return Page(columns=held.columns, rows=rows, next_token=None)
+
+        held.expires_at = time.monotonic() + self._ttl
+        with self._lock:
+            self._cursors[cursor_id] = held
+        return Page(
+            columns=held.columns,
+            rows=rows,
+            next_token=self._token(held.fingerprint, held.principal, m="c", c=cursor_id),
+        )
+
+    def open_cursors(self) -> int:
+        with self._lock:
+            return len(self._cursors)
+
+    def close(self) -> None:
+        with self._lock:
+            held = list(self._cursors.values())
+            self._cursors.clear()
+        for cursor in held:
+            cursor.close()
@@ -0,0 +1,171 @@
+"""Per-principal usage quotas.
+
+A quota grants each resource a per-minute allowance, enforced as a token
+bucket that holds one minute's worth and refills continuously. Calls are
+admitted only while every bucket of the principal is non-empty. Rows, bytes
+and database time are only known once a call has run, so they are charged
+afterwards and may push a bucket into debt; the principal's next calls are
+then refused until it has refilled.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
+
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.metrics import get_metrics
+
+if TYPE_CHECKING:
+    from sql_mcp_server.auth import ApiPrincipal
+
+RESOURCES = ("requests", "rows", "bytes", "db_seconds")
+
+
+@dataclass(frozen=True)
+class Quota:
+    """Per-minute allowances; ``None`` leaves a resource unlimited."""
+
+    requests: float | None = None
+    rows: float | None = None
+    bytes: float | None = None
+    db_seconds: float | None = None
+
+
+def parse_quota(raw: str) -> Quota:
+    """Parse ``requests=60;rows=100000;bytes=5000000;db_seconds=30``."""
+
+    values: dict[str, float] = {}
+    for item in raw.split(";"):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, amount = item.partition("=")
+        name = name.strip().lower()
+        if not sep or name not in RESOURCES:
+            raise ValueError(f"Unknown quota entry: {item}")
+        try:
+            value = float(amount)
+        except ValueError:
+            raise ValueError(f"Quota must be a number: {item}") from None
+        if value <= 0:
+            raise ValueError(f"Quota must be positive: {item}")
+        values[name] = value
+    return Quota(**values)
+
+
+class TokenBucket:
+    """Holds up to ``capacity`` tokens and gains ``rate`` tokens per second."""
+
+    def __init__(self, capacity: float, rate: float, clock: Callable[[], float]) -> None:
+        self.capacity = capacity
+        self.rate = rate
+        self._clock = clock
+        self._level = capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def retry_after(self, needed: float) -> float:
+        """Seconds until the bucket holds ``needed`` tokens; 0 if it does now."""
+        self._refill()
+        missing = needed - self._level
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self._level -= amount
+
+
+class QuotaManager:
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: dict[str, tuple[Quota, dict[str, TokenBucket]]] = {}
+        self._metrics = get_metrics()
+
+    def _buckets_locked(self, principal: ApiPrincipal) -> dict[str, TokenBucket]:
+        quota = principal.quota
+        if quota is None:
+            return {}
+        entry = self._buckets.get(principal.username)
+        if entry is None or entry[0] != quota:
+            # New principal, or its quota changed when tokens.txt was reloaded.
+            buckets = {}
+            for resource in RESOURCES:
+                limit = getattr(quota, resource)
+                if limit is not None:
+                    buckets[resource] = TokenBucket(limit, limit / 60, self._clock)
+            entry = self._buckets[principal.username] = (quota, buckets)
+        return entry[1]
+
+    def admit(self, principal: ApiPrincipal) -> None:
+        """Count one call against ``principal``, refusing it if a quota is used up."""
+        with self._lock:
+            buckets = self._buckets_locked(principal)
+            exhausted, wait = None, 0.0
+            for resource, bucket in buckets.items():
+                # A call needs a whole request token; the other resources
+                # only must not be in debt.
+                resource_wait = bucket.retry_after(1.0 if resource == "requests" else 0.0)
+                if resource_wait > wait:
+                    exhausted, wait = resource, resource_wait
+            if exhausted is None and "requests" in buckets:
+                buckets["requests"].take(1.0)
+        if exhausted is not None:
+            self._metrics.increment(
+                "quota_exceeded_total", principal=principal.username, resource=exhausted
+            )
+            raise MCPError(
+                f"Quota exceeded for {principal.username}: {exhausted}",
+                hint=f"Retry after {wait:.1f}s",
+                error_type="QuotaExceeded",
+                retry_after=round(wait, 3),
+            )
+        self._metrics.increment(
+            "quota_usage_total", principal=principal.username, resource="requests"
+        )
+
+    def charge(
+        self,
+        principal: ApiPrincipal,
+        *,
+        requests: int = 0,
+        rows: int = 0,
+        bytes: int = 0,
+        db_seconds: float = 0.0,
+    ) -> None:
+        """Record what a call used once it is known.
+
+        ``requests`` counts work beyond the call :meth:`admit` let in, e.g.
+        the further queries of a batch.
+        """
+        usage = {"requests": requests, "rows": rows, "bytes": bytes, "db_seconds": db_seconds}
+        with self._lock:
+            buckets = self._buckets_locked(principal)
+            for resource, amount in usage.items():
+                bucket = buckets.get(resource)
+                if bucket is not None and amount:
+                    bucket.take(amount)
+        for resource, amount in usage.items():
+            if amount:
+                self._metrics.increment(
+                    "quota_usage_total", amount, principal=principal.username, resource=resource
+                )
+
+    def limits_bytes(self, principal: ApiPrincipal) -> bool:
+        return principal.quota is not None and principal.quota.bytes is not None
+
+
+_quota_manager: QuotaManager | None = None
+
+
+def get_quota_manager() -> QuotaManager:
+    global _quota_manager
+    if _quota_manager is None:
+        _quota_manager = QuotaManager()
+    return _quota_manager
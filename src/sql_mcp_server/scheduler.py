@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Mapping
+
+from sql_mcp_server.db.cancel import (
+    cancellable,
+    cancelled_error,
+    current_scope,
+    phase,
+    time_left,
+)
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.metrics import get_metrics
+
+LOGGER = logging.getLogger("sql_mcp_server.scheduler")
+
+# Queue depths are small integers; these bounds keep the histogram readable.
+QUEUE_DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128)
+
+
+@dataclass(order=True)
+class _Waiter:
+    tag: float
+    seq: int
+    principal: str = field(compare=False)
+    event: threading.Event = field(default_factory=threading.Event, compare=False)
+    granted: bool = field(default=False, compare=False)
+    abandoned: bool = field(default=False, compare=False)
+
+
+class FairScheduler:
+    """Admission control in front of one instance's database work.
+
+    At most ``max_active`` statements run at once. Further calls wait in a
+    queue of at most ``max_queue`` entries for up to ``queue_timeout``
+    seconds (or the call's deadline, if sooner); beyond that they are
+    rejected right away.
+
+    Waiting calls are served by weighted fair queuing across principals:
+    each request gets a virtual finish tag ``max(now, principal's last tag)
+    + 1 / weight`` and the lowest tag runs next, so a principal with a burst
+    of queries queues behind itself instead of in front of everyone else.
+    Principals without a configured weight weigh 1.
+    """
+
+    def __init__(
+        self,
+        instance_id: str,
+        max_active: int,
+        *,
+        max_queue: int = 16,
+        queue_timeout: float = 10.0,
+        weights: Mapping[str, int] | None = None,
+    ) -> None:
+        self._instance_id = instance_id
+        self._max_active = max(max_active, 1)
+        self._max_queue = max(max_queue, 0)
+        self._queue_timeout = queue_timeout
+        self._weights = dict(weights or {})
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._heap: list[_Waiter] = []
+        self._virtual_time = 0.0
+        self._finish: dict[str, float] = {}
+        self._seq = itertools.count()
+        self._metrics = get_metrics()
+
+    @contextmanager
+    def slot(self, principal: str) -> Iterator[None]:
+        self.acquire(principal)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def acquire(self, principal: str) -> None:
+        started = time.monotonic()
+        with phase("queue"):
+            with self._lock:
+                admitted = self._active < self._max_active and not self._queued
+                waiter = None
+                if admitted:
+                    self._active += 1
+                elif self._queued < self._max_queue:
+                    waiter = self._enqueue_locked(principal)
+                active, queued = self._active, self._queued
+            if admitted:
+                self._admitted(started, active, queued)
+                return
+            if waiter is None:
+                self._reject("queue_full")
+                raise MCPError(
+                    f"Too many queries waiting for instance {self._instance_id}",
+                    hint=f"{queued} queries are already queued; retry later",
+                    error_type="QueueFull",
+                )
+            self._metrics.observe(
+                "scheduler_queue_depth",
+                queued,
+                QUEUE_DEPTH_BUCKETS,
+                instance_id=self._instance_id,
+            )
+            self._set_gauges(active, queued)
+            self._wait(waiter, started)
+
+    def _enqueue_locked(self, principal: str) -> _Waiter:
+        weight = max(self._weights.get(principal, 1), 1)
+        tag = max(self._virtual_time, self._finish.get(principal, 0.0)) + 1.0 / weight
+        self._finish[principal] = tag
+        waiter = _Waiter(tag=tag, seq=next(self._seq), principal=principal)
+        heapq.heappush(self._heap, waiter)
+        self._queued += 1
+        return waiter
+
+    def _wait(self, waiter: _Waiter, started: float) -> None:
+        wait = self._queue_timeout
+        left = time_left()
+        bounded_by_call = left is not None and left < wait
+        if bounded_by_call:
+            wait = left
+        try:
+            # Cancelling the call wakes the waiter up.
+            with cancellable(waiter.event.set):
+                waiter.event.wait(max(wait, 0.0))
+        except BaseException:
+            if self._leave_queue(waiter, started):
+                self.release()
+            raise
+        if self._leave_queue(waiter, started):
+            return
+        scope = current_scope()
+        if scope is not None and scope.reason is not None:
+            raise cancelled_error(scope.reason)
+        if bounded_by_call:
+            raise cancelled_error("deadline")
+        self._reject("queue_timeout")
+        raise MCPError(
+            f"Timed out waiting for a query slot on instance {self._instance_id}",
+            hint="The instance is saturated; retry later or raise DB_MAX_ACTIVE_QUERIES",
+            error_type="QueueTimeout",
+        )
+
+    def _leave_queue(self, waiter: _Waiter, started: float) -> bool:
+        """Settle a waiter that woke up; returns whether it got a slot."""
+        with self._lock:
+            granted = waiter.granted
+            if not granted:
+                # Dropped from the heap when it reaches the top.
+                waiter.abandoned = True
+                self._queued -= 1
+            active, queued = self._active, self._queued
+        self._admitted(started, active, queued)
+        return granted
+
+    def release(self) -> None:
+        with self._lock:
+            self._active -= 1
+            while self._active < self._max_active and self._heap:
+                waiter = heapq.heappop(self._heap)
+                if waiter.abandoned:
+                    continue
+                waiter.granted = True
+                self._queued -= 1
+                self._active += 1
+                self._virtual_time = waiter.tag
+                waiter.event.set()
+            if not self._heap:
+                # Without a backlog there is nothing left to be fair about.
+                self._virtual_time = 0.0
+                self._finish.clear()
+            active, queued = self._active, self._queued
+        self._set_gauges(active, queued)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "active": self._active,
+                "queued": self._queued,
+                "max_active": self._max_active,
+                "max_queue": self._max_queue,
+            }
+
+    def _admitted(self, started: float, active: int, queued: int) -> None:
+        self._metrics.observe(
+            "scheduler_wait_seconds", time.monotonic() - started, instance_id=self._instance_id
+        )
+        self._set_gauges(active, queued)
+
+    def _set_gauges(self, active: int, queued: int) -> None:
+        self._metrics.set_gauge("scheduler_active", active, instance_id=self._instance_id)
+        self._metrics.set_gauge("scheduler_queued", queued, instance_id=self._instance_id)
+
+    def _reject(self, reason: str) -> None:
+        LOGGER.warning(
+            "Query rejected by scheduler",
+            extra={"instance_id": self._instance_id, "reason": reason},
+        )
+        self._metrics.increment(
+            "scheduler_rejected_total", instance_id=self._instance_id, reason=reason
+        )
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from sql_mcp_server.auth import authorize
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.instances import get_instance_registry
+from sql_mcp_server.logging_utils import get_logger
+from sql_mcp_server.metrics import get_metrics
+
+_registry = get_instance_registry()
+_logger = get_logger()
+
+
+def server_health(instance_id: str | None = None, api_key: str | None = None) -> dict:
+    """Ping every instance (or just ``instance_id``) and report its state.
+
+    Only a fixed ``SELECT 1``-style probe is sent. Instances that were not
+    connected yet are connected first, so ``ready`` means every instance can
+    serve queries right now.
+    """
+    try:
+        targets = _start_health(instance_id, api_key)
+    except MCPError as exc:
+        return _health_rejected(exc)
+    futures = {
+        target: _registry.executor(target).submit_cancellable(_probe, target)
+        for target in targets
+    }
+    results = []
+    for target, (future, scope) in futures.items():
+        try:
+            results.append(future.result(timeout=_probe_timeout(target)))
+        except FutureTimeoutError:
+            future.cancel()
+            scope.cancel("timeout")
+            results.append(_probe_timed_out(target))
+    return _health_response(results)
+
+
+async def server_health_async(
+    instance_id: str | None = None, api_key: str | None = None
+) -> dict:
+    try:
+        targets = _start_health(instance_id, api_key)
+    except MCPError as exc:
+        return _health_rejected(exc)
+
+    async def one(target: str) -> dict:
+        try:
+            return await asyncio.wait_for(
+                _registry.run(target, _probe, target), _probe_timeout(target)
+            )
+        except asyncio.TimeoutError:
+            return _probe_timed_out(target)
+
+    results = await asyncio.gather(*(one(target) for target in targets))
+    return _health_response(list(results))
+
+
+def _start_health(instance_id: str | None, api_key: str | None) -> list[str]:
+    principal = authorize(api_key, ["r"])
+    _logger.info(
+        "server_health received",
+        extra={"instance_id": instance_id or "all", "principal": principal.username},
+    )
+    if instance_id is None:
+        return _registry.instance_ids()
+    return [_registry.config(instance_id).instance_id]
+
+
+def _probe(instance_id: str) -> dict:
+    try:
+        context = _registry.get(instance_id)
+        started = time.perf_counter()
+        context.db.ping()
+        ping_seconds = time.perf_counter() - started
+    except MCPError as exc:
+        return _down(instance_id, exc)
+    except Exception as exc:
+        return _down(
+            instance_id,
+            MCPError(
+                str(exc),
+                hint="Check the instance's connection settings",
+                error_type="InstanceUnavailable",
+            ),
+        )
+    get_metrics().set_gauge(
+        "instance_ping_seconds", round(ping_seconds, 6), instance_id=instance_id
+    )
+    connect_seconds = _registry.connect_seconds(instance_id)
+    return {
+        "instance_id": instance_id,
+        "status": "up",
+        "ping_ms": round(ping_seconds * 1000, 3),
+        "connect_ms": round(connect_seconds * 1000, 3) if connect_seconds is not None else None,
+        "pool": context.db.pool_stats(),
+        "scheduler": context.scheduler.stats() if context.scheduler is not None else None,
+    }
+
+
+def _probe_timeout(instance_id: str) -> float | None:
+    config = _registry.config(instance_id)
+    return float(config.query_timeout) if config.query_timeout > 0 else None
+
+
+def _probe_timed_out(instance_id: str) -> dict:
+    seconds = _probe_timeout(instance_id) or 0.0
+    return _down(
+        instance_id,
+        MCPError(
+            f"Instance did not answer within {seconds:g}s",
+            hint="The instance is saturated or unreachable",
+            error_type="InstanceTimeout",
+        ),
+    )
+
+
+def _down(instance_id: str, exc: MCPError) -> dict:
+    _logger.warning(
+        "server_health probe failed",
+        extra={
+            "instance_id": instance_id,
+            "error_type": exc.error_type,
+            "error_message": exc.message,
+        },
+    )
+    return {"instance_id": instance_id, "status": "down", **exc.to_dict()}
+
+
+def _health_response(results: list[dict]) -> dict:
+    return {
+        "ready": all(result["status"] == "up" for result in results),
+        "instances": results,
+    }
+
+
+def _health_rejected(exc: MCPError) -> dict:
+    _logger.warning(
+        "server_health failed",
+        extra={"error_type": exc.error_type, "error_message": exc.message},
+    )
+    return exc.to_dict()
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from sql_mcp_server.auth import authorize
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.logging_utils import get_logger
+from sql_mcp_server.metrics import get_metrics
+
+_logger = get_logger()
+
+
+def server_metrics(api_key: str | None = None) -> dict:
+    try:
+        principal = authorize(api_key, ["r"])
+        _logger.info("server_metrics received", extra={"principal": principal.username})
+        return get_metrics().snapshot()
+    except MCPError as exc:
+        _logger.warning(
+            "server_metrics failed",
+            extra={"error_type": exc.error_type, "error_message": exc.message},
+        )
+        return exc.to_dict()
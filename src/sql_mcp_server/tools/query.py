@@ -1,36 +1,944 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import time
+from contextlib import contextmanager
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Iterable, Iterator, Sequence
 
-from sql_mcp_server.auth import authorize, ensure_scopes
+from sql_mcp_server.auth import ApiPrincipal, authorize, ensure_scopes
+from sql_mcp_server.budget import ResultBudget
+from sql_mcp_server.db.cancel import deadline, phase
+from sql_mcp_server.encoding import RowEncoder, dumps, encode_records
 from sql_mcp_server.errors import MCPError
-from sql_mcp_server.instances import get_instance_registry
+from sql_mcp_server.export import (
+    ArrowWriter,
+    CsvWriter,
+    ExportFile,
+    check_export_format,
+    export_path,
+    open_writer,
+)
+from sql_mcp_server.instances import InstanceContext, get_instance_registry
 from sql_mcp_server.logging_utils import (
     get_logger,
     get_query_logger,
     render_query_logging_metadata,
 )
+from sql_mcp_server.middleware.sql_validator import SQLValidationResult
+from sql_mcp_server.quotas import get_quota_manager
 
 _registry = get_instance_registry()
 _logger = get_logger()
 _query_logger = get_query_logger()
 
+RESULT_FORMATS = ("rows", "columnar")
+DEFAULT_PAGE_SIZE = 100
+MAX_BATCH_QUERIES = 50
+_PARAM_TYPES = (str, int, float, bool)
+
 
 def run_select(
-    query: str, instance_id: str | None = None, api_key: str | None = None
+    query: str,
+    instance_id: str | None = None,
+    api_key: str | None = None,
+    format: str = "rows",
+    page_size: int | None = None,
+    page_token: str | None = None,
+    params: list | None = None,
+    timeout_ms: int | None = None,
 ) -> dict:
-    return _execute_query(query, instance_id, expected_select=True, api_key=api_key)
+    return _execute_query(
+        query,
+        instance_id,
+        expected_select=True,
+        api_key=api_key,
+        result_format=format,
+        page_size=page_size,
+        page_token=page_token,
+        params=params,
+        timeout_ms=timeout_ms,
+    )
 
 
 def run_query(
-    query: str, instance_id: str | None = None, api_key: str | None = None
+    query: str,
+    instance_id: str | None = None,
+    api_key: str | None = None,
+    params: list | None = None,
+    timeout_ms: int | None = None,
+) -> dict:
+    return _execute_query(
+        query,
+        instance_id,
+        expected_select=False,
+        api_key=api_key,
+        params=params,
+        timeout_ms=timeout_ms,
+    )
+
+
+async def run_select_async(
+    query: str,
+    instance_id: str | None = None,
+    api_key: str | None = None,
+    format: str = "rows",
+    page_size: int | None = None,
+    page_token: str | None = None,
+    params: list | None = None,
+    timeout_ms: int | None = None,
+) -> dict:
+    return await _registry.run_tool(
+        instance_id,
+        _execute_query,
+        query,
+        instance_id,
+        expected_select=True,
+        api_key=api_key,
+        result_format=format,
+        page_size=page_size,
+        page_token=page_token,
+        params=params,
+        timeout_ms=timeout_ms,
+    )
+
+
+async def run_query_async(
+    query: str,
+    instance_id: str | None = None,
+    api_key: str | None = None,
+    params: list | None = None,
+    timeout_ms: int | None = None,
+) -> dict:
+    return await _registry.run_tool(
+        instance_id,
+        _execute_query,
+        query,
+        instance_id,
+        expected_select=False,
+        api_key=api_key,
+        params=params,
+        timeout_ms=timeout_ms,
+    )
+
+
+def run_batch(
+    queries: list,
+    api_key: str | None = None,
+    format: str = "rows",
+) -> dict:
+    """Run several SELECTs, possibly on different instances, in one call.
+
+    Each entry is a query string or ``{"query", "instance_id"?, "params"?}``.
+    The caller is authenticated once; every entry is validated and executed
+    on its own and reports either its rows or its error.
+    """
+    started = time.monotonic()
+    try:
+        principal = _start_batch(queries, api_key, format)
+    except MCPError as exc:
+        return _batch_rejected(exc, started)
+    results = [_run_batch_entry(principal, entry, format) for entry in queries]
+    return _finish_batch(principal, results, started)
+
+
+async def run_batch_async(
+    queries: list,
+    api_key: str | None = None,
+    format: str = "rows",
+) -> dict:
+    started = time.monotonic()
+    try:
+        principal = _start_batch(queries, api_key, format)
+    except MCPError as exc:
+        return _batch_rejected(exc, started)
+    # Entries run on the workers of their instance: different instances
+    # proceed in parallel, each bounded by its own DB_MAX_CONCURRENCY.
+    results = await asyncio.gather(
+        *(_dispatch_batch_entry(principal, entry, format) for entry in queries)
+    )
+    return _finish_batch(principal, list(results), started)
+
+
+def run_fanout(
+    query: str,
+    instance_ids: list[str] | None = None,
+    api_key: str | None = None,
+    params: list | None = None,
+    max_rows: int | None = None,
+    timeout: float | None = None,
+    format: str = "rows",
 ) -> dict:
-    return _execute_query(query, instance_id, expected_select=False, api_key=api_key)
+    """Run one SELECT against several instances in parallel and merge the rows.
+
+    Rows are tagged with the ``instance_id`` they came from and concatenated
+    in the order of ``instance_ids`` (every configured instance by default),
+    up to ``max_rows`` rows overall. An instance that errors or does not
+    answer within ``timeout`` seconds (its DB_QUERY_TIMEOUT by default) is
+    reported under ``instances`` without holding up the others.
+    """
+    started = time.monotonic()
+    try:
+        principal, targets = _start_fanout(instance_ids, api_key, format, max_rows)
+    except MCPError as exc:
+        return _batch_rejected(exc, started, "run_fanout")
+    limit = max_rows + 1 if max_rows is not None else None
+    futures = {}
+    results: dict[str, dict] = {}
+    for target in targets:
+        try:
+            futures[target] = _registry.executor(target).submit_cancellable(
+                _select_on_instance,
+                "run_fanout",
+                principal,
+                query,
+                target,
+                params,
+                "columnar",
+                limit,
+            )
+        except MCPError as exc:
+            results[target] = {"instance_id": target, **exc.to_dict()}
+    for target, (future, scope) in futures.items():
+        # Every instance gets its timeout measured from the start of the call.
+        wait = _fanout_timeout(target, timeout)
+        if wait is not None:
+            wait = max(wait - (time.monotonic() - started), 0.0)
+        try:
+            results[target] = future.result(timeout=wait)
+        except FutureTimeoutError:
+            future.cancel()
+            scope.cancel("timeout")
+            results[target] = _fanout_timed_out(target, timeout)
+    return _merge_fanout(principal, targets, results, max_rows, format, started)
+
+
+async def run_fanout_async(
+    query: str,
+    instance_ids: list[str] | None = None,
+    api_key: str | None = None,
+    params: list | None = None,
+    max_rows: int | None = None,
+    timeout: float | None = None,
+    format: str = "rows",
+) -> dict:
+    started = time.monotonic()
+    try:
+        principal, targets = _start_fanout(instance_ids, api_key, format, max_rows)
+    except MCPError as exc:
+        return _batch_rejected(exc, started, "run_fanout")
+    limit = max_rows + 1 if max_rows is not None else None
+
+    async def one(target: str) -> dict:
+        try:
+            return await asyncio.wait_for(
+                _registry.run(
+                    target,
+                    _select_on_instance,
+                    "run_fanout",
+                    principal,
+                    query,
+                    target,
+                    params,
+                    "columnar",
+                    limit,
+                ),
+                _fanout_timeout(target, timeout),
+            )
+        except asyncio.TimeoutError:
+            return _fanout_timed_out(target, timeout)
+
+    gathered = await asyncio.gather(*(one(target) for target in targets))
+    results = dict(zip(targets, gathered))
+    return _merge_fanout(principal, targets, results, max_rows, format, started)
+
+
+def export_query(
+    query: str,
+    file_name: str | None = None,
+    format: str = "csv",
+    instance_id: str | None = None,
+    api_key: str | None = None,
+    params: list | None = None,
+) -> dict:
+    """Write the rows of a SELECT to a file under the instance's DB_EXPORT_DIR.
+
+    ``format`` is ``csv``, ``arrow`` (Arrow IPC file) or ``parquet``. Rows
+    are streamed to the file batch by batch; the response carries the
+    file's ``path``, ``row_count``, size in ``bytes`` and ``schema`` instead
+    of the rows. DB_MAX_ROWS and DB_MAX_RESULT_BYTES do not apply, the file
+    is capped by DB_EXPORT_MAX_BYTES instead.
+    """
+    started = time.monotonic()
+    principal = None
+    try:
+        principal = authorize(api_key or os.getenv("API_KEY"), ["r"])
+        _logger.info(
+            "export_query received",
+            extra={"instance_id": instance_id or "default", "principal": principal.username},
+        )
+        check_export_format(format)
+        bound = _check_params(params)
+        context = _registry.get(instance_id)
+        validated = context.validator.validate(query, apply_limit=False)
+        ensure_scopes(principal, validated.required_scopes)
+        if not validated.is_select:
+            raise MCPError(
+                "Only SELECT statements are allowed in export_query",
+                hint="Use run_query for write operations",
+                error_type="SelectOnlyTool",
+            )
+        config = context.config
+        writer = open_writer(format)
+        sink = ExportFile(
+            export_path(config.export_dir, file_name, format, config.instance_id),
+            config.export_max_bytes,
+        )
+        try:
+            schema, row_count = _write_export(context, validated, bound, writer, sink, principal)
+            sink.publish()
+        except BaseException:
+            sink.discard()
+            raise
+    except MCPError as exc:
+        error = exc
+    except Exception as exc:
+        _logger.exception(
+            "export_query crashed",
+            extra={"instance_id": instance_id or "default"},
+        )
+        error = MCPError(str(exc) or type(exc).__name__, error_type="QueryFailed")
+    else:
+        get_quota_manager().charge(principal, rows=row_count, bytes=sink.size)
+        _query_logger.info(
+            "query succeeded",
+            extra={
+                "instance_id": config.instance_id,
+                "row_count": row_count,
+                "export_bytes": sink.size,
+                "duration_ms": round((time.monotonic() - started) * 1000, 2),
+                **render_query_logging_metadata(query),
+                "principal": principal.username,
+            },
+        )
+        return {
+            "path": str(sink.path),
+            "format": format,
+            "row_count": row_count,
+            "bytes": sink.size,
+            "schema": schema,
+            "warnings": validated.warnings,
+        }
+
+    _query_logger.warning(
+        "query failed",
+        extra={
+            "instance_id": instance_id or "default",
+            "error_type": error.error_type,
+            "error_message": error.message,
+            "duration_ms": round((time.monotonic() - started) * 1000, 2),
+            **render_query_logging_metadata(query),
+            "principal": principal.username if principal else "anonymous",
+        },
+    )
+    return error.to_dict()
+
+
+async def export_query_async(
+    query: str,
+    file_name: str | None = None,
+    format: str = "csv",
+    instance_id: str | None = None,
+    api_key: str | None = None,
+    params: list | None = None,
+) -> dict:
+    return await _registry.run_tool(
+        instance_id, export_query, query, file_name, format, instance_id, api_key, params
+    )
+
+
+def _write_export(
+    context: InstanceContext,
+    validated: SQLValidationResult,
+    bound: tuple[Any, ...],
+    writer: CsvWriter | ArrowWriter,
+    sink: ExportFile,
+    principal: ApiPrincipal,
+) -> tuple[list[list[str]], int]:
+    with _database_work(context, principal), phase("execution"):
+        if writer.bulk_csv:
+            copied = context.db.copy_csv(validated.query, bound, sink)
+            if copied is not None:
+                return copied
+        batches = context.db.iter_batches(
+            validated.query, bound, batch_size=context.config.fetch_batch_size
+        )
+        try:
+            for batch in batches:
+                writer.write(sink, batch)
+        finally:
+            batches.close()
+        writer.close()
+    return writer.schema, writer.row_count
+
+
+def _start_fanout(
+    instance_ids: Any, api_key: str | None, result_format: str, max_rows: int | None
+) -> tuple[ApiPrincipal, list[str]]:
+    principal = authorize(api_key or os.getenv("API_KEY"), ["r"])
+    if instance_ids is None:
+        targets = _registry.instance_ids()
+    elif isinstance(instance_ids, list) and all(isinstance(i, str) for i in instance_ids):
+        # Keep the caller's order, drop duplicates.
+        targets = list(dict.fromkeys(i.lower() for i in instance_ids))
+    else:
+        raise MCPError(
+            "instance_ids must be a list of instance names",
+            error_type="InvalidFanout",
+        )
+    if not targets:
+        raise MCPError(
+            "No instances to query",
+            hint="Pass instance_ids or configure MCP_INSTANCES",
+            error_type="InvalidFanout",
+        )
+    if max_rows is not None and max_rows <= 0:
+        raise MCPError("max_rows must be a positive integer", error_type="InvalidFanout")
+    _check_format(result_format)
+    # Admitted as one request; every further instance queried counts too.
+    get_quota_manager().charge(principal, requests=len(targets) - 1)
+    _logger.info(
+        "run_fanout received",
+        extra={"principal": principal.username, "instances": targets},
+    )
+    return principal, targets
+
+
+def _fanout_timeout(instance_id: str, timeout: float | None) -> float | None:
+    if timeout is not None:
+        return timeout
+    try:
+        query_timeout = _registry.config(instance_id).query_timeout
+    except MCPError:
+        # Unknown instances fail right away with their own error.
+        return None
+    return float(query_timeout) if query_timeout > 0 else None
+
+
+def _fanout_timed_out(instance_id: str, timeout: float | None) -> dict:
+    seconds = _fanout_timeout(instance_id, timeout) or 0.0
+    error = MCPError(
+        f"Instance did not answer within {seconds:g}s",
+        hint="Raise timeout, or query this instance on its own",
+        error_type="InstanceTimeout",
+    )
+    return {"instance_id": instance_id, **error.to_dict()}
+
+
+def _merge_fanout(
+    principal: ApiPrincipal,
+    targets: list[str],
+    results: dict[str, dict],
+    max_rows: int | None,
+    result_format: str,
+    started: float,
+) -> dict:
+    columns: list[str] | None = None
+    rows: list = []
+    truncated = False
+    instances: dict[str, dict] = {}
+    for target in targets:
+        result = results[target]
+        if "error_type" in result:
+            instances[target] = {k: v for k, v in result.items() if k != "instance_id"}
+            continue
+        instance_columns = list(result["columns"])
+        if result_format == "columnar" and columns is not None and instance_columns != columns:
+            instances[target] = MCPError(
+                "Result columns differ from the other instances",
+                hint="Select the same columns on every instance, or use format='rows'",
+                error_type="ColumnMismatch",
+            ).to_dict()
+            continue
+        if columns is None:
+            columns = instance_columns
+        instance_rows = result["rows"]
+        if max_rows is not None and len(rows) + len(instance_rows) > max_rows:
+            instance_rows = instance_rows[: max_rows - len(rows)]
+            truncated = True
+        instances[target] = {"row_count": len(instance_rows), "warnings": result["warnings"]}
+        if result.get("has_more") or result.get("truncated"):
+            # Cut by the instance's DB_MAX_ROWS, DB_MAX_RESULT_BYTES or
+            # DB_MAX_VALUE_BYTES.
+            truncated = True
+        if result_format == "columnar":
+            rows.extend([target, *row] for row in instance_rows)
+        else:
+            rows.extend(
+                {"instance_id": target, **dict(zip(instance_columns, row))}
+                for row in instance_rows
+            )
+
+    failed = sum(1 for info in instances.values() if "error_type" in info)
+    _logger.info(
+        "run_fanout succeeded",
+        extra={
+            "principal": principal.username,
+            "instances": targets,
+            "failed": failed,
+            "row_count": len(rows),
+            "duration_ms": round((time.monotonic() - started) * 1000, 2),
+        },
+    )
+    response: dict[str, Any] = {"rows": rows, "instances": instances, "truncated": truncated}
+    if result_format == "columnar":
+        response = {"columns": ["instance_id", *(columns or [])], **response}
+    return response
+
+
+def _start_batch(queries: Any, api_key: str | None, result_format: str) -> ApiPrincipal:
+    principal = authorize(api_key or os.getenv("API_KEY"), ["r"])
+    if not isinstance(queries, list) or not queries:
+        raise MCPError(
+            "queries must be a non-empty list",
+            hint='Pass query strings or {"query": ..., "instance_id": ..., "params": [...]}',
+            error_type="InvalidBatch",
+        )
+    if len(queries) > MAX_BATCH_QUERIES:
+        raise MCPError(
+            f"A batch may contain at most {MAX_BATCH_QUERIES} queries",
+            hint="Split the work into several run_batch calls",
+            error_type="BatchTooLarge",
+        )
+    _check_format(result_format)
+    # The batch was admitted as one request; every further query counts too.
+    get_quota_manager().charge(principal, requests=len(queries) - 1)
+    _logger.info(
+        "run_batch received",
+        extra={"principal": principal.username, "batch_size": len(queries)},
+    )
+    return principal
+
+
+def _entry_instance(entry: Any) -> str | None:
+    if isinstance(entry, dict) and isinstance(entry.get("instance_id"), str):
+        return entry["instance_id"]
+    return None
+
+
+def _parse_batch_entry(entry: Any) -> tuple[str, str | None, Any]:
+    if isinstance(entry, str):
+        return entry, None, None
+    if isinstance(entry, dict) and isinstance(entry.get("query"), str):
+        instance_id = entry.get("instance_id")
+        if instance_id is None or isinstance(instance_id, str):
+            return entry["query"], instance_id, entry.get("params")
+    raise MCPError(
+        "Batch entries must be a query string or an object with a 'query' string",
+        error_type="InvalidBatch",
+    )
+
+
+async def _dispatch_batch_entry(
+    principal: ApiPrincipal, entry: Any, result_format: str
+) -> dict:
+    instance_id = _entry_instance(entry)
+    try:
+        return await _registry.run(
+            instance_id, _run_batch_entry, principal, entry, result_format
+        )
+    except MCPError as exc:
+        # Unknown instance, rejected before dispatch.
+        return {"instance_id": instance_id or "default", **exc.to_dict()}
+
+
+def _run_batch_entry(principal: ApiPrincipal, entry: Any, result_format: str) -> dict:
+    try:
+        query, instance_id, params = _parse_batch_entry(entry)
+    except MCPError as exc:
+        return {"instance_id": _entry_instance(entry) or "default", **exc.to_dict()}
+    return _select_on_instance(
+        "run_batch", principal, query, instance_id, params, result_format
+    )
+
+
+def _select_on_instance(
+    tool_name: str,
+    principal: ApiPrincipal,
+    query: str,
+    instance_id: str | None,
+    params: Any,
+    result_format: str,
+    limit: int | None = None,
+) -> dict:
+    """Validate and run one SELECT for a multi-query tool.
+
+    The caller is already authenticated. Returns the instance's response, or
+    its error as a dict, so one failing query never fails the whole call.
+    """
+    started = time.monotonic()
+    try:
+        bound = _check_params(params)
+        context = _registry.get(instance_id)
+        validated = context.validator.validate(query)
+        ensure_scopes(principal, validated.required_scopes)
+        if not validated.is_select:
+            raise MCPError(
+                f"Only SELECT statements are allowed in {tool_name}",
+                hint="Use run_query for write operations",
+                error_type="SelectOnlyTool",
+            )
+        budget = _result_budget(context, result_format)
+        columns, rows, _, has_more = _read_rows(
+            context,
+            validated,
+            bound,
+            result_format,
+            limit=limit,
+            principal=principal,
+            budget=budget,
+        )
+    except MCPError as exc:
+        error = exc
+    except Exception as exc:
+        _logger.exception(
+            f"{tool_name} query crashed",
+            extra={"instance_id": instance_id or "default", "principal": principal.username},
+        )
+        error = MCPError(str(exc) or type(exc).__name__, error_type="QueryFailed")
+    else:
+        _charge_result(principal, rows, budget)
+        _query_logger.info(
+            "query succeeded",
+            extra={
+                "instance_id": context.config.instance_id,
+                "row_count": len(rows),
+                "duration_ms": round((time.monotonic() - started) * 1000, 2),
+                **render_query_logging_metadata(query),
+                "principal": principal.username,
+            },
+        )
+        response = _build_response(
+            columns, rows, validated.warnings, result_format, budget, has_more=has_more
+        )
+        return {"instance_id": context.config.instance_id, **response}
+
+    _query_logger.warning(
+        "query failed",
+        extra={
+            "instance_id": instance_id or "default",
+            "error_type": error.error_type,
+            "error_message": error.message,
+            "duration_ms": round((time.monotonic() - started) * 1000, 2),
+            **render_query_logging_metadata(query),
+            "principal": principal.username,
+        },
+    )
+    return {"instance_id": instance_id or "default", **error.to_dict()}
+
+
+def _finish_batch(principal: ApiPrincipal, results: list[dict], started: float) -> dict:
+    failed = sum(1 for result in results if "error_type" in result)
+    _logger.info(
+        "run_batch succeeded",
+        extra={
+            "principal": principal.username,
+            "batch_size": len(results),
+            "failed": failed,
+            "duration_ms": round((time.monotonic() - started) * 1000, 2),
+        },
+    )
+    return {"results": results, "succeeded": len(results) - failed, "failed": failed}
+
+
+def _batch_rejected(exc: MCPError, started: float, tool_name: str = "run_batch") -> dict:
+    _logger.warning(
+        f"{tool_name} failed",
+        extra={
+            "error_type": exc.error_type,
+            "error_message": exc.message,
+            "duration_ms": round((time.monotonic() - started) * 1000, 2),
+        },
+    )
+    return exc.to_dict()
+
+
+def _shape_rows(
+    columns: Sequence[str], rows: Iterable[Sequence[Any]], result_format: str
+) -> list:
+    if result_format == "columnar":
+        # Positional rows straight from the cursor: column names are sent
+        # once instead of once per row.
+        return [list(row) for row in rows]
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def _check_format(result_format: str) -> None:
+    if result_format not in RESULT_FORMATS:
+        raise MCPError(
+            f"Unsupported result format: {result_format}",
+            hint=f"Use one of: {', '.join(RESULT_FORMATS)}",
+            error_type="InvalidFormat",
+        )
+
+
+def _build_response(
+    columns: Sequence[str],
+    rows: list,
+    warnings: list[str],
+    result_format: str,
+    budget: ResultBudget | None = None,
+    *,
+    has_more: bool | None = None,
+) -> dict:
+    if has_more:
+        warnings = [
+            *warnings,
+            f"Only the first {len(rows)} rows were returned (DB_MAX_ROWS); more rows exist",
+        ]
+    if result_format == "columnar":
+        response = {"columns": list(columns), "rows": rows, "warnings": warnings}
+    else:
+        response = {"rows": rows, "warnings": warnings}
+    if has_more is not None:
+        response["has_more"] = has_more
+    if budget is not None and budget.enabled:
+        response.update(budget.report())
+        if budget.exhausted:
+            # Rows were left out to stay within DB_MAX_RESULT_BYTES.
+            response["has_more"] = True
+    return response
+
+
+def _result_budget(
+    context: InstanceContext, result_format: str, *, paged: bool = False
+) -> ResultBudget:
+    # A page cannot drop rows without its next token skipping them; pages
+    # are bounded by page_size and only get their values capped.
+    max_bytes = 0 if paged else context.config.max_result_bytes
+    return ResultBudget(max_bytes, context.config.max_value_bytes, result_format)
+
+
+def _read_rows(
+    context: InstanceContext,
+    validated: SQLValidationResult,
+    bound: tuple[Any, ...],
+    result_format: str,
+    *,
+    limit: int | None = None,
+    principal: ApiPrincipal | None = None,
+    budget: ResultBudget | None = None,
+) -> tuple[Sequence[str], list, str | None, bool]:
+    """Run a validated SELECT through the result cache.
+
+    Returns ``(columns, rows, cache, has_more)``. At most ``DB_MAX_ROWS``
+    rows are returned; one more is fetched so ``has_more`` tells whether the
+    result was cut, and nothing past it. ``limit`` stops the stream earlier,
+    and a ``budget`` as soon as the next row does not fit. Only cache misses
+    wait for a scheduler slot.
+    """
+
+    budget = budget or ResultBudget(0, 0)
+    max_rows = context.config.max_rows
+    if max_rows > 0:
+        limit = max_rows + 1 if limit is None else min(limit, max_rows + 1)
+
+    cache = context.result_cache
+    # Results cut at ``limit`` are cached as such, under their own key.
+    cache_key = (validated.query, bound, limit) if bound or limit else validated.query
+    cached = cache.get(cache_key)
+    if cached is not None:
+        # Cached values were already capped with the instance's budget.
+        budget.values_truncated += cached.values_truncated
+        cached_rows = budget.fit(cached.columns, cached.rows)
+        rows, has_more = _cap_rows(
+            _shape_rows(cached.columns, cached_rows, result_format), max_rows
+        )
+        return cached.columns, rows, "hit", has_more
+
+    batch_size = context.config.fetch_batch_size
+    if limit is not None:
+        batch_size = min(batch_size, limit)
+    # When the query itself cannot return more than ``limit`` rows, reading
+    # the stream to its end costs one empty fetch, while stopping early would
+    # make some drivers drain or drop the connection.
+    bounded = validated.row_limit is not None and limit is not None and (
+        validated.row_limit <= limit
+    )
+    columns: Sequence[str] = []
+    rows: list = []
+    fetched: list[Sequence[Any]] | None = [] if cache.enabled else None
+    generation = cache.generation(validated.tables) if cache.enabled else None
+    encoder: RowEncoder | None = None
+    with _database_work(context, principal):
+        batches = context.db.iter_batches(
+            validated.query, bound, batch_size=batch_size, row_limit=validated.row_limit
+        )
+        with phase("execution"):
+            try:
+                for batch in batches:
+                    columns = batch.columns
+                    if encoder is None:
+                        encoder = RowEncoder(len(columns), batch.kinds)
+                    batch_rows = batch.rows
+                    if limit is not None and len(rows) + len(batch_rows) >= limit:
+                        batch_rows = batch_rows[: limit - len(rows)]
+                    with phase("serialization"):
+                        # Capped and converted once; the cache keeps the
+                        # converted rows.
+                        batch_rows = encoder.convert(budget.cap_values(batch_rows))
+                        kept = budget.fit(columns, batch_rows)
+                        rows.extend(_shape_rows(columns, kept, result_format))
+                    if budget.exhausted:
+                        # Closing the stream below stops the fetch.
+                        fetched = None
+                        break
+                    if fetched is not None:
+                        fetched.extend(batch_rows)
+                    if limit is not None and len(rows) >= limit and not bounded:
+                        break
+            finally:
+                batches.close()
+    if fetched is not None:
+        cache.put(
+            cache_key,
+            columns,
+            fetched,
+            validated.tables,
+            generation,
+            values_truncated=budget.values_truncated,
+        )
+    rows, has_more = _cap_rows(rows, max_rows)
+    return columns, rows, "miss" if cache.enabled else None, has_more
+
+
+def _cap_rows(rows: list, max_rows: int) -> tuple[list, bool]:
+    if 0 < max_rows < len(rows):
+        return rows[:max_rows], True
+    return rows, False
+
+
+@contextmanager
+def _database_work(context: InstanceContext, principal: ApiPrincipal | None) -> Iterator[None]:
+    """Admit ``principal``'s database work and charge its time to their quota."""
+    if context.scheduler is not None:
+        username = principal.username if principal else "anonymous"
+        with context.scheduler.slot(username), _database_time(principal):
+            yield
+        return
+    with _database_time(principal):
+        yield
+
+
+@contextmanager
+def _database_time(principal: ApiPrincipal | None) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if principal is not None:
+            get_quota_manager().charge(principal, db_seconds=time.perf_counter() - started)
+
+
+def _charge_result(
+    principal: ApiPrincipal, rows: list, budget: ResultBudget | None = None
+) -> None:
+    quotas = get_quota_manager()
+    if budget is not None and budget.enabled:
+        # Already measured while the rows were fetched.
+        size = budget.used
+    elif quotas.limits_bytes(principal):
+        # Measuring the payload costs an extra encode; only pay it when limited.
+        size = len(dumps(rows))
+    else:
+        size = 0
+    quotas.charge(principal, rows=len(rows), bytes=size)
+
+
+def _check_params(params: Any) -> tuple[Any, ...]:
+    if params is None:
+        return ()
+    if not isinstance(params, (list, tuple)) or not all(
+        value is None or isinstance(value, _PARAM_TYPES) for value in params
+    ):
+        raise MCPError(
+            "params must be a list of scalar values",
+            hint="Bind strings, numbers, booleans or null with the driver's placeholder style",
+            error_type="InvalidParams",
+        )
+    return tuple(params)
+
+
+def _resolve_page_size(page_size: int | None, max_rows: int) -> int:
+    if page_size is None:
+        return max_rows if max_rows > 0 else DEFAULT_PAGE_SIZE
+    if page_size <= 0:
+        raise MCPError(
+            "page_size must be a positive integer",
+            error_type="InvalidPagination",
+        )
+    return min(page_size, max_rows) if max_rows > 0 else page_size
+
+
+def _resolve_budget(instance_id: str | None, timeout_ms: Any) -> float | None:
+    """Seconds the call may take, capped by the instance's statement timeout."""
+    if timeout_ms is None:
+        return None
+    if isinstance(timeout_ms, bool) or not isinstance(timeout_ms, int) or timeout_ms <= 0:
+        raise MCPError(
+            "timeout_ms must be a positive integer",
+            hint="Pass the number of milliseconds the call may take",
+            error_type="InvalidTimeout",
+        )
+    try:
+        ceiling = _registry.config(instance_id).statement_timeout_ms
+    except MCPError:
+        # Unknown instances are reported by the call itself.
+        ceiling = 0
+    if ceiling > 0:
+        timeout_ms = min(timeout_ms, ceiling)
+    return timeout_ms / 1000
 
 
 def _execute_query(
-    query: str, instance_id: str | None, expected_select: bool, api_key: str | None
+    query: str,
+    instance_id: str | None,
+    expected_select: bool,
+    api_key: str | None,
+    *,
+    timeout_ms: int | None = None,
+    **options: Any,
+) -> dict:
+    """Run one statement, within ``timeout_ms`` when given.
+
+    The budget covers pool checkout, validation, execution and shaping the
+    result; the response then reports how much of it each phase used under
+    ``timing``.
+    """
+    try:
+        budget = _resolve_budget(instance_id, timeout_ms)
+    except MCPError as exc:
+        return _batch_rejected(
+            exc, time.monotonic(), "run_select" if expected_select else "run_query"
+        )
+    with deadline(budget) as scope:
+        response = _run_statement(query, instance_id, expected_select, api_key, **options)
+        if budget is not None:
+            response["timing"] = scope.timing()
+    return response
+
+
+def _run_statement(
+    query: str,
+    instance_id: str | None,
+    expected_select: bool,
+    api_key: str | None,
+    *,
+    result_format: str = "rows",
+    page_size: int | None = None,
+    page_token: str | None = None,
+    params: Sequence[Any] | None = None,
 ) -> dict:
     started = time.monotonic()
     tool_name = "run_select" if expected_select else "run_query"
@@ -52,8 +960,13 @@ def _execute_query(
                 **render_query_logging_metadata(query),
             },
         )
+        _check_format(result_format)
+        bound = _check_params(params)
+        paginate = page_size is not None or page_token is not None
         context = _registry.get(instance_id)
-        validated = context.validator.validate(query)
+        # Paged reads are bounded by the page size instead of a LIMIT clause.
+        with phase("validation"):
+            validated = context.validator.validate(query, apply_limit=not paginate)
         ensure_scopes(principal, validated.required_scopes)
         if expected_select and not validated.is_select:
             raise MCPError(
@@ -61,14 +974,52 @@ def _execute_query(
                 hint="Use run_query for write operations",
                 error_type="SelectOnlyTool",
             )
-        rows = context.db.execute(validated.query)
-        response = {"rows": rows, "warnings": validated.warnings}
+        columns: Sequence[str] = []
+        next_page_token = None
+        cache_status = None
+        has_more = None
+        budget = _result_budget(context, result_format, paged=paginate)
+        if paginate:
+            with _database_work(context, principal), phase("execution"):
+                page = context.paginator.fetch(
+                    validated.query,
+                    _resolve_page_size(page_size, context.config.max_rows),
+                    page_token,
+                    principal.username,
+                    params=bound,
+                    tables=validated.tables,
+                )
+            columns = page.columns
+            next_page_token = page.next_token
+            with phase("serialization"):
+                page_rows = RowEncoder(len(columns)).convert(budget.cap_values(page.rows))
+                rows = _shape_rows(columns, budget.fit(columns, page_rows), result_format)
+        elif validated.is_select:
+            columns, rows, cache_status, has_more = _read_rows(
+                context, validated, bound, result_format, principal=principal, budget=budget
+            )
+        else:
+            with _database_work(context, principal), phase("execution"):
+                rows = context.db.execute(validated.query, bound)
+            rows = encode_records(rows)
+            # Unknown write targets (empty table set) clear the whole cache.
+            context.result_cache.invalidate(validated.tables or None)
+            if validated.is_ddl:
+                context.catalog.invalidate()
+        with phase("serialization"):
+            response = _build_response(
+                columns, rows, validated.warnings, result_format, budget, has_more=has_more
+            )
+        _charge_result(principal, rows, budget)
+        if paginate:
+            response["next_page_token"] = next_page_token
         _logger.info(
             f"{tool_name} succeeded",
             extra={
                 "instance_id": context.config.instance_id,
                 "row_count": len(rows),
                 "warnings": validated.warnings,
+                "cache": cache_status,
                 "duration_ms": round((time.monotonic() - started) * 1000, 2),
                 "principal": principal.username,
             },
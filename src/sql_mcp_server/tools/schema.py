@@ -20,9 +20,7 @@ def _normalize_table(table: str) -> str:
     return normalized
 
 
-def _assert_table_allowed(
-    table: str, context: InstanceContext, known_tables: list[str] | None = None
-) -> str:
+def _assert_table_allowed(table: str, context: InstanceContext) -> str:
     normalized = _normalize_table(table)
     lower_normalized = normalized.lower()
 
@@ -34,15 +32,18 @@ def _assert_table_allowed(
             error_type="TableNotAllowed",
         )
 
-    catalog = {t.lower(): t for t in (known_tables or [])}
-    if catalog and lower_normalized not in catalog:
+    resolved = context.catalog.resolve(lower_normalized)
+    if resolved is None:
+        if not context.catalog.tables():
+            # Nothing to check against (e.g. tables outside the listed schema).
+            return normalized
         raise MCPError(
             f"Unknown table: {normalized}",
             hint="Call list_tables to discover available tables",
             error_type="UnknownTable",
         )
 
-    return catalog.get(lower_normalized, normalized)
+    return resolved
 
 
 def list_tables(instance_id: str | None = None, api_key: str | None = None) -> dict:
@@ -56,7 +57,7 @@ def list_tables(instance_id: str | None = None, api_key: str | None = None) -> d
             },
         )
         context = _registry.get(instance_id)
-        tables = context.db.list_tables()
+        tables = context.catalog.tables()
         _logger.info(
             "list_tables succeeded",
             extra={
@@ -93,9 +94,8 @@ def describe_table(
             },
         )
         context = _registry.get(instance_id)
-        table_names = context.db.list_tables()
-        normalized = _assert_table_allowed(table, context, table_names)
-        columns = context.db.describe_table(normalized)
+        normalized = _assert_table_allowed(table, context)
+        columns = context.catalog.columns(normalized)
         _logger.info(
             "describe_table succeeded",
             extra={
@@ -118,3 +118,103 @@ def describe_table(
             },
         )
         return exc.to_dict()
+
+
+def describe_schema(
+    instance_id: str | None = None, include_keys: bool = False, api_key: str | None = None
+) -> dict:
+    try:
+        principal = authorize(api_key, ["r"])
+        _logger.info(
+            "describe_schema received",
+            extra={
+                "instance_id": instance_id or "default",
+                "include_keys": include_keys,
+                "principal": principal.username,
+            },
+        )
+        context = _registry.get(instance_id)
+        schema = context.catalog.schema(include_keys)
+        allowed = context.config.allowed_tables
+        if allowed:
+            schema = {name: spec for name, spec in schema.items() if name.lower() in allowed}
+        _logger.info(
+            "describe_schema succeeded",
+            extra={
+                "instance_id": context.config.instance_id,
+                "table_count": len(schema),
+                "principal": principal.username,
+            },
+        )
+        return {"tables": schema}
+    except MCPError as exc:
+        _logger.warning(
+            "describe_schema failed",
+            extra={
+                "instance_id": instance_id or "default",
+                "principal": principal.username if 'principal' in locals() else "anonymous",
+                "error_type": exc.error_type,
+                "error_message": exc.message,
+            },
+        )
+        return exc.to_dict()
+
+
+def refresh_schema(instance_id: str | None = None, api_key: str | None = None) -> dict:
+    try:
+        principal = authorize(api_key, ["r"])
+        _logger.info(
+            "refresh_schema received",
+            extra={
+                "instance_id": instance_id or "default",
+                "principal": principal.username,
+            },
+        )
+        context = _registry.get(instance_id)
+        table_count = context.catalog.refresh()
+        _logger.info(
+            "refresh_schema succeeded",
+            extra={
+                "instance_id": context.config.instance_id,
+                "table_count": table_count,
+                "principal": principal.username,
+            },
+        )
+        return {"table_count": table_count}
+    except MCPError as exc:
+        _logger.warning(
+            "refresh_schema failed",
+            extra={
+                "instance_id": instance_id or "default",
+                "principal": principal.username if 'principal' in locals() else "anonymous",
+                "error_type": exc.error_type,
+                "error_message": exc.message,
+            },
+        )
+        return exc.to_dict()
+
+
+async def list_tables_async(
+    instance_id: str | None = None, api_key: str | None = None
+) -> dict:
+    return await _registry.run_tool(instance_id, list_tables, instance_id, api_key)
+
+
+async def describe_table_async(
+    table: str, instance_id: str | None = None, api_key: str | None = None
+) -> dict:
+    return await _registry.run_tool(instance_id, describe_table, table, instance_id, api_key)
+
+
+async def describe_schema_async(
+    instance_id: str | None = None, include_keys: bool = False, api_key: str | None = None
+) -> dict:
+    return await _registry.run_tool(
+        instance_id, describe_schema, instance_id, include_keys, api_key
+    )
+
+
+async def refresh_schema_async(
+    instance_id: str | None = None, api_key: str | None = None
+) -> dict:
+    return await _registry.run_tool(instance_id, refresh_schema, instance_id, api_key)
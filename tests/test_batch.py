@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sql_mcp_server import auth, quotas
+from sql_mcp_server.auth import AuthManager
+from sql_mcp_server.instances import InstanceRegistry
+from sql_mcp_server.quotas import QuotaManager
+from sql_mcp_server.tools import query as query_tools
+
+
+class RunBatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        env = {"MCP_INSTANCES": "SALES,HR"}
+        for name, rows in (("sales", ["north", "south"]), ("hr", ["ada"])):
+            path = Path(self._tmp.name) / f"{name}.db"
+            with sqlite3.connect(path) as conn:
+                conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+                conn.executemany("INSERT INTO items (name) VALUES (?)", [(r,) for r in rows])
+            env[f"{name.upper()}_DB_PROVIDER"] = "sqlite"
+            env[f"{name.upper()}_SQLITE_PATH"] = str(path)
+        with mock.patch.dict(os.environ, env):
+            self.registry = InstanceRegistry()
+        for patcher in (
+            mock.patch.object(query_tools, "_registry", self.registry),
+            mock.patch.object(auth, "_auth_manager", AuthManager("alice:tok:r:requests=5")),
+            mock.patch.object(quotas, "_quota_manager", QuotaManager()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.registry.shutdown()
+        self._tmp.cleanup()
+
+    def test_entries_run_on_their_own_instances(self) -> None:
+        queries = [
+            {"query": "SELECT name FROM items ORDER BY id", "instance_id": "sales"},
+            {"query": "SELECT name FROM items WHERE id = ?", "instance_id": "hr", "params": [1]},
+        ]
+
+        for result in (
+            query_tools.run_batch(queries, api_key="tok"),
+            asyncio.run(query_tools.run_batch_async(queries, api_key="tok")),
+        ):
+            self.assertEqual((result["succeeded"], result["failed"]), (2, 0))
+            self.assertEqual(
+                [(r["instance_id"], r["rows"]) for r in result["results"]],
+                [("sales", [{"name": "north"}, {"name": "south"}]), ("hr", [{"name": "ada"}])],
+            )
+
+    def test_failing_entry_does_not_fail_the_others(self) -> None:
+        result = query_tools.run_batch(
+            [
+                {"query": "SELECT name FROM items WHERE id = 1", "instance_id": "sales"},
+                {"query": "SELECT nope FROM missing", "instance_id": "sales"},
+                {"query": "DELETE FROM items", "instance_id": "hr"},
+                {"query": "SELECT name FROM items", "instance_id": "nowhere"},
+                42,
+            ],
+            api_key="tok",
+        )
+
+        self.assertEqual((result["succeeded"], result["failed"]), (1, 4))
+        first, missing, write, unknown, invalid = result["results"]
+        self.assertEqual(first["rows"], [{"name": "north"}])
+        self.assertEqual(missing["error_type"], "QueryFailed")
+        self.assertEqual(write["error_type"], "ReadOnlyViolation")
+        self.assertEqual(unknown["instance_id"], "nowhere")
+        self.assertIn("error_type", unknown)
+        self.assertEqual(invalid["error_type"], "InvalidBatch")
+
+    def test_batch_size_is_limited(self) -> None:
+        too_many = ["SELECT 1"] * (query_tools.MAX_BATCH_QUERIES + 1)
+
+        self.assertEqual(
+            query_tools.run_batch(too_many, api_key="tok")["error_type"], "BatchTooLarge"
+        )
+        self.assertEqual(query_tools.run_batch([], api_key="tok")["error_type"], "InvalidBatch")
+
+    def test_admitted_once_and_charged_per_query(self) -> None:
+        queries = [{"query": "SELECT 1", "instance_id": "sales"}] * 3
+
+        with mock.patch.object(
+            query_tools, "authorize", wraps=query_tools.authorize
+        ) as authorize:
+            first = query_tools.run_batch(queries, api_key="tok")
+        self.assertEqual(authorize.call_count, 1)
+        self.assertEqual(first["succeeded"], 3)
+        # 3 of the 5 requests are used; the next batch is admitted and
+        # overdraws the bucket, so the call after it is refused.
+        self.assertEqual(query_tools.run_batch(queries, api_key="tok")["succeeded"], 3)
+
+        refused = query_tools.run_batch(queries, api_key="tok")
+
+        self.assertEqual(refused["error_type"], "QuotaExceeded")
+
+
+if __name__ == "__main__":
+    unittest.main()
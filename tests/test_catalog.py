@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from typing import Any
+
+from sql_mcp_server.catalog import SchemaCatalog
+
+
+class _CountingClient:
+    def __init__(self) -> None:
+        self.tables = ["Users", "orders"]
+        self.list_calls = 0
+        self.describe_calls = 0
+        self.slow_table: str | None = None
+        self.slow_started = threading.Event()
+        self.release = threading.Event()
+
+    def list_tables(self) -> list[str]:
+        self.list_calls += 1
+        return list(self.tables)
+
+    def describe_table(self, table: str) -> list[dict[str, Any]]:
+        self.describe_calls += 1
+        if table == self.slow_table:
+            self.slow_started.set()
+            self.release.wait(timeout=2)
+        return [{"name": "id", "type": "INTEGER", "table": table}]
+
+
+class SchemaCatalogTests(unittest.TestCase):
+    def test_lookups_reuse_the_loaded_catalog(self) -> None:
+        client = _CountingClient()
+        catalog = SchemaCatalog(client, "default", ttl=60)
+
+        for _ in range(10):
+            self.assertEqual(catalog.resolve("users"), "Users")
+            catalog.columns("Users")
+        self.assertIsNone(catalog.resolve("missing"))
+
+        self.assertEqual(client.list_calls, 1)
+        self.assertEqual(client.describe_calls, 1)
+
+    def test_invalidate_reloads_tables_and_columns(self) -> None:
+        client = _CountingClient()
+        catalog = SchemaCatalog(client, "default", ttl=60)
+        catalog.columns("Users")
+
+        client.tables.append("invoices")
+        catalog.invalidate()
+
+        self.assertEqual(catalog.resolve("INVOICES"), "invoices")
+        catalog.columns("Users")
+        self.assertEqual(client.list_calls, 2)
+        self.assertEqual(client.describe_calls, 2)
+
+    def test_ttl_expiry_triggers_reload(self) -> None:
+        client = _CountingClient()
+        catalog = SchemaCatalog(client, "default", ttl=0.01)
+        catalog.tables()
+
+        time.sleep(0.02)
+        catalog.tables()
+
+        self.assertEqual(client.list_calls, 2)
+
+    def test_zero_ttl_disables_caching(self) -> None:
+        client = _CountingClient()
+        catalog = SchemaCatalog(client, "default", ttl=0)
+
+        catalog.tables()
+        catalog.tables()
+
+        self.assertEqual(client.list_calls, 2)
+
+    def test_slow_load_blocks_only_callers_of_the_same_entry(self) -> None:
+        client = _CountingClient()
+        client.slow_table = "Users"
+        catalog = SchemaCatalog(client, "default", ttl=60)
+        threads = [threading.Thread(target=catalog.columns, args=("Users",)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        self.assertTrue(client.slow_started.wait(timeout=2))
+
+        # Runs while the Users lookup is still waiting on the database.
+        self.assertEqual(catalog.resolve("orders"), "orders")
+        self.assertEqual(catalog.columns("orders")[0]["table"], "orders")
+        self.assertEqual(client.describe_calls, 2)
+
+        client.release.set()
+        for thread in threads:
+            thread.join(timeout=2)
+        self.assertEqual(client.describe_calls, 2)
+        self.assertEqual(client.list_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
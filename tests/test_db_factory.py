@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+from sql_mcp_server.config import ServerConfig
+from sql_mcp_server.db import factory
+from sql_mcp_server.db.sqlite import SQLiteClient
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# Generous on purpose: the budget catches a driver sneaking back into the
+# import path, not small regressions.
+IMPORT_BUDGET_US = 1_500_000
+
+
+def _make_config(**overrides) -> ServerConfig:
+    base = dict(
+        instance_id="default",
+        provider="sqlite",
+        host=None,
+        port=None,
+        user=None,
+        password=None,
+        database=None,
+        sqlite_path=":memory:",
+        read_only=False,
+        max_rows=100,
+        query_timeout=10,
+        statement_timeout_ms=10_000,
+        allowed_tables=set(),
+        server_name="sql-mcp-server",
+        mssql_odbc_driver=None,
+        mssql_trust_server_certificate=False,
+        allow_alter=False,
+        allow_drop=False,
+    )
+    base.update(overrides)
+    return ServerConfig(**base)
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    return subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=str(SRC_DIR.parent),
+        timeout=60,
+        check=True,
+    )
+
+
+class LazyDriverImportTests(unittest.TestCase):
+    def test_sqlite_instance_does_not_import_other_drivers(self) -> None:
+        script = (
+            "import sys\n"
+            "from sql_mcp_server.config import load_config\n"
+            "import sql_mcp_server.instances\n"
+            "from sql_mcp_server.db.factory import create_db_client\n"
+            "config = load_config(env={'DB_PROVIDER': 'sqlite', 'SQLITE_PATH': ':memory:'})\n"
+            "create_db_client(config).close()\n"
+            "print(','.join(m for m in ('psycopg2', 'pymysql', 'pyodbc') if m in sys.modules))\n"
+        )
+        result = _run_python("-c", script)
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_import_time_budget(self) -> None:
+        result = _run_python("-X", "importtime", "-c", "import sql_mcp_server.instances")
+        match = re.search(
+            r"^import time:\s*\d+ \|\s*(\d+) \|\s*sql_mcp_server\.instances$",
+            result.stderr,
+            re.MULTILINE,
+        )
+        self.assertIsNotNone(match, result.stderr[-2000:])
+        self.assertLess(int(match.group(1)), IMPORT_BUDGET_US)
+
+
+class ProviderRegistryTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        factory._providers.pop("custom", None)
+
+    def test_registered_factory_is_used(self) -> None:
+        created: list[ServerConfig] = []
+
+        def build(config: ServerConfig) -> SQLiteClient:
+            created.append(config)
+            return SQLiteClient(config)
+
+        factory.register_provider("Custom", build)
+        config = _make_config(provider="custom")
+        client = factory.create_db_client(config)
+        try:
+            self.assertIsInstance(client, SQLiteClient)
+            self.assertEqual(created, [config])
+            self.assertIn("custom", factory.available_providers())
+        finally:
+            client.close()
+
+    def test_module_reference_is_resolved_on_first_use(self) -> None:
+        factory.register_provider("custom", "sql_mcp_server.db.sqlite:SQLiteClient")
+        client = factory.create_db_client(_make_config(provider="custom"))
+        client.close()
+        self.assertIsInstance(client, SQLiteClient)
+
+    def test_unimportable_driver_is_reported(self) -> None:
+        factory.register_provider("custom", "sql_mcp_server_missing_driver:Client")
+        with self.assertRaisesRegex(RuntimeError, "could not be imported"):
+            factory.create_db_client(_make_config(provider="custom"))
+
+    def test_unknown_provider_raises(self) -> None:
+        with self.assertRaisesRegex(RuntimeError, "Unsupported DB_PROVIDER"):
+            factory.create_db_client(_make_config(provider="nope"))
+
+    def test_credentials_are_checked_before_import(self) -> None:
+        factory.register_provider(
+            "custom", "sql_mcp_server_missing_driver:Client", requires_credentials=True
+        )
+        with self.assertRaisesRegex(RuntimeError, "DB_HOST"):
+            factory.create_db_client(_make_config(provider="custom"))
+
+
+if __name__ == "__main__":
+    unittest.main()
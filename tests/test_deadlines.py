@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sql_mcp_server.instances import InstanceRegistry
+from sql_mcp_server.tools import query as query_tools
+
+_SLOW_QUERY = (
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+    "SELECT count(*) AS c FROM n"
+)
+
+
+class RequestDeadlineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        path = Path(self._tmp.name) / "deadline.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            conn.executemany("INSERT INTO items (name) VALUES (?)", [("a",), ("b",)])
+        env = {
+            "MCP_INSTANCES": "FAST,CAPPED",
+            "FAST_DB_PROVIDER": "sqlite",
+            "FAST_SQLITE_PATH": str(path),
+            "FAST_SQLITE_READERS": "1",
+            "FAST_DB_STATEMENT_TIMEOUT_MS": "60000",
+            "CAPPED_DB_PROVIDER": "sqlite",
+            "CAPPED_SQLITE_PATH": str(path),
+            "CAPPED_DB_STATEMENT_TIMEOUT_MS": "300",
+        }
+        with mock.patch.dict(os.environ, env):
+            self.registry = InstanceRegistry()
+        patcher = mock.patch.object(query_tools, "_registry", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.registry.shutdown()
+        self._tmp.cleanup()
+
+    def test_timing_reports_each_phase(self) -> None:
+        result = query_tools.run_select(
+            "SELECT name FROM items ORDER BY id", instance_id="fast", timeout_ms=5000
+        )
+
+        self.assertEqual(result["rows"], [{"name": "a"}, {"name": "b"}])
+        timing = result["timing"]
+        self.assertEqual(timing["budget_ms"], 5000)
+        for name in ("checkout_ms", "validation_ms", "execution_ms", "serialization_ms"):
+            self.assertGreaterEqual(timing[name], 0, name)
+        self.assertLessEqual(timing["remaining_ms"], 5000)
+
+    def test_no_timing_without_deadline(self) -> None:
+        result = query_tools.run_select("SELECT name FROM items", instance_id="fast")
+
+        self.assertNotIn("timing", result)
+
+    def test_slow_statement_is_stopped_at_deadline(self) -> None:
+        started = time.monotonic()
+        result = query_tools.run_select(_SLOW_QUERY, instance_id="fast", timeout_ms=200)
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(result["error_type"], "DeadlineExceeded")
+        self.assertEqual(result["timing"]["remaining_ms"], 0)
+        # The instance keeps serving calls afterwards.
+        self.assertIn("rows", query_tools.run_select("SELECT 1 AS one", instance_id="fast"))
+
+    def test_budget_is_capped_by_instance_statement_timeout(self) -> None:
+        result = query_tools.run_select(
+            "SELECT name FROM items", instance_id="capped", timeout_ms=60_000
+        )
+
+        self.assertEqual(result["timing"]["budget_ms"], 300)
+
+    def test_invalid_timeout_is_rejected(self) -> None:
+        result = query_tools.run_query("DELETE FROM items", instance_id="fast", timeout_ms=0)
+
+        self.assertEqual(result["error_type"], "InvalidTimeout")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import datetime as dt
+import decimal
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+from unittest import mock
+
+from sql_mcp_server import encoding
+from sql_mcp_server.db.base import iter_cursor_batches
+from sql_mcp_server.encoding import (
+    DATETIME,
+    DECIMAL,
+    PLAIN,
+    RowEncoder,
+    convert_value,
+    dumps,
+    encode_records,
+)
+from sql_mcp_server.instances import InstanceRegistry
+from sql_mcp_server.tools import query as query_tools
+
+_ID = uuid.UUID("12345678-1234-5678-1234-567812345678")
+
+
+class _Cursor:
+    description = (("id", 23), ("price", 1700), ("seen", 1114))
+
+    def __init__(self, rows) -> None:
+        self._rows = list(rows)
+
+    def fetchmany(self, size):
+        batch, self._rows = self._rows[:size], self._rows[size:]
+        return batch
+
+
+class ConvertValueTests(unittest.TestCase):
+    def test_driver_types_become_json_native(self) -> None:
+        cases = [
+            (decimal.Decimal("12.50"), "12.50"),
+            (dt.datetime(2024, 5, 1, 8, 30, tzinfo=dt.timezone.utc), "2024-05-01T08:30:00+00:00"),
+            (dt.date(2024, 5, 1), "2024-05-01"),
+            (dt.time(8, 30), "08:30:00"),
+            (dt.timedelta(hours=12, minutes=5), "12:05:00"),
+            (_ID, str(_ID)),
+            (b"\x00\x01", "AAE="),
+            (memoryview(b"\x00\x01"), "AAE="),
+            (float("nan"), "nan"),
+            ([decimal.Decimal("1"), None], ["1", None]),
+            ("text", "text"),
+            (7, 7),
+            (None, None),
+        ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(convert_value(value), expected)
+
+    def test_records(self) -> None:
+        self.assertEqual(
+            encode_records([{"id": 1, "price": decimal.Decimal("2.5")}]),
+            [{"id": 1, "price": "2.5"}],
+        )
+
+
+class RowEncoderTests(unittest.TestCase):
+    def test_converters_come_from_column_kinds(self) -> None:
+        encoder = RowEncoder(3, (PLAIN, DECIMAL, DATETIME))
+        rows = [(1, decimal.Decimal("9.99"), dt.datetime(2024, 1, 2, 3, 4, 5)), (2, None, None)]
+
+        self.assertEqual(
+            encoder.convert(rows),
+            [(1, "9.99", "2024-01-02T03:04:05"), (2, None, None)],
+        )
+
+    def test_plain_columns_are_passed_through(self) -> None:
+        rows = [(1, "a")]
+        encoder = RowEncoder(2, (PLAIN, PLAIN))
+
+        self.assertTrue(encoder.passthrough)
+        self.assertIs(encoder.convert(rows), rows)
+
+    def test_cursor_type_codes_map_to_kinds(self) -> None:
+        kinds = {23: PLAIN, 1700: DECIMAL}
+        cursor = _Cursor([(1, decimal.Decimal("1"), None)])
+        batches = list(iter_cursor_batches(cursor, 10, None, kinds))
+
+        self.assertEqual(batches[0].kinds, (PLAIN, DECIMAL, None))
+
+
+class DumpsTests(unittest.TestCase):
+    def test_backends_agree(self) -> None:
+        value = {"rows": [[1, "é", None, 2.5, True]], "d": decimal.Decimal("1.10")}
+
+        with mock.patch.object(encoding, "orjson", None):
+            fallback = dumps(value)
+
+        self.assertEqual(json.loads(dumps(value)), json.loads(fallback))
+        self.assertEqual(json.loads(fallback)["d"], "1.10")
+
+
+class RunSelectEncodingTests(unittest.TestCase):
+    def test_blobs_are_base64(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "enc.db"
+            with sqlite3.connect(path) as conn:
+                conn.execute("CREATE TABLE files (id INTEGER PRIMARY KEY, body BLOB)")
+                conn.execute("INSERT INTO files (body) VALUES (?)", (b"\xff\x00",))
+            env = {
+                "MCP_INSTANCES": "ENC",
+                "ENC_DB_PROVIDER": "sqlite",
+                "ENC_SQLITE_PATH": str(path),
+            }
+            with mock.patch.dict(os.environ, env):
+                registry = InstanceRegistry()
+            try:
+                with mock.patch.object(query_tools, "_registry", registry):
+                    result = query_tools.run_select("SELECT body FROM files", instance_id="enc")
+            finally:
+                registry.shutdown()
+
+        self.assertEqual(result["rows"], [{"body": "/wA="}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import csv
+import importlib.util
+import os
+import sqlite3
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.export import export_path
+from sql_mcp_server.instances import InstanceRegistry
+from sql_mcp_server.tools import query as query_tools
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+class ExportPathTests(unittest.TestCase):
+    def test_names_stay_inside_the_export_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("../escape.csv", "sub/dir.csv", ".hidden", "a..csv", "/tmp/x.csv"):
+                with self.subTest(name=name):
+                    with self.assertRaises(MCPError) as ctx:
+                        export_path(tmp, name, "csv", "main")
+                    self.assertEqual(ctx.exception.error_type, "InvalidExportPath")
+
+            self.assertEqual(export_path(tmp, "orders", "parquet", "main").name, "orders.parquet")
+            generated = export_path(tmp, None, "csv", "main")
+            self.assertTrue(generated.name.startswith("main-"))
+            self.assertEqual(generated.parent, Path(tmp))
+
+    def test_disabled_without_directory(self) -> None:
+        with self.assertRaises(MCPError) as ctx:
+            export_path(None, "orders.csv", "csv", "main")
+        self.assertEqual(ctx.exception.error_type, "ExportDisabled")
+
+
+class ExportQueryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        path = root / "export.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, price REAL, body BLOB)"
+            )
+            conn.executemany(
+                "INSERT INTO items (name, price, body) VALUES (?, ?, ?)",
+                [(f"item, {i}", i / 2, b"\x00\x01" if i == 1 else None) for i in range(1, 251)],
+            )
+        self.export_dir = root / "exports"
+        env = {
+            "MCP_INSTANCES": "EXP,LIMITED,NOEXP",
+            "EXP_DB_PROVIDER": "sqlite",
+            "EXP_SQLITE_PATH": str(path),
+            "EXP_DB_MAX_ROWS": "10",
+            "EXP_DB_FETCH_BATCH_SIZE": "64",
+            "EXP_DB_EXPORT_DIR": str(self.export_dir),
+            "LIMITED_DB_PROVIDER": "sqlite",
+            "LIMITED_SQLITE_PATH": str(path),
+            "LIMITED_DB_EXPORT_DIR": str(self.export_dir),
+            "LIMITED_DB_EXPORT_MAX_BYTES": "500",
+            "NOEXP_DB_PROVIDER": "sqlite",
+            "NOEXP_SQLITE_PATH": str(path),
+        }
+        with mock.patch.dict(os.environ, env):
+            self.registry = InstanceRegistry()
+        patcher = mock.patch.object(query_tools, "_registry", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.registry.shutdown()
+        self._tmp.cleanup()
+
+    def test_csv_export_streams_every_row(self) -> None:
+        result = query_tools.export_query(
+            "SELECT id, name, price, body FROM items ORDER BY id",
+            file_name="items",
+            instance_id="exp",
+        )
+
+        path = Path(result["path"])
+        self.assertEqual(path, self.export_dir / "items.csv")
+        # DB_MAX_ROWS does not cap exports.
+        self.assertEqual(result["row_count"], 250)
+        self.assertEqual(result["bytes"], path.stat().st_size)
+        self.assertEqual(
+            result["schema"],
+            [["id", "integer"], ["name", "text"], ["price", "float"], ["body", "binary"]],
+        )
+        self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o600)
+        with path.open(newline="") as handle:
+            rows = list(csv.reader(handle))
+        self.assertEqual(rows[0], ["id", "name", "price", "body"])
+        self.assertEqual(rows[1], ["1", "item, 1", "0.5", "AAE="])
+        self.assertEqual(rows[2][3], "")
+        self.assertEqual(len(rows), 251)
+
+    def test_csv_prefers_the_provider_bulk_path(self) -> None:
+        def copy_csv(query, params, out):
+            out.write(b"id\n7\n")
+            return [["id", "integer"]], 1
+
+        db = self.registry.get("exp").db
+        with mock.patch.object(db, "copy_csv", side_effect=copy_csv) as copy, mock.patch.object(
+            query_tools, "get_quota_manager"
+        ) as quotas:
+            result = query_tools.export_query(
+                "SELECT id FROM items WHERE id = ?", "bulk", params=[7], instance_id="exp"
+            )
+
+        copy.assert_called_once()
+        # The file size counts against the caller's byte quota.
+        quotas.return_value.charge.assert_any_call(mock.ANY, rows=1, bytes=5)
+        self.assertEqual(copy.call_args.args[:2], ("SELECT id FROM items WHERE id = ?", (7,)))
+        self.assertEqual((result["row_count"], result["bytes"]), (1, 5))
+        self.assertEqual(Path(result["path"]).read_bytes(), b"id\n7\n")
+
+    def test_existing_files_are_not_overwritten(self) -> None:
+        first = query_tools.export_query("SELECT id FROM items", "ids.csv", instance_id="exp")
+        second = query_tools.export_query("SELECT id FROM items", "ids.csv", instance_id="exp")
+
+        self.assertIn("path", first)
+        self.assertEqual(second["error_type"], "ExportExists")
+
+    def test_oversized_export_leaves_no_file(self) -> None:
+        result = query_tools.export_query(
+            "SELECT * FROM items", "big.csv", instance_id="limited"
+        )
+
+        self.assertEqual(result["error_type"], "ExportTooLarge")
+        self.assertEqual(list(self.export_dir.iterdir()), [])
+
+    def test_rejections(self) -> None:
+        cases = [
+            (("DELETE FROM items",), {"instance_id": "exp"}, "ReadOnlyViolation"),
+            (("SELECT id FROM items",), {"instance_id": "noexp"}, "ExportDisabled"),
+            (("SELECT id FROM items",), {"format": "xlsx", "instance_id": "exp"}, "InvalidFormat"),
+        ]
+        for args, kwargs, error_type in cases:
+            with self.subTest(error_type=error_type):
+                result = query_tools.export_query(*args, **kwargs)
+                self.assertEqual(result.get("error_type"), error_type)
+
+    @unittest.skipIf(HAS_PYARROW, "pyarrow is installed")
+    def test_arrow_needs_pyarrow(self) -> None:
+        result = query_tools.export_query(
+            "SELECT id FROM items", format="arrow", instance_id="exp"
+        )
+
+        self.assertEqual(result["error_type"], "ExportUnavailable")
+        self.assertFalse(self.export_dir.exists() and any(self.export_dir.iterdir()))
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_arrow_and_parquet_exports(self) -> None:
+        import pyarrow.ipc
+        import pyarrow.parquet
+
+        query = "SELECT id, name, price, body FROM items ORDER BY id"
+        arrow = query_tools.export_query(query, format="arrow", instance_id="exp")
+        parquet = query_tools.export_query(query, format="parquet", instance_id="exp")
+
+        table = pyarrow.ipc.open_file(arrow["path"]).read_all()
+        self.assertEqual(table.num_rows, 250)
+        self.assertEqual(pyarrow.parquet.read_table(parquet["path"]).num_rows, 250)
+        self.assertEqual(
+            arrow["schema"],
+            [["id", "int64"], ["name", "string"], ["price", "double"], ["body", "binary"]],
+        )
+        self.assertEqual(table.column("body")[0].as_py(), b"\x00\x01")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sql_mcp_server import auth, quotas
+from sql_mcp_server.auth import AuthManager
+from sql_mcp_server.instances import InstanceRegistry
+from sql_mcp_server.quotas import QuotaManager
+from sql_mcp_server.tools import query as query_tools
+
+
+class RunFanoutTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        env = {"MCP_INSTANCES": "EU,US,APAC"}
+        schemas = {
+            "eu": ("name TEXT", ["paris", "rome"]),
+            "us": ("name TEXT", ["austin"]),
+            # An extra column, to clash with the others in columnar results.
+            "apac": ("name TEXT, region TEXT", ["tokyo"]),
+        }
+        for name, (columns, rows) in schemas.items():
+            path = Path(self._tmp.name) / f"{name}.db"
+            with sqlite3.connect(path) as conn:
+                conn.execute(f"CREATE TABLE sites (id INTEGER PRIMARY KEY, {columns})")
+                conn.executemany("INSERT INTO sites (name) VALUES (?)", [(r,) for r in rows])
+            env[f"{name.upper()}_DB_PROVIDER"] = "sqlite"
+            env[f"{name.upper()}_SQLITE_PATH"] = str(path)
+        with mock.patch.dict(os.environ, env):
+            self.registry = InstanceRegistry()
+        for patcher in (
+            mock.patch.object(query_tools, "_registry", self.registry),
+            mock.patch.object(auth, "_auth_manager", AuthManager("alice:tok:r:requests=4")),
+            mock.patch.object(quotas, "_quota_manager", QuotaManager()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.registry.shutdown()
+        self._tmp.cleanup()
+
+    def test_rows_are_tagged_and_merged_in_instance_order(self) -> None:
+        result = query_tools.run_fanout(
+            "SELECT name FROM sites ORDER BY id", instance_ids=["US", "eu"], api_key="tok"
+        )
+
+        self.assertEqual(
+            result["rows"],
+            [
+                {"instance_id": "us", "name": "austin"},
+                {"instance_id": "eu", "name": "paris"},
+                {"instance_id": "eu", "name": "rome"},
+            ],
+        )
+        self.assertEqual(result["instances"]["eu"]["row_count"], 2)
+        self.assertFalse(result["truncated"])
+
+    def test_max_rows_truncates_the_merge(self) -> None:
+        result = query_tools.run_fanout(
+            "SELECT name FROM sites ORDER BY id",
+            instance_ids=["eu", "us"],
+            api_key="tok",
+            max_rows=2,
+            format="columnar",
+        )
+
+        self.assertEqual(result["columns"], ["instance_id", "name"])
+        self.assertEqual(result["rows"], [["eu", "paris"], ["eu", "rome"]])
+        self.assertTrue(result["truncated"])
+        self.assertEqual(result["instances"]["us"]["row_count"], 0)
+
+    def test_columnar_results_must_share_columns(self) -> None:
+        result = query_tools.run_fanout(
+            "SELECT * FROM sites", instance_ids=["eu", "apac"], api_key="tok", format="columnar"
+        )
+
+        self.assertEqual(result["columns"], ["instance_id", "id", "name"])
+        self.assertEqual(len(result["rows"]), 2)
+        self.assertEqual(result["instances"]["apac"]["error_type"], "ColumnMismatch")
+
+    def test_slow_instance_times_out_while_others_return(self) -> None:
+        release = threading.Event()
+        self.addCleanup(release.set)
+        db = self.registry.get("us").db
+        iter_batches = db.iter_batches
+
+        def stalled(*args, **kwargs):
+            release.wait(5)
+            return iter_batches(*args, **kwargs)
+
+        with mock.patch.object(db, "iter_batches", side_effect=stalled):
+            for call in (
+                lambda: query_tools.run_fanout(
+                    "SELECT name FROM sites", ["eu", "us"], api_key="tok", timeout=0.2
+                ),
+                lambda: asyncio.run(
+                    query_tools.run_fanout_async(
+                        "SELECT name FROM sites", ["eu", "us"], api_key="tok", timeout=0.2
+                    )
+                ),
+            ):
+                started = time.monotonic()
+                result = call()
+                self.assertLess(time.monotonic() - started, 3)
+                self.assertEqual(result["instances"]["us"]["error_type"], "InstanceTimeout")
+                self.assertEqual([row["name"] for row in result["rows"]], ["paris", "rome"])
+
+    def test_each_instance_is_charged_a_request(self) -> None:
+        # Three instances use three of the four requests; the next call is
+        # admitted and overdraws, the one after it is refused.
+        query_tools.run_fanout("SELECT name FROM sites", api_key="tok")
+        query_tools.run_fanout("SELECT name FROM sites", api_key="tok")
+
+        result = query_tools.run_fanout("SELECT name FROM sites", api_key="tok")
+
+        self.assertEqual(result["error_type"], "QuotaExceeded")
+
+
+if __name__ == "__main__":
+    unittest.main()
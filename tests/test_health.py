@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sql_mcp_server.instances import InstanceRegistry
+from sql_mcp_server.metrics import get_metrics
+from sql_mcp_server.tools import health
+
+
+class WarmUpAndHealthTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        path = Path(self._tmp.name) / "health.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        self._env = {
+            "MCP_INSTANCES": "HOT,COLD",
+            "HOT_DB_PROVIDER": "sqlite",
+            "HOT_SQLITE_PATH": str(path),
+            "HOT_DB_WARMUP": "true",
+            "HOT_SQLITE_READERS": "2",
+            "COLD_DB_PROVIDER": "sqlite",
+            "COLD_SQLITE_PATH": str(path),
+        }
+        with mock.patch.dict(os.environ, self._env):
+            self.registry = InstanceRegistry()
+        patcher = mock.patch.object(health, "_registry", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.registry.shutdown()
+        self._tmp.cleanup()
+
+    def test_warm_up_connects_only_opted_in_instances(self) -> None:
+        failures = self.registry.warm_up()
+
+        self.assertEqual(failures, {})
+        self.assertTrue(self.registry.is_connected("hot"))
+        self.assertFalse(self.registry.is_connected("cold"))
+        self.assertIsNotNone(self.registry.connect_seconds("hot"))
+        self.assertIn(
+            "instance_connect_seconds{instance_id=hot}", get_metrics().snapshot()["gauges"]
+        )
+
+    def test_warm_up_reports_failures_without_raising(self) -> None:
+        env = dict(self._env, COLD_SQLITE_PATH="/nonexistent/dir/x.db")
+        with mock.patch.dict(os.environ, env):
+            registry = InstanceRegistry()
+        self.addCleanup(registry.shutdown)
+
+        failures = registry.warm_up(["cold"])
+
+        self.assertEqual(list(failures), ["cold"])
+        self.assertFalse(registry.is_connected("cold"))
+
+    def test_health_reports_every_instance(self) -> None:
+        result = asyncio.run(health.server_health_async())
+
+        self.assertTrue(result["ready"])
+        by_id = {entry["instance_id"]: entry for entry in result["instances"]}
+        self.assertEqual(set(by_id), {"hot", "cold"})
+        self.assertEqual(by_id["hot"]["status"], "up")
+        self.assertGreaterEqual(by_id["hot"]["ping_ms"], 0)
+        self.assertIsNotNone(by_id["hot"]["connect_ms"])
+        self.assertEqual(by_id["hot"]["pool"]["max_size"], 2)
+        self.assertIsNone(by_id["cold"]["pool"])
+
+    def test_health_marks_unreachable_instance_down(self) -> None:
+        with mock.patch.object(
+            self.registry.get("cold").db, "ping", side_effect=sqlite3.OperationalError("gone")
+        ):
+            result = health.server_health()
+
+        self.assertFalse(result["ready"])
+        cold = next(e for e in result["instances"] if e["instance_id"] == "cold")
+        self.assertEqual(cold["status"], "down")
+        self.assertEqual(cold["error_type"], "InstanceUnavailable")
+
+    def test_health_rejects_unknown_instance(self) -> None:
+        result = health.server_health(instance_id="nope")
+
+        self.assertEqual(result["error_type"], "UnknownInstance")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.instances import InstanceRegistry
+
+
+class InstanceRegistryRunTests(unittest.TestCase):
+    def setUp(self) -> None:
+        env = {
+            "MCP_INSTANCES": "SLOW,FAST",
+            "SLOW_DB_PROVIDER": "sqlite",
+            "SLOW_SQLITE_PATH": ":memory:",
+            "SLOW_DB_MAX_CONCURRENCY": "2",
+            "FAST_DB_PROVIDER": "sqlite",
+            "FAST_SQLITE_PATH": ":memory:",
+        }
+        with mock.patch.dict(os.environ, env):
+            self.registry = InstanceRegistry()
+        self.addCleanup(self.registry.shutdown)
+
+    def test_unknown_instance_is_rejected_before_dispatch(self) -> None:
+        body = mock.Mock(return_value={})
+
+        with self.assertRaises(MCPError) as ctx:
+            asyncio.run(self.registry.run("nowhere", body))
+        rejected = asyncio.run(self.registry.run_tool("nowhere", body))
+
+        self.assertEqual(ctx.exception.error_type, "UnknownInstance")
+        self.assertEqual(rejected["error_type"], "UnknownInstance")
+        body.assert_not_called()
+
+    def test_tool_bodies_run_off_the_event_loop(self) -> None:
+        async def main() -> str:
+            return await self.registry.run("fast", threading.current_thread)
+
+        self.assertIsNot(asyncio.run(main()), threading.current_thread())
+
+    def test_slow_call_does_not_block_a_fast_one(self) -> None:
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        async def main() -> float:
+            slow = asyncio.ensure_future(self.registry.run("slow", release.wait, 5))
+            started = time.monotonic()
+            await self.registry.run("fast", lambda: None)
+            # The loop itself stays free while the slow call blocks.
+            await asyncio.sleep(0.01)
+            elapsed = time.monotonic() - started
+            release.set()
+            await slow
+            return elapsed
+
+        self.assertLess(asyncio.run(main()), 1)
+
+    def test_calls_are_capped_at_max_concurrency(self) -> None:
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def body() -> None:
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+
+        async def main() -> None:
+            await asyncio.gather(*(self.registry.run("slow", body) for _ in range(6)))
+
+        asyncio.run(main())
+
+        self.assertEqual(self.registry.executor("slow").max_workers, 2)
+        self.assertEqual(peak, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
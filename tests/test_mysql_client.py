@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+import pymysql
+
+from sql_mcp_server.config import ServerConfig
+from sql_mcp_server.db import mysql
+from sql_mcp_server.db.cancel import CancelScope, deadline
+from sql_mcp_server.errors import MCPError
+
+
+class _FakeCursor:
+    def __init__(self, conn: "_FakeConnection", cursor_class) -> None:
+        self._conn = conn
+        self.cursor_class = cursor_class
+        self.description = None
+        self._rows: list[tuple] = []
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def execute(self, query: str, params=None) -> None:
+        self._conn.log.append(query)
+        if query.startswith("KILL QUERY"):
+            self._conn.peers[params[0] - 1].killed = True
+        elif query.startswith(("SELECT", "WITH")):
+            self.description = [("id", pymysql.constants.FIELD_TYPE.LONG)]
+            self._rows = [(i,) for i in range(10)]
+
+    def fetchmany(self, size: int) -> list[tuple]:
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self) -> list[tuple]:
+        return self.fetchmany(len(self._rows))
+
+    def close(self) -> None:
+        if self.cursor_class is pymysql.cursors.SSCursor and self._rows:
+            if self._conn.killed:
+                raise pymysql.err.OperationalError(1317, "Query execution was interrupted")
+            # Like SSCursor, read the rest of the result.
+            self._conn.drained += len(self._rows)
+            self._rows = []
+
+
+class _FakeConnection:
+    def __init__(self, peers: list["_FakeConnection"]) -> None:
+        peers.append(self)
+        self.peers = peers
+        self.ident = len(peers)
+        self.log: list[str] = []
+        self.killed = False
+        self.drained = 0
+        self.closed = False
+
+    def cursor(self, cursor_class=None) -> _FakeCursor:
+        return _FakeCursor(self, cursor_class)
+
+    def thread_id(self) -> int:
+        return self.ident
+
+    def ping(self, reconnect: bool = False) -> None:
+        pass
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class MySQLClientTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.connections: list[_FakeConnection] = []
+
+        def connect(**kwargs) -> _FakeConnection:
+            return _FakeConnection(self.connections)
+
+        config = ServerConfig(
+            instance_id="my",
+            provider="mysql",
+            host="db",
+            port=None,
+            user="u",
+            password="p",
+            database="d",
+            sqlite_path=None,
+            read_only=True,
+            max_rows=100,
+            query_timeout=10,
+            statement_timeout_ms=0,
+            allowed_tables=set(),
+            server_name="sql-mcp-server",
+            mssql_odbc_driver=None,
+            mssql_trust_server_certificate=False,
+            allow_alter=False,
+            allow_drop=False,
+        )
+        patcher = mock.patch.object(mysql.pymysql, "connect", side_effect=connect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = mysql.MySQLClient(config)
+        self.addCleanup(self.client.close)
+
+    def _stop_after_first_batch(self, **kwargs) -> None:
+        stream = self.client.iter_batches("SELECT id FROM items", batch_size=2, **kwargs)
+        next(stream)
+        stream.close()
+
+    def test_bounded_reads_are_buffered_and_keep_the_connection(self) -> None:
+        self._stop_after_first_batch(row_limit=10)
+        self._stop_after_first_batch(row_limit=10)
+
+        self.assertEqual(len(self.connections), 1)
+        self.assertEqual(self.connections[0].log, ["SELECT id FROM items"] * 2)
+
+    def test_stopped_stream_is_drained_not_killed(self) -> None:
+        main = self.connections[0]
+
+        self._stop_after_first_batch()
+
+        self.assertEqual(len(self.connections), 1)
+        self.assertFalse(main.killed)
+        self.assertEqual(main.drained, 8)
+        self.assertEqual(self.client.pool_stats()["discarded"], 0)
+
+        self.client.execute("SELECT 1")
+        self.assertEqual(main.log[-1], "SELECT 1")
+
+    def test_cancelled_stream_is_killed_over_a_reused_control_connection(self) -> None:
+        for _ in range(2):
+            scope = CancelScope()
+            stream = self.client.iter_batches("SELECT id FROM items", batch_size=2)
+            scope.run(next, stream)
+            scope.cancel()
+            with self.assertRaises(MCPError) as ctx:
+                scope.run(next, stream)
+            self.assertEqual(ctx.exception.error_type, "QueryCancelled")
+
+        first, control, second = self.connections
+        self.assertTrue(first.killed and first.closed)
+        self.assertTrue(second.killed and second.closed)
+        self.assertEqual(first.drained + second.drained, 0)
+        self.assertEqual(control.log, ["KILL QUERY %s"] * 2)
+        self.assertEqual(self.client.pool_stats()["discarded"], 2)
+
+    def test_deadline_is_an_optimizer_hint_on_selects(self) -> None:
+        main = self.connections[0]
+        with deadline(5):
+            self.client.execute("SELECT id FROM items")
+            self.client.execute("WITH t AS (SELECT 1 AS id) SELECT id FROM t")
+
+        hinted, set_limit, with_query, restore = main.log
+        self.assertRegex(hinted, r"^SELECT /\*\+ MAX_EXECUTION_TIME\(\d+\) \*/ id FROM items$")
+        self.assertEqual(set_limit, "SET SESSION MAX_EXECUTION_TIME = %s")
+        self.assertTrue(with_query.startswith("WITH"))
+        self.assertEqual(restore, "SET SESSION MAX_EXECUTION_TIME = %s")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import unittest
+
+from sql_mcp_server.catalog import SchemaCatalog
+from sql_mcp_server.config import ServerConfig
+from sql_mcp_server.db.sqlite import SQLiteClient
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.pagination import Paginator, decode_page_token, detect_order_key
+
+
+def _make_config(**overrides) -> ServerConfig:
+    base = dict(
+        instance_id="default",
+        provider="sqlite",
+        host=None,
+        port=None,
+        user=None,
+        password=None,
+        database=None,
+        sqlite_path=":memory:",
+        read_only=False,
+        max_rows=100,
+        query_timeout=10,
+        statement_timeout_ms=10_000,
+        allowed_tables=set(),
+        server_name="sql-mcp-server",
+        mssql_odbc_driver=None,
+        mssql_trust_server_certificate=False,
+        allow_alter=False,
+        allow_drop=False,
+    )
+    base.update(overrides)
+    return ServerConfig(**base)
+
+
+class DetectOrderKeyTests(unittest.TestCase):
+    def test_detects_trailing_single_column(self) -> None:
+        self.assertEqual(detect_order_key("SELECT * FROM t ORDER BY t.id DESC"), ("id", True))
+        self.assertEqual(detect_order_key("SELECT * FROM t order by name"), ("name", False))
+
+    def test_ignores_composite_and_nested_order(self) -> None:
+        self.assertIsNone(detect_order_key("SELECT * FROM t ORDER BY a, b"))
+        self.assertIsNone(detect_order_key("SELECT * FROM (SELECT * FROM t ORDER BY a"))
+        self.assertIsNone(detect_order_key("SELECT * FROM t ORDER BY a LIMIT 5"))
+
+
+class PaginatorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        config = _make_config()
+        self.client = SQLiteClient(config)
+        self.client.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, grp INTEGER, name TEXT)")
+        for i in range(25):
+            grp = None if i >= 22 else i // 4
+            self.client.execute(
+                "INSERT INTO items (id, grp, name) VALUES (?, ?, ?)", (i, grp, f"n{i}")
+            )
+        self.paginator = Paginator(self.client, config, SchemaCatalog(self.client, "default", 60))
+
+    def tearDown(self) -> None:
+        self.paginator.close()
+        self.client.close()
+
+    def _collect(self, query: str, page_size: int, principal: str = "alice") -> list:
+        pages = []
+        token = None
+        while True:
+            page = self.paginator.fetch(query, page_size, token, principal, tables={"items"})
+            pages.append(page)
+            token = page.next_token
+            if token is None:
+                return pages
+
+    def test_keyset_pages_cover_every_row_once(self) -> None:
+        pages = self._collect("SELECT id, name FROM items ORDER BY id", 10)
+
+        ids = [row[0] for page in pages for row in page.rows]
+        self.assertEqual(ids, list(range(25)))
+        self.assertEqual(decode_page_token(pages[0].next_token)["m"], "k")
+        self.assertEqual(self.paginator.open_cursors(), 0)
+
+    def test_keyset_pages_in_descending_order(self) -> None:
+        pages = self._collect("SELECT id FROM items ORDER BY id DESC", 10)
+
+        self.assertEqual([row[0] for page in pages for row in page.rows], list(range(24, -1, -1)))
+        self.assertEqual(decode_page_token(pages[0].next_token)["m"], "k")
+
+    def test_non_unique_order_key_uses_held_cursor(self) -> None:
+        # Rows sharing a grp value have no stable order between queries.
+        query = "SELECT id, grp FROM items ORDER BY grp"
+        expected = [row["id"] for row in self.client.execute(query)]
+
+        pages = self._collect(query, 3)
+
+        self.assertEqual(decode_page_token(pages[0].next_token)["m"], "c")
+        self.assertEqual([row[0] for page in pages for row in page.rows], expected)
+
+    def test_joins_are_not_keyset_paged(self) -> None:
+        # A self-join still reads one table, but repeats its ids.
+        query = "SELECT a.id FROM items AS a JOIN items AS b ON b.grp = a.grp ORDER BY a.id"
+
+        page = self.paginator.fetch(query, 10, None, "alice", tables={"items"})
+
+        self.assertEqual(decode_page_token(page.next_token)["m"], "c")
+
+    def test_pages_of_parameterized_query(self) -> None:
+        pages = []
+        token = None
+        while True:
+            page = self.paginator.fetch(
+                "SELECT id FROM items WHERE id >= ? ORDER BY id",
+                4,
+                token,
+                "alice",
+                params=(15,),
+                tables={"items"},
+            )
+            pages.append(page)
+            token = page.next_token
+            if token is None:
+                break
+
+        self.assertEqual([row[0] for page in pages for row in page.rows], list(range(15, 25)))
+        with self.assertRaises(MCPError):
+            self.paginator.fetch(
+                "SELECT id FROM items WHERE id >= ? ORDER BY id",
+                4,
+                pages[0].next_token,
+                "alice",
+                params=(3,),
+            )
+
+    def test_unordered_query_uses_held_cursor(self) -> None:
+        first = self.paginator.fetch("SELECT id FROM items", 10, None, "alice")
+
+        self.assertEqual(decode_page_token(first.next_token)["m"], "c")
+        self.assertEqual(self.paginator.open_cursors(), 1)
+
+        pages = [first]
+        while pages[-1].next_token:
+            pages.append(
+                self.paginator.fetch("SELECT id FROM items", 10, pages[-1].next_token, "alice")
+            )
+
+        self.assertEqual(sorted(row[0] for page in pages for row in page.rows), list(range(25)))
+        self.assertEqual(self.paginator.open_cursors(), 0)
+
+    def test_token_is_bound_to_query_and_principal(self) -> None:
+        page = self.paginator.fetch("SELECT id FROM items", 10, None, "alice")
+
+        with self.assertRaises(MCPError) as ctx:
+            self.paginator.fetch("SELECT id FROM items", 10, page.next_token, "bob")
+        self.assertEqual(ctx.exception.error_type, "InvalidPageToken")
+
+        with self.assertRaises(MCPError):
+            self.paginator.fetch("SELECT name FROM items", 10, page.next_token, "alice")
+
+    def test_tampered_token_is_rejected(self) -> None:
+        page = self.paginator.fetch("SELECT id FROM items ORDER BY id", 10, None, "alice")
+        body, signature = page.next_token.split(".")
+
+        with self.assertRaises(MCPError) as ctx:
+            self.paginator.fetch(
+                "SELECT id FROM items ORDER BY id", 10, body + "x." + signature, "alice"
+            )
+
+        self.assertEqual(ctx.exception.error_type, "InvalidPageToken")
+
+
+if __name__ == "__main__":
+    unittest.main()
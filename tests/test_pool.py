@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+import unittest
+
+from sql_mcp_server.db.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from sql_mcp_server.db.pool import ConnectionPool
+from sql_mcp_server.errors import MCPError
+
+
+class _FakeConnection:
+    def __init__(self, ident: int) -> None:
+        self.ident = ident
+        self.alive = True
+        self.closed = False
+        self.rollbacks = 0
+
+    def rollback(self) -> None:
+        if not self.alive:
+            raise RuntimeError("connection lost")
+        self.rollbacks += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _Factory:
+    def __init__(self) -> None:
+        self.created: list[_FakeConnection] = []
+        self.setup_calls = 0
+        self.down = False
+
+    def __call__(self) -> _FakeConnection:
+        # Stands in for per-connection session setup (statement timeouts etc.).
+        self.setup_calls += 1
+        if self.down:
+            raise ConnectionError("server is restarting")
+        conn = _FakeConnection(len(self.created))
+        self.created.append(conn)
+        return conn
+
+
+def _ping(conn: _FakeConnection) -> None:
+    if not conn.alive:
+        raise RuntimeError("dead")
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def test_min_size_connections_are_opened_eagerly(self) -> None:
+        factory = _Factory()
+
+        pool = ConnectionPool(factory, min_size=2, max_size=4)
+
+        self.assertEqual(factory.setup_calls, 2)
+        self.assertEqual(pool.stats()["idle"], 2)
+
+    def test_connection_is_reused_without_new_setup(self) -> None:
+        factory = _Factory()
+        pool = ConnectionPool(factory, min_size=1, max_size=2, reset=lambda c: c.rollback())
+
+        for _ in range(5):
+            with pool.connection() as conn:
+                self.assertIs(conn.raw, factory.created[0])
+
+        self.assertEqual(factory.setup_calls, 1)
+        self.assertEqual(factory.created[0].rollbacks, 5)
+
+    def test_checkout_times_out_when_exhausted(self) -> None:
+        pool = ConnectionPool(_Factory(), min_size=0, max_size=1, checkout_timeout=0.05)
+        held = pool.acquire()
+
+        with self.assertRaises(MCPError) as ctx:
+            pool.acquire()
+
+        self.assertEqual(ctx.exception.error_type, "PoolTimeout")
+        pool.release(held)
+
+    def test_waiter_receives_released_connection(self) -> None:
+        pool = ConnectionPool(_Factory(), min_size=0, max_size=1, checkout_timeout=2)
+        held = pool.acquire()
+        received: list[object] = []
+
+        def _worker() -> None:
+            with pool.connection() as conn:
+                received.append(conn.raw)
+
+        thread = threading.Thread(target=_worker)
+        thread.start()
+        time.sleep(0.05)
+        pool.release(held)
+        thread.join(timeout=2)
+
+        self.assertEqual(received, [held.raw])
+
+    def test_pre_ping_discards_dead_connection(self) -> None:
+        factory = _Factory()
+        pool = ConnectionPool(factory, min_size=1, max_size=2, ping=_ping)
+        factory.created[0].alive = False
+
+        with pool.connection() as conn:
+            self.assertIs(conn.raw, factory.created[1])
+
+        self.assertTrue(factory.created[0].closed)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_recently_used_connections_are_not_pinged(self) -> None:
+        factory = _Factory()
+        pings: list[int] = []
+
+        def ping(conn: _FakeConnection) -> None:
+            pings.append(conn.ident)
+
+        pool = ConnectionPool(factory, min_size=1, max_size=1, ping=ping, ping_idle=0.05)
+        for _ in range(3):
+            with pool.connection():
+                pass
+        self.assertEqual(pings, [])
+
+        time.sleep(0.06)
+        with pool.connection():
+            pass
+
+        self.assertEqual(pings, [0])
+
+    def test_failed_reset_discards_connection(self) -> None:
+        factory = _Factory()
+        pool = ConnectionPool(factory, min_size=0, max_size=2, reset=lambda c: c.rollback())
+
+        with self.assertRaises(RuntimeError):
+            with pool.connection() as conn:
+                conn.raw.alive = False
+                raise RuntimeError("query failed")
+
+        self.assertTrue(factory.created[0].closed)
+        self.assertEqual(pool.stats()["size"], 0)
+
+    def test_tool_errors_pass_through_checkout(self) -> None:
+        pool = ConnectionPool(_Factory(), min_size=1, max_size=1)
+
+        with self.assertRaises(MCPError) as ctx:
+            with pool.connection():
+                raise MCPError("denied", error_type="Denied")
+
+        self.assertEqual(ctx.exception.error_type, "Denied")
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            ctx.exception.error_type = "Other"
+
+    def test_idle_connections_above_min_size_are_evicted(self) -> None:
+        factory = _Factory()
+        pool = ConnectionPool(factory, min_size=1, max_size=3, idle_timeout=0.01)
+        first = pool.acquire()
+        second = pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        time.sleep(0.03)
+
+        with pool.connection():
+            pass
+
+        self.assertEqual(pool.stats()["size"], 1)
+        self.assertEqual(sum(c.closed for c in factory.created), 1)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ReconnectTests(unittest.TestCase):
+    def test_unreachable_database_does_not_fail_pool_creation(self) -> None:
+        factory = _Factory()
+        factory.down = True
+
+        pool = ConnectionPool(factory, min_size=2, max_size=2)
+
+        self.assertEqual(pool.stats()["size"], 0)
+        factory.down = False
+        with pool.connection() as conn:
+            self.assertIs(conn.raw, factory.created[0])
+
+    def test_failed_connect_is_retried(self) -> None:
+        factory = _Factory()
+        attempts = iter([True, True, False])
+        original = factory.__call__
+
+        def flaky() -> _FakeConnection:
+            factory.down = next(attempts)
+            return original()
+
+        pool = ConnectionPool(flaky, min_size=0, max_size=1, connect_retries=2, connect_backoff=0)
+
+        with pool.connection() as conn:
+            self.assertIs(conn.raw, factory.created[0])
+        self.assertEqual(factory.setup_calls, 3)
+
+    def test_retries_are_bounded(self) -> None:
+        factory = _Factory()
+        factory.down = True
+        pool = ConnectionPool(factory, min_size=0, max_size=1, connect_retries=2, connect_backoff=0)
+
+        with self.assertRaises(ConnectionError):
+            pool.acquire()
+        self.assertEqual(factory.setup_calls, 3)
+
+    def test_open_breaker_fails_fast_until_trial_succeeds(self) -> None:
+        factory = _Factory()
+        clock = _Clock()
+        breaker = CircuitBreaker("crm", failure_threshold=2, reset_timeout=30, clock=clock)
+        pool = ConnectionPool(factory, min_size=0, max_size=1, ping=_ping, breaker=breaker)
+        with pool.connection():
+            pass
+        factory.created[0].alive = False
+        factory.down = True
+
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                pool.acquire()
+        self.assertEqual(breaker.state, OPEN)
+        calls = factory.setup_calls
+        with self.assertRaises(MCPError) as ctx:
+            pool.acquire()
+        self.assertEqual(ctx.exception.error_type, "CircuitOpen")
+        self.assertEqual(factory.setup_calls, calls)
+        self.assertEqual(pool.stats()["breaker_open"], 1)
+
+        clock.now += 31
+        factory.down = False
+        with pool.connection() as conn:
+            self.assertIs(conn.raw, factory.created[-1])
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(pool.stats()["breaker_open"], 0)
+
+    def test_failed_trial_reopens_breaker(self) -> None:
+        clock = _Clock()
+        breaker = CircuitBreaker("crm", failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now += 11
+
+        breaker.before_call()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        with self.assertRaises(MCPError):
+            # Only one trial call at a time.
+            breaker.before_call()
+        breaker.record_failure()
+
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(MCPError):
+            breaker.before_call()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from sql_mcp_server.config import ServerConfig
+from sql_mcp_server.db import postgres
+
+
+class _SqlError(postgres.psycopg2.Error):
+    def __init__(self, pgcode: str) -> None:
+        super().__init__(pgcode)
+        self._pgcode = pgcode
+
+    @property
+    def pgcode(self) -> str:
+        return self._pgcode
+
+
+class _FakeCursor:
+    def __init__(self, conn: "_FakeConnection", name: str | None) -> None:
+        self._conn = conn
+        self.name = name
+        self.description = None
+        self._rows: list[tuple] = []
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def execute(self, query: str, params=None) -> None:
+        conn = self._conn
+        if conn.dead:
+            raise postgres.psycopg2.OperationalError("server closed the connection unexpectedly")
+        conn.log.append((self.name, query, params))
+        if conn.aborted:
+            raise _SqlError("25P02")  # in_failed_sql_transaction
+        if query.startswith("EXECUTE") and conn.fail_with:
+            conn.aborted = True
+            raise _SqlError(conn.fail_with)
+        if query.startswith("PREPARE"):
+            conn.prepared.add(query.split()[1])
+        elif query.startswith("DEALLOCATE"):
+            conn.prepared.discard(query.split()[1])
+        if query.startswith(("SELECT", "EXECUTE")):
+            self.description = [("id", 23)]
+            self._rows = [(1,), (2,), (3,)]
+
+    def fetchmany(self, size: int) -> list[tuple]:
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self) -> list[tuple]:
+        return self.fetchmany(len(self._rows))
+
+    def close(self) -> None:
+        pass
+
+
+class _FakeConnection:
+    def __init__(self) -> None:
+        self.log: list = []
+        # Stands in for pg_prepared_statements.
+        self.prepared: set[str] = set()
+        self.aborted = False
+        self.fail_with: str | None = None
+        self.dead = False
+
+    def cursor(self, name: str | None = None, cursor_factory=None) -> _FakeCursor:
+        return _FakeCursor(self, name)
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        if self.dead:
+            raise postgres.psycopg2.InterfaceError("connection already closed")
+        self.aborted = False
+
+    def cancel(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _client(conn: _FakeConnection | None) -> postgres.PostgresClient:
+    config = ServerConfig(
+        instance_id="pg",
+        provider="postgres",
+        host="db",
+        port=None,
+        user="u",
+        password="p",
+        database="d",
+        sqlite_path=None,
+        read_only=True,
+        max_rows=100,
+        query_timeout=10,
+        statement_timeout_ms=0,
+        allowed_tables=set(),
+        server_name="sql-mcp-server",
+        mssql_odbc_driver=None,
+        mssql_trust_server_certificate=False,
+        allow_alter=False,
+        allow_drop=False,
+    )
+    if conn is None:
+        return postgres.PostgresClient(config)
+    with mock.patch.object(postgres.psycopg2, "connect", return_value=conn):
+        return postgres.PostgresClient(config)
+
+
+class PreparedStatementTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn = _FakeConnection()
+        self.client = _client(self.conn)
+        self.addCleanup(self.client.close)
+
+    def _statements(self) -> list[str]:
+        return [query for _, query, _ in self._log()]
+
+    def _log(self) -> list:
+        # Leave out session setup and the pool's pings.
+        return [
+            entry
+            for entry in self.conn.log
+            if not entry[1].startswith("SET") and entry[1] != "SELECT 1"
+        ]
+
+    def test_statements_without_parameters_are_not_prepared(self) -> None:
+        self.client.execute("SELECT id FROM items")
+        self.client.execute("SELECT id FROM items")
+
+        self.assertEqual(self._statements(), ["SELECT id FROM items"] * 2)
+
+    def test_parameterized_statements_are_prepared_once(self) -> None:
+        self.client.execute("SELECT id FROM items WHERE id = %s", (1,))
+        self.client.execute("SELECT id FROM items WHERE id = %s", (2,))
+
+        self.assertEqual(
+            self._statements(),
+            [
+                "PREPARE mcp_stmt_1 AS SELECT id FROM items WHERE id = $1",
+                "EXECUTE mcp_stmt_1 (%s)",
+                "EXECUTE mcp_stmt_1 (%s)",
+            ],
+        )
+
+    def _fail_next_execute(self, pgcode: str) -> None:
+        self.conn.fail_with = pgcode
+        with self.assertRaises(postgres.psycopg2.Error):
+            self.client.execute("SELECT id FROM items WHERE id = %s", (2,))
+        self.conn.fail_with = None
+
+    def test_failed_execute_keeps_a_still_valid_statement(self) -> None:
+        self.client.execute("SELECT id FROM items WHERE id = %s", (1,))
+        self._fail_next_execute("22012")  # division_by_zero
+        self.client.execute("SELECT id FROM items WHERE id = %s", (3,))
+
+        self.assertEqual(self.conn.prepared, {"mcp_stmt_1"})
+        self.assertEqual(
+            [query for query in self._statements() if query.startswith("PREPARE")],
+            ["PREPARE mcp_stmt_1 AS SELECT id FROM items WHERE id = $1"],
+        )
+
+    def test_stale_statement_is_deallocated_after_rollback(self) -> None:
+        self.client.execute("SELECT id FROM items WHERE id = %s", (1,))
+        self._fail_next_execute("0A000")  # cached plan must not change result type
+
+        self.assertEqual(self.conn.prepared, set())
+        self.assertEqual(self._statements()[-1], "DEALLOCATE mcp_stmt_1")
+
+        self.client.execute("SELECT id FROM items WHERE id = %s", (3,))
+        self.assertEqual(self.conn.prepared, {"mcp_stmt_2"})
+
+    def test_missing_statement_is_prepared_again(self) -> None:
+        self.client.execute("SELECT id FROM items WHERE id = %s", (1,))
+        self.conn.prepared.clear()  # e.g. DISCARD ALL by a connection proxy
+        self._fail_next_execute("26000")
+        self.client.execute("SELECT id FROM items WHERE id = %s", (3,))
+
+        self.assertNotIn("DEALLOCATE mcp_stmt_1", self._statements())
+        self.assertEqual(self.conn.prepared, {"mcp_stmt_2"})
+
+    def test_bounded_reads_execute_the_prepared_statement(self) -> None:
+        query = "SELECT id FROM items WHERE id > %s LIMIT 3"
+        batches = list(self.client.iter_batches(query, (0,), batch_size=2, row_limit=3))
+
+        self.assertEqual([batch.rows for batch in batches], [[(1,), (2,)], [(3,)]])
+        self.assertEqual(
+            [name for name, query, _ in self._log() if query.startswith("EXECUTE")], [None]
+        )
+
+    def test_unbounded_reads_use_a_server_side_cursor(self) -> None:
+        list(self.client.iter_batches("SELECT id FROM items WHERE id > %s", (0,)))
+
+        [(name, query, _)] = self._log()
+        self.assertTrue(name.startswith("mcp_stream_"))
+        self.assertEqual(query, "SELECT id FROM items WHERE id > %s")
+
+
+
+class StaleConnectionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.connections: list[_FakeConnection] = []
+
+        def connect(**kwargs) -> _FakeConnection:
+            self.connections.append(_FakeConnection())
+            return self.connections[-1]
+
+        patcher = mock.patch.object(postgres.psycopg2, "connect", side_effect=connect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = _client(None)
+        self.addCleanup(self.client.close)
+
+    def _restart_server(self) -> None:
+        for conn in self.connections:
+            conn.dead = True
+
+    def test_reads_are_retried_on_a_new_connection(self) -> None:
+        self.client.execute("SELECT id FROM items")
+        self._restart_server()
+
+        # Used moments ago, so the pool hands the dead connection out unpinged.
+        rows = self.client.execute("SELECT id FROM items WHERE id > %s", (0,))
+        self._restart_server()
+        batches = list(self.client.iter_batches("SELECT id FROM items", row_limit=10))
+
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(batches[0].rows, [(1,), (2,), (3,)])
+        self.assertEqual(len(self.connections), 3)
+        self.assertEqual(self.client.pool_stats()["discarded"], 2)
+
+    def test_writes_are_not_retried(self) -> None:
+        self.client.execute("SELECT id FROM items")
+        self._restart_server()
+
+        with self.assertRaises(postgres.psycopg2.OperationalError):
+            self.client.execute("UPDATE items SET id = id + 1")
+        self.assertEqual(len(self.connections), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
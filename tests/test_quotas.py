@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sql_mcp_server import auth, quotas
+from sql_mcp_server.auth import ApiPrincipal, AuthManager
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.instances import InstanceRegistry
+from sql_mcp_server.metrics import get_metrics
+from sql_mcp_server.quotas import Quota, QuotaManager, parse_quota
+from sql_mcp_server.tools import query as query_tools
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _principal(**limits: float) -> ApiPrincipal:
+    return ApiPrincipal(username="alice", token="tok", scopes={"r"}, quota=Quota(**limits))
+
+
+class ParseQuotaTests(unittest.TestCase):
+    def test_parse(self) -> None:
+        quota = parse_quota("requests=60; rows=1000;db_seconds=1.5")
+
+        self.assertEqual(quota, Quota(requests=60, rows=1000, db_seconds=1.5))
+
+    def test_rejects_unknown_resource(self) -> None:
+        with self.assertRaises(ValueError):
+            parse_quota("cpu=5")
+
+    def test_tokens_entry_with_quota(self) -> None:
+        manager = AuthManager("alice:tok:r:requests=10;rows=500\nbob:tok2:rw")
+
+        self.assertEqual(manager.authenticate("tok").quota, Quota(requests=10, rows=500))
+        self.assertIsNone(manager.authenticate("tok2").quota)
+
+    def test_invalid_quota_drops_entry(self) -> None:
+        manager = AuthManager("alice:tok:r:rows=lots\nbob:tok2:rw")
+
+        with self.assertRaises(MCPError):
+            manager.authenticate("tok")
+
+
+class QuotaManagerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        get_metrics().reset()
+        self.clock = _Clock()
+        self.manager = QuotaManager(clock=self.clock)
+
+    def test_request_rate_refills(self) -> None:
+        principal = _principal(requests=2)
+        self.manager.admit(principal)
+        self.manager.admit(principal)
+
+        with self.assertRaises(MCPError) as ctx:
+            self.manager.admit(principal)
+        self.assertEqual(ctx.exception.error_type, "QuotaExceeded")
+        self.assertAlmostEqual(ctx.exception.retry_after, 30.0)
+        self.assertEqual(ctx.exception.to_dict()["retry_after"], 30.0)
+
+        self.clock.now = 30.0
+        self.manager.admit(principal)
+
+    def test_rows_are_charged_after_the_call(self) -> None:
+        principal = _principal(rows=600)
+        self.manager.admit(principal)
+        # A single call may overdraw; the next ones wait for the debt to refill.
+        self.manager.charge(principal, rows=900)
+
+        with self.assertRaises(MCPError) as ctx:
+            self.manager.admit(principal)
+        self.assertIn("rows", ctx.exception.message)
+        self.assertAlmostEqual(ctx.exception.retry_after, 30.0)
+
+        self.clock.now = 30.0
+        self.manager.admit(principal)
+
+    def test_usage_counters_are_exported(self) -> None:
+        principal = _principal()
+        self.manager.admit(principal)
+        self.manager.charge(principal, rows=3, db_seconds=0.5)
+
+        counters = get_metrics().snapshot()["counters"]
+        self.assertEqual(counters["quota_usage_total{principal=alice,resource=requests}"], 1)
+        self.assertEqual(counters["quota_usage_total{principal=alice,resource=rows}"], 3)
+        self.assertEqual(counters["quota_usage_total{principal=alice,resource=db_seconds}"], 0.5)
+
+    def test_principal_without_quota_is_unlimited(self) -> None:
+        principal = ApiPrincipal(username="bob", token="t", scopes={"r"})
+        for _ in range(100):
+            self.manager.admit(principal)
+            self.manager.charge(principal, rows=10_000)
+
+
+class RunSelectQuotaTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        path = Path(self._tmp.name) / "quota.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            conn.executemany("INSERT INTO items (name) VALUES (?)", [("a",), ("b",), ("c",)])
+        env = {"MCP_INSTANCES": "Q", "Q_DB_PROVIDER": "sqlite", "Q_SQLITE_PATH": str(path)}
+        with mock.patch.dict(os.environ, env):
+            self.registry = InstanceRegistry()
+        for patcher in (
+            mock.patch.object(query_tools, "_registry", self.registry),
+            mock.patch.object(auth, "_auth_manager", AuthManager("alice:tok:r:rows=4;bytes=1000")),
+            mock.patch.object(quotas, "_quota_manager", QuotaManager()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.registry.shutdown()
+        self._tmp.cleanup()
+
+    def test_rows_quota_blocks_further_reads(self) -> None:
+        first = query_tools.run_select("SELECT name FROM items", instance_id="q", api_key="tok")
+        self.assertEqual(len(first["rows"]), 3)
+        query_tools.run_select("SELECT name FROM items", instance_id="q", api_key="tok")
+
+        result = query_tools.run_select("SELECT name FROM items", instance_id="q", api_key="tok")
+
+        self.assertEqual(result["error_type"], "QuotaExceeded")
+        self.assertGreater(result["retry_after"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import base64
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sql_mcp_server.budget import TRUNCATION_MARKER, ResultBudget, encoded_size
+from sql_mcp_server.instances import InstanceRegistry
+from sql_mcp_server.tools import query as query_tools
+
+
+class ResultBudgetTests(unittest.TestCase):
+    def test_disabled_budget_returns_rows_untouched(self) -> None:
+        rows = [(1, "a" * 1000)]
+        budget = ResultBudget(0, 0)
+
+        self.assertIs(budget.fit(["id", "name"], rows), rows)
+        self.assertFalse(budget.enabled)
+
+    def test_values_are_capped_with_marker(self) -> None:
+        budget = ResultBudget(0, 4)
+
+        capped = budget.cap_values([("abcdefgh", b"0123456789"), ("ab", None)])
+
+        self.assertEqual(capped[0], ("abcd" + TRUNCATION_MARKER, "MDEy" + TRUNCATION_MARKER))
+        self.assertEqual(capped[1], ("ab", None))
+        self.assertFalse(budget.exhausted)
+        self.assertEqual(budget.report(), {"truncated": True})
+
+    def test_values_are_capped_in_utf8_bytes(self) -> None:
+        budget = ResultBudget(0, 7)
+
+        # Each "é" takes two bytes; "ü€" (5 bytes) and 5 bytes of binary fit.
+        capped = budget.cap_values([("éééé", "ü€", b"\x00\x01\x02\x03\x04")])
+
+        self.assertEqual(capped[0][0], "ééé" + TRUNCATION_MARKER)
+        self.assertEqual(capped[0][1], "ü€")
+        # Base64 of the first 3 bytes; whole 4-character groups only.
+        self.assertEqual(capped[0][2], "AAEC" + TRUNCATION_MARKER)
+        self.assertEqual(budget.values_truncated, 2)
+
+    def test_stops_at_the_first_row_that_does_not_fit(self) -> None:
+        row = (1, "x" * 10)
+        # {"id":1,"name":"xxxxxxxxxx"} is about the size of one row.
+        row_size = (len("id") + 4 + len("name") + 4 + 1) + encoded_size(1) + encoded_size("x" * 10)
+        budget = ResultBudget(row_size * 2, 0)
+
+        fitted = budget.fit(["id", "name"], [row, row, row, row])
+
+        self.assertEqual(len(fitted), 2)
+        self.assertTrue(budget.exhausted)
+        self.assertEqual(budget.used, row_size * 2)
+        self.assertEqual(budget.report(), {"truncated": True})
+
+
+class RunSelectBudgetTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        path = Path(self._tmp.name) / "budget.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE docs (id INTEGER PRIMARY KEY, body TEXT)")
+            conn.executemany(
+                "INSERT INTO docs (body) VALUES (?)", [("y" * 5000,) for _ in range(20)]
+            )
+            conn.execute("CREATE TABLE files (id INTEGER PRIMARY KEY, name TEXT, data BLOB)")
+            conn.execute(
+                "INSERT INTO files (name, data) VALUES (?, ?)", ("ü" * 150, bytes(range(256)))
+            )
+        env = {
+            "MCP_INSTANCES": "DOCS,PLAIN",
+            "DOCS_DB_PROVIDER": "sqlite",
+            "DOCS_SQLITE_PATH": str(path),
+            "DOCS_DB_MAX_RESULT_BYTES": "1000",
+            "DOCS_DB_MAX_VALUE_BYTES": "200",
+            "DOCS_DB_FETCH_BATCH_SIZE": "4",
+            "DOCS_DB_RESULT_CACHE_TTL": "60",
+            "PLAIN_DB_PROVIDER": "sqlite",
+            "PLAIN_SQLITE_PATH": str(path),
+        }
+        with mock.patch.dict(os.environ, env):
+            self.registry = InstanceRegistry()
+        patcher = mock.patch.object(query_tools, "_registry", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.registry.shutdown()
+        self._tmp.cleanup()
+
+    def test_large_values_and_rows_are_cut(self) -> None:
+        result = query_tools.run_select(
+            "SELECT id, body FROM docs ORDER BY id", instance_id="docs"
+        )
+
+        self.assertTrue(result["truncated"])
+        self.assertTrue(result["has_more"])
+        self.assertEqual(len(result["rows"]), 4)
+        self.assertNotIn("rows_omitted", result)
+        self.assertEqual(result["rows"][0]["body"], "y" * 200 + TRUNCATION_MARKER)
+
+    def test_binary_and_multibyte_values_are_cut_before_encoding(self) -> None:
+        for _ in range(2):
+            # The second read is served from the result cache.
+            result = query_tools.run_select(
+                "SELECT name, data FROM files", instance_id="docs"
+            )
+            row = result["rows"][0]
+
+            self.assertTrue(result["truncated"])
+            self.assertEqual(row["name"], "ü" * 100 + TRUNCATION_MARKER)
+            data = row["data"].removesuffix(TRUNCATION_MARKER)
+            self.assertEqual(len(data), 200)
+            self.assertEqual(base64.b64decode(data), bytes(range(150)))
+
+    def test_small_results_are_not_flagged(self) -> None:
+        result = query_tools.run_select("SELECT id FROM docs WHERE id = 1", instance_id="docs")
+
+        self.assertEqual(result["rows"], [{"id": 1}])
+        self.assertEqual((result["truncated"], result["has_more"]), (False, False))
+
+    def test_row_cap_reports_whether_more_rows_exist(self) -> None:
+        env = {
+            "MCP_INSTANCES": "CAP",
+            "CAP_DB_PROVIDER": "sqlite",
+            "CAP_SQLITE_PATH": self.registry.config("plain").sqlite_path,
+            "CAP_DB_MAX_ROWS": "5",
+        }
+        with mock.patch.dict(os.environ, env):
+            registry = InstanceRegistry()
+        self.addCleanup(registry.shutdown)
+        with mock.patch.object(query_tools, "_registry", registry):
+            # A LIMIT inside a subquery keeps the outer pushdown.
+            capped = query_tools.run_select(
+                "SELECT id FROM docs WHERE id IN (SELECT id FROM docs LIMIT 10)",
+                instance_id="cap",
+            )
+            exact = query_tools.run_select("SELECT id FROM docs WHERE id <= 5", instance_id="cap")
+            # The statement's own LIMIT stops the pushdown; the fetch still caps.
+            own_limit = query_tools.run_select("SELECT id FROM docs LIMIT 8", instance_id="cap")
+
+        self.assertEqual(len(capped["rows"]), 5)
+        self.assertTrue(capped["has_more"])
+        self.assertEqual(len(capped["warnings"]), 1)
+        self.assertEqual((len(exact["rows"]), exact["has_more"]), (5, False))
+        self.assertEqual((len(own_limit["rows"]), own_limit["has_more"]), (5, True))
+
+    def test_no_budget_keeps_the_response_shape(self) -> None:
+        result = query_tools.run_select("SELECT id FROM docs WHERE id = 1", instance_id="plain")
+
+        self.assertNotIn("truncated", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sql_mcp_server.cache import ResultCache, estimate_result_size
+from sql_mcp_server.instances import InstanceRegistry
+from sql_mcp_server.metrics import get_metrics
+from sql_mcp_server.tools import query as query_tools
+
+
+class ResultCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        get_metrics().reset()
+
+    def test_hit_after_put_and_counters(self) -> None:
+        cache = ResultCache("crm", ttl=60, max_bytes=1_000_000)
+
+        self.assertIsNone(cache.get("SELECT 1"))
+        cache.put("SELECT 1", ["one"], [(1,)], {"users"})
+        entry = cache.get("SELECT 1")
+
+        self.assertEqual(entry.rows, ((1,),))
+        counters = get_metrics().snapshot()["counters"]
+        self.assertEqual(counters["result_cache_hits_total{instance_id=crm}"], 1)
+        self.assertEqual(counters["result_cache_misses_total{instance_id=crm}"], 1)
+
+    def test_entries_expire_after_ttl(self) -> None:
+        cache = ResultCache("crm", ttl=0.01, max_bytes=1_000_000)
+        cache.put("q", ["a"], [(1,)], {"users"})
+
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get("q"))
+
+    def test_least_recently_used_entry_is_evicted_by_size(self) -> None:
+        entry_size = estimate_result_size(["a"], [("x" * 100,)])
+        cache = ResultCache("crm", ttl=60, max_bytes=entry_size * 2)
+        cache.put("q1", ["a"], [("x" * 100,)], {"t"})
+        cache.put("q2", ["a"], [("y" * 100,)], {"t"})
+        cache.get("q1")
+
+        cache.put("q3", ["a"], [("z" * 100,)], {"t"})
+
+        self.assertIsNotNone(cache.get("q1"))
+        self.assertIsNone(cache.get("q2"))
+        self.assertIsNotNone(cache.get("q3"))
+
+    def test_write_invalidates_only_affected_tables(self) -> None:
+        cache = ResultCache("crm", ttl=60, max_bytes=1_000_000)
+        cache.put("users", ["a"], [(1,)], {"users"})
+        cache.put("orders", ["a"], [(1,)], {"orders"})
+        cache.put("constant", ["a"], [(1,)], set())
+
+        dropped = cache.invalidate({"USERS"})
+
+        self.assertEqual(dropped, 2)
+        self.assertIsNone(cache.get("users"))
+        self.assertIsNone(cache.get("constant"))
+        self.assertIsNotNone(cache.get("orders"))
+
+    def test_result_read_before_a_write_is_not_cached(self) -> None:
+        cache = ResultCache("crm", ttl=60, max_bytes=1_000_000)
+        users = cache.generation({"Users"})
+        orders = cache.generation({"orders"})
+        unknown = cache.generation(set())
+
+        cache.invalidate({"users"})
+        cache.put("users", ["a"], [(1,)], {"users"}, users)
+        cache.put("orders", ["a"], [(1,)], {"orders"}, orders)
+        cache.put("constant", ["a"], [(1,)], set(), unknown)
+
+        self.assertIsNone(cache.get("users"))
+        self.assertIsNotNone(cache.get("orders"))
+        self.assertIsNone(cache.get("constant"))
+
+    def test_disabled_cache_stores_nothing(self) -> None:
+        cache = ResultCache("crm", ttl=0, max_bytes=1_000_000)
+        cache.put("q", ["a"], [(1,)], {"t"})
+
+        self.assertFalse(cache.enabled)
+        self.assertIsNone(cache.get("q"))
+
+
+class ResultCacheRaceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "race.db"
+        with sqlite3.connect(self.path) as conn:
+            # Lets the write commit while the read holds its snapshot.
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            conn.executemany("INSERT INTO items (name) VALUES (?)", [("old",)] * 4)
+        env = {
+            "MCP_INSTANCES": "RACE",
+            "RACE_DB_PROVIDER": "sqlite",
+            "RACE_SQLITE_PATH": str(self.path),
+            "RACE_DB_RESULT_CACHE_TTL": "60",
+            "RACE_DB_FETCH_BATCH_SIZE": "2",
+        }
+        with mock.patch.dict(os.environ, env):
+            self.registry = InstanceRegistry()
+        patcher = mock.patch.object(query_tools, "_registry", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.registry.shutdown()
+        self._tmp.cleanup()
+
+    def test_write_in_the_middle_of_a_read_is_not_hidden_by_the_cache(self) -> None:
+        context = self.registry.get("race")
+        iter_batches = context.db.iter_batches
+
+        def interleaved(*args, **kwargs):
+            for index, batch in enumerate(iter_batches(*args, **kwargs)):
+                yield batch
+                if index == 0:
+                    # Another call writes, then invalidates, as run_query does.
+                    with sqlite3.connect(self.path) as conn:
+                        conn.execute("UPDATE items SET name = 'new'")
+                    context.result_cache.invalidate({"items"})
+
+        query = "SELECT name FROM items ORDER BY id"
+        with mock.patch.object(context.db, "iter_batches", side_effect=interleaved):
+            first = query_tools.run_select(query, "race")
+
+        self.assertEqual(first["rows"][0], {"name": "old"})
+        self.assertEqual(context.result_cache.stats()["entries"], 0)
+        second = query_tools.run_select(query, "race")
+        self.assertEqual({row["name"] for row in second["rows"]}, {"new"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sql_mcp_server.instances import InstanceRegistry
+from sql_mcp_server.tools import query as query_tools
+
+
+class ColumnarFormatTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        path = Path(self._tmp.name) / "format.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, price REAL)")
+            conn.executemany(
+                "INSERT INTO items (name, price) VALUES (?, ?)",
+                [(f"item {i}", i / 2) for i in range(1, 6)],
+            )
+        env = {
+            "MCP_INSTANCES": "FMT",
+            "FMT_DB_PROVIDER": "sqlite",
+            "FMT_SQLITE_PATH": str(path),
+            "FMT_DB_MAX_ROWS": "3",
+            "FMT_DB_RESULT_CACHE_TTL": "60",
+        }
+        with mock.patch.dict(os.environ, env):
+            self.registry = InstanceRegistry()
+        patcher = mock.patch.object(query_tools, "_registry", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.registry.shutdown()
+        self._tmp.cleanup()
+
+    def _select(self, query: str, result_format: str, **kwargs) -> dict:
+        return query_tools.run_select(query, "fmt", format=result_format, **kwargs)
+
+    def test_columnar_matches_rows(self) -> None:
+        query = "SELECT id, name, price FROM items WHERE id <= 2 ORDER BY id"
+        rows = self._select(query, "rows")
+        # The second call is served from the result cache.
+        for columnar in (self._select(query, "columnar"), self._select(query, "columnar")):
+            self.assertEqual(columnar["columns"], ["id", "name", "price"])
+            self.assertEqual(columnar["rows"], [[1, "item 1", 0.5], [2, "item 2", 1.0]])
+            self.assertEqual(
+                [dict(zip(columnar["columns"], row)) for row in columnar["rows"]], rows["rows"]
+            )
+        self.assertNotIn("columns", rows)
+
+    def test_empty_result_still_reports_columns(self) -> None:
+        result = self._select("SELECT id, name FROM items WHERE id < 0", "columnar")
+
+        self.assertEqual(result["columns"], ["id", "name"])
+        self.assertEqual(result["rows"], [])
+        self.assertFalse(result["has_more"])
+
+    def test_truncation_is_flagged_in_both_formats(self) -> None:
+        for result_format in ("rows", "columnar"):
+            with self.subTest(result_format=result_format):
+                result = self._select("SELECT id FROM items ORDER BY id", result_format)
+
+                self.assertEqual(len(result["rows"]), 3)
+                self.assertTrue(result["has_more"])
+                self.assertTrue(any("DB_MAX_ROWS" in w for w in result["warnings"]))
+
+    def test_columnar_pages(self) -> None:
+        first = self._select("SELECT id FROM items ORDER BY id", "columnar", page_size=2)
+        second = self._select(
+            "SELECT id FROM items ORDER BY id",
+            "columnar",
+            page_size=2,
+            page_token=first["next_page_token"],
+        )
+
+        self.assertEqual((first["columns"], first["rows"]), (["id"], [[1], [2]]))
+        self.assertEqual((second["columns"], second["rows"]), (["id"], [[3], [4]]))
+
+    def test_unknown_format_is_rejected(self) -> None:
+        result = self._select("SELECT id FROM items", "csv")
+
+        self.assertEqual(result["error_type"], "InvalidFormat")
+
+
+if __name__ == "__main__":
+    unittest.main()
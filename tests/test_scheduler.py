@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sql_mcp_server.config import load_config
+from sql_mcp_server.db.cancel import CancelScope, deadline
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.instances import InstanceRegistry
+from sql_mcp_server.metrics import get_metrics
+from sql_mcp_server.scheduler import FairScheduler
+from sql_mcp_server.tools import query as query_tools
+
+
+def _wait_until(predicate, timeout: float = 5.0) -> None:
+    stop = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > stop:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+class FairSchedulerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        get_metrics().reset()
+
+    def _queue(self, scheduler: FairScheduler, principals: list[str], order: list[str]):
+        threads = []
+        for principal in principals:
+            def work(principal: str = principal) -> None:
+                with scheduler.slot(principal):
+                    order.append(principal)
+
+            thread = threading.Thread(target=work)
+            thread.start()
+            threads.append(thread)
+            # Enqueue in a known order.
+            _wait_until(lambda n=len(threads): scheduler.stats()["queued"] == n)
+        return threads
+
+    def test_admits_up_to_max_active(self) -> None:
+        scheduler = FairScheduler("t", 2, max_queue=0)
+        scheduler.acquire("a")
+        scheduler.acquire("a")
+        with self.assertRaises(MCPError) as ctx:
+            scheduler.acquire("a")
+        self.assertEqual(ctx.exception.error_type, "QueueFull")
+        scheduler.release()
+        scheduler.acquire("a")
+        self.assertEqual(scheduler.stats()["active"], 2)
+        counters = get_metrics().snapshot()["counters"]
+        self.assertEqual(
+            counters["scheduler_rejected_total{instance_id=t,reason=queue_full}"], 1
+        )
+
+    def test_queue_timeout(self) -> None:
+        scheduler = FairScheduler("t", 1, max_queue=1, queue_timeout=0.05)
+        scheduler.acquire("a")
+        with self.assertRaises(MCPError) as ctx:
+            scheduler.acquire("b")
+        self.assertEqual(ctx.exception.error_type, "QueueTimeout")
+        self.assertEqual(
+            scheduler.stats(), {"active": 1, "queued": 0, "max_active": 1, "max_queue": 1}
+        )
+        # The abandoned waiter does not take the slot once it frees up.
+        scheduler.release()
+        scheduler.acquire("c")
+        self.assertEqual(scheduler.stats()["active"], 1)
+
+    def test_call_deadline_bounds_the_wait(self) -> None:
+        scheduler = FairScheduler("t", 1, queue_timeout=30)
+        scheduler.acquire("a")
+        started = time.monotonic()
+        with self.assertRaises(MCPError) as ctx:
+            with deadline(0.05):
+                scheduler.acquire("b")
+        self.assertEqual(ctx.exception.error_type, "DeadlineExceeded")
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(scheduler.stats()["queued"], 0)
+
+    def test_cancel_wakes_waiter(self) -> None:
+        scheduler = FairScheduler("t", 1, queue_timeout=30)
+        scheduler.acquire("a")
+        scope = CancelScope("t")
+        errors: list[MCPError] = []
+
+        def wait() -> None:
+            try:
+                scope.run(scheduler.acquire, "b")
+            except MCPError as exc:
+                errors.append(exc)
+
+        thread = threading.Thread(target=wait)
+        thread.start()
+        _wait_until(lambda: scheduler.stats()["queued"] == 1)
+        scope.cancel("abandoned")
+        thread.join(5)
+        self.assertEqual([exc.error_type for exc in errors], ["QueryCancelled"])
+        self.assertEqual(scheduler.stats()["queued"], 0)
+
+    def test_burst_from_one_principal_does_not_starve_others(self) -> None:
+        scheduler = FairScheduler("t", 1)
+        scheduler.acquire("hold")
+        order: list[str] = []
+        threads = self._queue(scheduler, ["etl", "etl", "etl", "alice"], order)
+        scheduler.release()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(order, ["etl", "alice", "etl", "etl"])
+
+    def test_weights_share_slots_proportionally(self) -> None:
+        scheduler = FairScheduler("t", 1, weights={"alice": 2})
+        scheduler.acquire("hold")
+        order: list[str] = []
+        threads = self._queue(scheduler, ["etl", "etl", "alice", "alice", "alice", "alice"], order)
+        scheduler.release()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(order, ["alice", "etl", "alice", "alice", "etl", "alice"])
+
+    def test_wait_and_depth_histograms(self) -> None:
+        scheduler = FairScheduler("t", 1)
+        with scheduler.slot("a"):
+            pass
+        histograms = get_metrics().snapshot()["histograms"]
+        wait = histograms["scheduler_wait_seconds{instance_id=t}"]
+        self.assertEqual(wait["count"], 1)
+        self.assertEqual(wait["buckets"]["+Inf"], 1)
+
+
+class SchedulerConfigTests(unittest.TestCase):
+    def test_defaults_follow_pool_size(self) -> None:
+        config = load_config(env={"DB_POOL_MAX": "3"})
+        self.assertEqual(config.max_active_queries, 3)
+        self.assertEqual(config.max_queue, 16)
+        self.assertEqual(config.max_concurrency, 19)
+
+    def test_weights_are_parsed(self) -> None:
+        config = load_config(env={"DB_SCHEDULER_WEIGHTS": "alice=3, etl=1"})
+        self.assertEqual(config.scheduler_weights, {"alice": 3, "etl": 1})
+
+
+class RunSelectAdmissionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        path = Path(self._tmp.name) / "sched.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            conn.execute("INSERT INTO items (name) VALUES ('a')")
+        env = {
+            "MCP_INSTANCES": "SCHED",
+            "SCHED_DB_PROVIDER": "sqlite",
+            "SCHED_SQLITE_PATH": str(path),
+            "SCHED_DB_MAX_ACTIVE_QUERIES": "1",
+            "SCHED_DB_MAX_QUEUE": "0",
+        }
+        with mock.patch.dict(os.environ, env):
+            self.registry = InstanceRegistry()
+        patcher = mock.patch.object(query_tools, "_registry", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.registry.shutdown()
+        self._tmp.cleanup()
+
+    def test_saturated_instance_rejects_calls(self) -> None:
+        scheduler = self.registry.get("sched").scheduler
+        scheduler.acquire("other")
+        try:
+            result = query_tools.run_select("SELECT name FROM items", instance_id="sched")
+        finally:
+            scheduler.release()
+
+        self.assertEqual(result["error_type"], "QueueFull")
+        result = query_tools.run_select("SELECT name FROM items", instance_id="sched")
+        self.assertEqual(result["rows"], [{"name": "a"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
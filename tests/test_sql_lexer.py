@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import unittest
+
+from sql_mcp_server.config import DEFAULT_CONFIG
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.middleware import sql_lexer
+from sql_mcp_server.middleware.sql_validator import SQLValidator
+
+# Statements the fast path is expected to classify on its own.
+COMMON_QUERIES = [
+    "SELECT * FROM users",
+    "SELECT * FROM users;",
+    "select id, email from users where id = 1",
+    "SELECT * FROM public.users",
+    'SELECT * FROM "Users"',
+    "SELECT * FROM `orders` o",
+    'SELECT * FROM "my schema"."My Table" t',
+    "SELECT * FROM users u, orders o WHERE u.id = o.user_id",
+    "SELECT * FROM users AS u JOIN orders AS o ON o.user_id = u.id",
+    "SELECT u.id FROM users u LEFT JOIN orders o ON o.user_id = u.id "
+    "LEFT OUTER JOIN items i ON i.order_id = o.id",
+    "SELECT * FROM users u RIGHT JOIN orders o ON u.id = o.uid FULL OUTER JOIN x ON 1 = 1",
+    "SELECT * FROM users INNER JOIN orders USING (id)",
+    "SELECT * FROM users CROSS JOIN products",
+    "SELECT * FROM users NATURAL JOIN profiles",
+    "SELECT count(*) FROM users GROUP BY status HAVING count(*) > 1 ORDER BY 1 LIMIT 5 OFFSET 10",
+    "SELECT * FROM invoices WHERE customer_id IN (SELECT id FROM customers WHERE country = 'FR')",
+    "SELECT (SELECT max(id) FROM orders) AS m FROM users",
+    "SELECT * FROM users WHERE name = 'drop table x; --'",
+    "SELECT 'a''b' FROM users",
+    "SELECT * FROM users -- trailing comment",
+    "/* leading comment */ SELECT * FROM users",
+    "SELECT * FROM users UNION SELECT * FROM admins",
+    "SELECT * FROM users WHERE id = %s",
+    "SELECT * FROM users WHERE id = ?",
+    "SELECT id::text FROM users",
+    "SELECT cast(x AS integer) FROM t1",
+    "SELECT * FROM users WHERE created_at > now() - interval '7 days'",
+    "SELECT TOP 10 * FROM users",
+    "select * from dbo.orders o join dbo.customers c on c.id = o.customer_id",
+    "SELECT * FROM a, b, c",
+    "SELECT 1",
+    "INSERT INTO users (id, name) VALUES (1, 'x')",
+    "INSERT INTO users VALUES (1, 'x')",
+    "INSERT INTO users SELECT * FROM staging",
+    "INSERT INTO t1 (a) VALUES (1) RETURNING id",
+    "UPDATE users SET name = 'x' WHERE id = 1",
+    "UPDATE users u SET name = 'x'",
+    "UPDATE a SET x = (SELECT max(y) FROM b)",
+    "DELETE FROM users WHERE id = 1",
+    "DELETE FROM sales.orders WHERE id IN (SELECT order_id FROM refunds)",
+]
+
+# Shapes the fast path must hand over to sqlparse.
+DEFERRED_QUERIES = [
+    "WITH a AS (SELECT 1) SELECT * FROM a",
+    "SELECT EXTRACT(YEAR FROM created_at) FROM users",
+    "SELECT * FROM (SELECT * FROM users) s",
+    "SELECT * FROM generate_series(1, 10)",
+    "SELECT * FROM events",
+    "SELECT * FROM users FOR UPDATE",
+    "SELECT * FROM users WHERE x = 1; SELECT 2",
+    "SELECT * FROM [dbo].[users]",
+    "SELECT 'unterminated FROM users",
+    "SELECT 'it\\'s' FROM users",
+    "SELECT $$body$$ FROM users",
+    "CREATE TABLE t (id int)",
+]
+
+
+def _sqlparse_verdict(validator: SQLValidator, query: str):
+    try:
+        return validator._classify_with_sqlparse(query)
+    except MCPError as exc:
+        return exc.error_type
+
+
+class SQLLexerDifferentialTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.validator = SQLValidator(DEFAULT_CONFIG)
+
+    def _fast(self, query: str):
+        tokens = sql_lexer.scan(query)
+        return sql_lexer.classify(tokens) if tokens is not None else None
+
+    def test_fast_path_matches_sqlparse(self) -> None:
+        for query in COMMON_QUERIES:
+            with self.subTest(query=query):
+                fast = self._fast(query)
+                self.assertIsNotNone(fast)
+                self.assertEqual(fast, _sqlparse_verdict(self.validator, query))
+
+    def test_unclassifiable_statements_defer_to_sqlparse(self) -> None:
+        for query in DEFERRED_QUERIES:
+            with self.subTest(query=query):
+                self.assertIsNone(self._fast(query))
+
+    def test_scan_refuses_executable_and_hint_comments(self) -> None:
+        for query in ("SELECT 1 /*! , SLEEP(1) */", "SELECT /*+ MAX_EXECUTION_TIME(5) */ 1"):
+            with self.subTest(query=query):
+                self.assertIsNone(sql_lexer.scan(query))
+                self.assertIsNone(sql_lexer.select_shape(query))
+
+    def test_scan_drops_comments_and_unquotes_identifiers(self) -> None:
+        tokens = sql_lexer.scan('SELECT "a""b" -- note\nFROM t /* x */')
+
+        self.assertEqual(
+            tokens,
+            [
+                (sql_lexer.WORD, "SELECT"),
+                (sql_lexer.QUOTED, 'a"b'),
+                (sql_lexer.WORD, "FROM"),
+                (sql_lexer.WORD, "T"),
+            ],
+        )
+
+
+class NumberedPlaceholderTests(unittest.TestCase):
+    def test_rewrites_format_placeholders(self) -> None:
+        rewritten = sql_lexer.numbered_placeholders(
+            "SELECT * FROM t WHERE a = %s AND b %% 2 = 0 AND c IN (%s, %s)"
+        )
+
+        self.assertEqual(
+            rewritten, ("SELECT * FROM t WHERE a = $1 AND b % 2 = 0 AND c IN ($2, $3)", 3)
+        )
+
+    def test_refuses_percent_inside_literals(self) -> None:
+        self.assertIsNone(sql_lexer.numbered_placeholders("SELECT * FROM t WHERE a LIKE '%%x'"))
+        self.assertIsNone(sql_lexer.numbered_placeholders("SELECT * FROM t WHERE a = $1"))
+
+
+
+class SingleTableTests(unittest.TestCase):
+    def test_single_table_reads(self) -> None:
+        for query in (
+            "SELECT id, name FROM items WHERE grp = 1 ORDER BY id",
+            "SELECT id FROM items AS i WHERE id IN (SELECT item_id FROM orders) ORDER BY id",
+        ):
+            with self.subTest(query=query):
+                self.assertTrue(sql_lexer.reads_single_table(query))
+
+    def test_reads_that_can_repeat_rows(self) -> None:
+        for query in (
+            "SELECT a.id FROM items a JOIN items b ON a.grp = b.grp ORDER BY a.id",
+            "SELECT a.id FROM items a, items b ORDER BY a.id",
+            "SELECT id FROM (SELECT id FROM items) AS t ORDER BY id",
+            "SELECT id FROM items UNION ALL SELECT id FROM items ORDER BY id",
+            "WITH t AS (SELECT id FROM items) SELECT id FROM t ORDER BY id",
+        ):
+            with self.subTest(query=query):
+                self.assertFalse(sql_lexer.reads_single_table(query))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -51,6 +51,139 @@ class SQLValidatorTableTests(unittest.TestCase):
 
         self.assertEqual(ctx.exception.error_type, "TableNotAllowed")
 
+    def test_validate_reports_referenced_tables(self) -> None:
+        validator = SQLValidator(_make_config(read_only=False, allowed_tables=set()))
+
+        insert = validator.validate("INSERT INTO orders (id) VALUES (1)")
+        delete = validator.validate("DELETE FROM users WHERE id = 1")
+
+        self.assertEqual(insert.tables, {"orders"})
+        self.assertEqual(delete.tables, {"users"})
+
+    def test_validate_blocks_insert_into_disallowed_table(self) -> None:
+        validator = SQLValidator(_make_config(read_only=False))
+
+        with self.assertRaises(MCPError) as ctx:
+            validator.validate("INSERT INTO accounts (id) VALUES (1)")
+
+        self.assertEqual(ctx.exception.error_type, "TableNotAllowed")
+
+
+class SQLValidatorKeywordTests(unittest.TestCase):
+    def test_keywords_inside_literals_are_ignored(self) -> None:
+        validator = SQLValidator(_make_config())
+
+        result = validator.validate(
+            'SELECT "drop", name FROM users WHERE note = \'please ALTER my plan\''
+        )
+
+        self.assertTrue(result.is_select)
+
+    def test_forbidden_keyword_is_still_blocked(self) -> None:
+        validator = SQLValidator(_make_config(read_only=False))
+
+        for query in ("DROP TABLE users", "EXEC sp_who", "SELECT * FROM users; TRUNCATE users"):
+            with self.subTest(query=query), self.assertRaises(MCPError) as ctx:
+                validator.validate(query)
+            self.assertIn(
+                ctx.exception.error_type, {"ForbiddenKeyword", "MultipleStatementsNotAllowed"}
+            )
+
+    def test_mysql_executable_comments_are_checked(self) -> None:
+        validator = SQLValidator(_make_config(provider="mysql", read_only=False))
+
+        for query, keyword in (
+            ("/*! DROP TABLE users */", "DROP"),
+            ("DELETE FROM users WHERE 1=1 /*! ; GRANT ALL ON *.* TO 'x'@'%' */", "GRANT"),
+        ):
+            with self.subTest(query=query), self.assertRaises(MCPError) as ctx:
+                validator.validate(query)
+            self.assertEqual(ctx.exception.error_type, "ForbiddenKeyword")
+            self.assertIn(keyword, ctx.exception.message)
+
+
+class SQLValidatorCacheTests(unittest.TestCase):
+    def test_repeated_query_is_served_from_cache(self) -> None:
+        validator = SQLValidator(_make_config())
+
+        first = validator.validate("SELECT * FROM users")
+        second = validator.validate("  SELECT * FROM users  ")
+
+        self.assertIs(first, second)
+        self.assertEqual(validator.cache_info()["hits"], 1)
+        self.assertEqual(validator.cache_info()["misses"], 1)
+
+    def test_rejections_are_cached_too(self) -> None:
+        validator = SQLValidator(_make_config())
+        errors = []
+
+        for _ in range(3):
+            with self.assertRaises(MCPError) as ctx:
+                validator.validate("SELECT * FROM accounts")
+            errors.append(ctx.exception)
+
+        self.assertEqual(validator.cache_info()["hits"], 2)
+        # Each caller gets its own exception with the same fields.
+        self.assertEqual(len({id(error) for error in errors}), 3)
+        self.assertEqual({error.to_dict()["error_type"] for error in errors}, {"TableNotAllowed"})
+        self.assertEqual(len({error.message for error in errors}), 1)
+
+    def test_cache_is_bounded(self) -> None:
+        validator = SQLValidator(_make_config(validation_cache_size=2))
+
+        for table_id in range(5):
+            validator.validate(f"SELECT * FROM users WHERE id = {table_id}")
+
+        self.assertEqual(validator.cache_info()["size"], 2)
+
+
+class LimitPushdownTests(unittest.TestCase):
+    def _validate(self, query: str, **overrides):
+        config = _make_config(allowed_tables=set(), **overrides)
+        return SQLValidator(config).validate(query)
+
+    def test_appends_one_row_past_max_rows(self) -> None:
+        result = self._validate("SELECT * FROM users -- newest first")
+
+        self.assertEqual(result.query, "SELECT * FROM users -- newest first\nLIMIT 101")
+        self.assertEqual(result.row_limit, 101)
+        self.assertEqual(result.warnings, [])
+
+    def test_limit_in_subquery_or_literal_does_not_count(self) -> None:
+        for query in (
+            "SELECT * FROM users WHERE id IN (SELECT id FROM users LIMIT 5)",
+            "SELECT * FROM users WHERE name = ' limit '",
+        ):
+            with self.subTest(query=query):
+                self.assertEqual(self._validate(query).row_limit, 101)
+
+    def test_statement_with_own_limit_is_untouched(self) -> None:
+        result = self._validate("SELECT * FROM users ORDER BY id LIMIT 5000")
+
+        self.assertEqual(result.query, "SELECT * FROM users ORDER BY id LIMIT 5000")
+        self.assertIsNone(result.row_limit)
+
+    def test_mssql_top_goes_into_the_main_select(self) -> None:
+        result = self._validate(
+            "WITH recent AS (SELECT * FROM orders) SELECT DISTINCT id FROM recent",
+            provider="mssql",
+        )
+
+        self.assertEqual(
+            result.query,
+            "WITH recent AS (SELECT * FROM orders) SELECT DISTINCT TOP 101 id FROM recent",
+        )
+
+    def test_mssql_union_and_locking_clauses_are_not_rewritten(self) -> None:
+        for query, provider in (
+            ("SELECT id FROM a UNION SELECT id FROM b", "mssql"),
+            ("SELECT * FROM users FOR UPDATE", "postgres"),
+        ):
+            with self.subTest(query=query):
+                result = self._validate(query, provider=provider, read_only=False)
+                self.assertEqual(result.query, query)
+                self.assertIsNone(result.row_limit)
+
 
 if __name__ == "__main__":
     unittest.main()
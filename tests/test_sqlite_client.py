@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from sql_mcp_server.config import ServerConfig
+from sql_mcp_server.db.cancel import CancelScope
+from sql_mcp_server.db.sqlite import SQLiteClient
+from sql_mcp_server.errors import MCPError
+from sql_mcp_server.executor import InstanceExecutor
+
+# Runs for many seconds unless interrupted.
+_SLOW_QUERY = (
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+    "SELECT count(*) AS c FROM n"
+)
+
+
+def _make_config(**overrides) -> ServerConfig:
+    base = dict(
+        instance_id="default",
+        provider="sqlite",
+        host=None,
+        port=None,
+        user=None,
+        password=None,
+        database=None,
+        sqlite_path=":memory:",
+        read_only=False,
+        max_rows=100,
+        query_timeout=10,
+        statement_timeout_ms=10_000,
+        allowed_tables=set(),
+        server_name="sql-mcp-server",
+        mssql_odbc_driver=None,
+        mssql_trust_server_certificate=False,
+        allow_alter=False,
+        allow_drop=False,
+    )
+    base.update(overrides)
+    return ServerConfig(**base)
+
+
+class SQLiteClientStreamingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = SQLiteClient(_make_config())
+        self.client.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        for i in range(10):
+            self.client.execute("INSERT INTO items (id, name) VALUES (?, ?)", (i, f"n{i}"))
+
+    def tearDown(self) -> None:
+        self.client.close()
+
+    def test_iter_batches_respects_batch_size(self) -> None:
+        batches = list(
+            self.client.iter_batches("SELECT id, name FROM items ORDER BY id", batch_size=4)
+        )
+
+        self.assertEqual([len(b.rows) for b in batches], [4, 4, 2])
+        self.assertEqual(batches[0].columns, ("id", "name"))
+        self.assertEqual(batches[2].as_dicts()[-1], {"id": 9, "name": "n9"})
+
+    def test_empty_result_still_reports_columns(self) -> None:
+        batches = list(self.client.iter_batches("SELECT id FROM items WHERE id < 0"))
+
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(batches[0].columns, ("id",))
+        self.assertEqual(list(batches[0].rows), [])
+
+    def test_connection_is_usable_while_stream_is_open(self) -> None:
+        stream = self.client.iter_batches("SELECT id FROM items ORDER BY id", batch_size=3)
+        first = next(stream)
+
+        rows = self.client.execute("SELECT count(*) AS n FROM items")
+
+        self.assertEqual(rows, [{"n": 10}])
+        self.assertEqual(len(first.rows) + sum(len(b.rows) for b in stream), 10)
+
+
+class SQLiteClientSchemaTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = SQLiteClient(_make_config())
+        self.client.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+        self.client.execute("CREATE UNIQUE INDEX users_email ON users (email)")
+        self.client.execute(
+            "CREATE TABLE memberships (user_id INTEGER, team_id INTEGER, role TEXT, "
+            "PRIMARY KEY (user_id, team_id))"
+        )
+
+    def tearDown(self) -> None:
+        self.client.close()
+
+    def test_describe_schema_groups_columns_by_table(self) -> None:
+        schema = self.client.describe_schema()
+
+        self.assertEqual(schema["users"], {"columns": [["id", "INTEGER"], ["email", "TEXT"]]})
+        self.assertEqual(
+            [column[0] for column in schema["memberships"]["columns"]],
+            ["user_id", "team_id", "role"],
+        )
+
+    def test_describe_schema_includes_keys(self) -> None:
+        schema = self.client.describe_schema(include_keys=True)
+
+        self.assertEqual(schema["users"]["primary_key"], ["id"])
+        self.assertEqual(
+            schema["users"]["indexes"],
+            [{"name": "users_email", "unique": True, "columns": ["email"]}],
+        )
+        self.assertEqual(schema["memberships"]["primary_key"], ["user_id", "team_id"])
+        self.assertEqual(schema["memberships"]["indexes"], [])
+
+
+class SQLiteClientStatementCacheTests(unittest.TestCase):
+    def test_statement_stats_are_not_reported(self) -> None:
+        # sqlite3 keeps the statement cache to itself; no counts are made up.
+        client = SQLiteClient(_make_config(prepared_cache_size=2))
+        try:
+            client.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+            client.execute("SELECT id FROM items WHERE id = ?", (1,))
+            client.execute("SELECT id FROM items WHERE id = ?", (1,))
+
+            self.assertIsNone(client.statement_stats())
+        finally:
+            client.close()
+
+
+class SQLiteClientReadModeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.path = str(Path(self._tmpdir.name) / "data.db")
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.executemany(
+            "INSERT INTO items (id, name) VALUES (?, ?)", ((i, f"n{i}") for i in range(20))
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self) -> None:
+        self._tmpdir.cleanup()
+
+    def test_streams_run_on_separate_reader_connections(self) -> None:
+        client = SQLiteClient(
+            _make_config(sqlite_path=self.path, sqlite_readers=2, sqlite_mmap_size=1 << 20)
+        )
+        try:
+            first = client.iter_batches("SELECT id FROM items ORDER BY id", batch_size=5)
+            second = client.iter_batches("SELECT id FROM items ORDER BY id DESC", batch_size=5)
+            self.assertEqual(next(first).rows[0][0], 0)
+            self.assertEqual(next(second).rows[0][0], 19)
+
+            self.assertEqual(client.pool_stats()["in_use"], 2)
+            self.assertEqual(client.execute("PRAGMA mmap_size"), [{"mmap_size": 1 << 20}])
+            first.close()
+            second.close()
+            self.assertEqual(client.pool_stats()["in_use"], 0)
+        finally:
+            client.close()
+
+    def test_read_only_instance_opens_the_file_read_only(self) -> None:
+        client = SQLiteClient(
+            _make_config(sqlite_path=self.path, sqlite_readers=1, read_only=True)
+        )
+        try:
+            with self.assertRaises(sqlite3.OperationalError):
+                client.execute("DELETE FROM items")
+            self.assertEqual(client.execute("SELECT count(*) AS n FROM items"), [{"n": 20}])
+        finally:
+            client.close()
+
+    def test_wal_can_be_enabled_for_writable_instances(self) -> None:
+        client = SQLiteClient(
+            _make_config(sqlite_path=self.path, sqlite_readers=1, sqlite_wal=True)
+        )
+        try:
+            client.execute("INSERT INTO items (id, name) VALUES (?, ?)", (100, "new"))
+            rows = client.execute("SELECT name FROM items WHERE id = ?", (100,))
+        finally:
+            client.close()
+
+        self.assertEqual(client.journal_mode, "wal")
+        self.assertEqual(rows, [{"name": "new"}])
+
+
+class SQLiteClientCancelTests(unittest.TestCase):
+    def setUp(self) -> None:
+        # No statement timeout, so only cancellation can stop the query.
+        self.client = SQLiteClient(_make_config(statement_timeout_ms=0))
+
+    def tearDown(self) -> None:
+        self.client.close()
+
+    def test_cancel_interrupts_running_statement(self) -> None:
+        scope = CancelScope()
+        errors: list[MCPError] = []
+
+        def run() -> None:
+            try:
+                scope.run(self.client.execute, _SLOW_QUERY)
+            except MCPError as exc:
+                errors.append(exc)
+
+        worker = threading.Thread(target=run)
+        worker.start()
+        time.sleep(0.2)
+        self.assertTrue(scope.cancel("test"))
+        worker.join(timeout=5)
+
+        self.assertFalse(worker.is_alive())
+        self.assertEqual([e.error_type for e in errors], ["QueryCancelled"])
+        # The shared connection is usable again.
+        self.assertEqual(self.client.execute("SELECT 1 AS one"), [{"one": 1}])
+
+    def test_cancelled_scope_does_not_start_statements(self) -> None:
+        scope = CancelScope()
+        scope.cancel()
+
+        with self.assertRaises(MCPError) as ctx:
+            scope.run(self.client.execute, "SELECT 1")
+        self.assertEqual(ctx.exception.error_type, "QueryCancelled")
+
+    def test_abandoned_async_call_cancels_statement(self) -> None:
+        executor = InstanceExecutor("default", 1)
+        self.addCleanup(executor.shutdown)
+
+        async def scenario() -> list:
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(executor.run(self.client.execute, _SLOW_QUERY), 0.2)
+            # The single worker thread is free again right away.
+            return await asyncio.wait_for(
+                executor.run(self.client.execute, "SELECT 1 AS one"), 5
+            )
+
+        self.assertEqual(asyncio.run(scenario()), [{"one": 1}])
+
+
+if __name__ == "__main__":
+    unittest.main()